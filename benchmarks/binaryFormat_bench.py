@@ -0,0 +1,48 @@
+"""
+Compare the size and the load time of ELK JSON with the binary format of
+:class:`hwtGraph.elk.containers.lGraphTables.LGraphTables`
+
+Run as: python3 -m benchmarks.binaryFormat_bench [REPEAT]
+"""
+import json
+import sys
+from time import perf_counter
+
+from benchmarks.designs import DESIGNS, designName, synthesizeAndConvert
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.containers.lGraphTables import LGraphTables
+
+
+def bestTime(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        t = perf_counter()
+        fn()
+        t = perf_counter() - t
+        if best is None or t < best:
+            best = t
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"{'design':<28s} {'JSON':>9s} {'binary':>9s} {'ratio':>6s} "
+          f"{'JSON load':>10s} {'bin load':>10s} {'speedup':>8s} {'bin->JSON':>10s} {'bin->LNode':>10s}")
+    for design in DESIGNS:
+        _, g = synthesizeAndConvert(design)
+        jsonData = json.dumps(g.toElkJson(ElkIdStore())).encode("utf-8")
+        binData = LGraphTables.fromLNode(g).toBytes()
+
+        tJson = bestTime(lambda: json.loads(jsonData), repeat)
+        tBin = bestTime(lambda: LGraphTables.fromBytes(binData), repeat)
+        t = LGraphTables.fromBytes(binData)
+        tToJson = bestTime(t.toElkJson, repeat)
+        tToLNode = bestTime(t.toLNode, repeat)
+        print(f"{designName(design):<28s} {len(jsonData) / 1024:6.0f}KiB {len(binData) / 1024:6.0f}KiB "
+              f"{len(jsonData) / len(binData):6.1f} {tJson:9.4f}s {tBin:9.4f}s {tJson / tBin:8.1f} "
+              f"{tToJson:9.4f}s {tToLNode:9.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Report the memory consumed by LNode/LPort/LEdge instances of converted designs
+
+The size of each object is the size of the object itself (including __dict__ if it has any)
+and the size of the lists owned by the object (sides, children, edges, srcs/dsts).
+The referenced objects (other nodes/ports, originObj, names) are not included.
+
+Run as: python3 -m benchmarks.containerMemory_bench
+"""
+import sys
+from typing import Set
+
+from benchmarks.designs import DESIGNS, designName, synthesizeAndConvert
+from hwtGraph.elk.containers.lEdge import LEdge
+from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.containers.lPort import LPort
+from hwtGraph.elk.containers.orderedSetList import OrderedSetList
+
+
+def ownedSize(o) -> int:
+    size = sys.getsizeof(o)
+    d = getattr(o, "__dict__", None)
+    if d is None:
+        attrs = (getattr(o, n) for c in type(o).__mro__ for n in getattr(c, "__slots__", ()))
+    else:
+        size += sys.getsizeof(d)
+        attrs = d.values()
+
+    for v in attrs:
+        if isinstance(v, (list, OrderedSetList)):
+            size += sys.getsizeof(v)
+    return size
+
+
+class ContainerStats():
+
+    def __init__(self):
+        self.nodes = [0, 0]
+        self.ports = [0, 0]
+        self.edges = [0, 0]
+        self.seenEdges: Set[LEdge] = set()
+
+    def addPort(self, p: LPort):
+        self.ports[0] += 1
+        self.ports[1] += ownedSize(p)
+        for e in p.iterEdges():
+            if e not in self.seenEdges:
+                self.seenEdges.add(e)
+                self.edges[0] += 1
+                self.edges[1] += ownedSize(e)
+        for ch in p.children:
+            self.addPort(ch)
+
+    def addNode(self, n: LNode):
+        self.nodes[0] += 1
+        self.nodes[1] += ownedSize(n)
+        for p in n.iterPorts():
+            self.addPort(p)
+        for ch in n.children:
+            self.addNode(ch)
+
+
+def avg(cnt_size):
+    cnt, size = cnt_size
+    if cnt == 0:
+        return 0.0
+    return size / cnt
+
+
+def main():
+    total = ContainerStats()
+    print(f"{'design':<28s} {'nodes':>8s} {'B/node':>8s} {'ports':>8s} {'B/port':>8s} {'edges':>8s} {'B/edge':>8s}")
+    for design in DESIGNS:
+        _, root = synthesizeAndConvert(design)
+        s = ContainerStats()
+        s.addNode(root)
+        for dst, src in ((total.nodes, s.nodes), (total.ports, s.ports), (total.edges, s.edges)):
+            dst[0] += src[0]
+            dst[1] += src[1]
+        print(f"{designName(design):<28s} {s.nodes[0]:8d} {avg(s.nodes):8.1f} "
+              f"{s.ports[0]:8d} {avg(s.ports):8.1f} {s.edges[0]:8d} {avg(s.edges):8.1f}")
+
+    print(f"{'total':<28s} {total.nodes[0]:8d} {avg(total.nodes):8.1f} "
+          f"{total.ports[0]:8d} {avg(total.ports):8.1f} {total.edges[0]:8d} {avg(total.edges):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Profile each phase of the conversion of the designs and write the report as JSON
+
+Run as: python3 -m benchmarks.conversionProfile_bench [report.json]
+"""
+import json
+import sys
+
+from benchmarks.designs import DESIGNS, designName, instantiate
+from hwt.synth import synthesised
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.fromHwt.conversionProfiler import ConversionProfiler
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_LAYOUT_OPTIMIZATIONS, createDefaultPlatform
+
+
+def main():
+    report = {}
+    for design in DESIGNS:
+        m = instantiate(design)
+        with ConversionProfiler() as profiler:
+            # same as DEFAULT_PLATFORM, but the netlist passes are profiled as well
+            synthesised(m, createDefaultPlatform(profiler))
+            g = HwModuleToLNode(m, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS, profiler=profiler)
+            with profiler.measure("toElkJson", g):
+                g.toElkJson(ElkIdStore())
+
+        name = designName(design)
+        report[name] = profiler.toJson()
+        print(name)
+        for phase, s in sorted(profiler.summary().items(), key=lambda x: -x[1]["time"]):
+            print(f"    {phase:<28s} {s['calls']:6d} {s['time']:8.3f}s {s['allocated'] / 1024:10.1f}KiB")
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "w") as f:
+            json.dump(report, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
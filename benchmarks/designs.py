@@ -0,0 +1,62 @@
+"""
+Designs from the conversibility tests used in the benchmarks
+"""
+from typing import Tuple
+
+from hwt.hwModule import HwModule
+from hwt.synth import synthesised
+from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_PLATFORM, \
+    DEFAULT_LAYOUT_OPTIMIZATIONS
+from hwtLib.amba.axi4Lite import Axi4Lite
+from hwtLib.amba.axi_comp.buff import AxiBuff
+from hwtLib.amba.axi_comp.tester import AxiTester
+from hwtLib.amba.datapump.interconnect.rStricOrder import RStrictOrderInterconnect
+from hwtLib.amba.datapump.r import Axi_rDatapump
+from hwtLib.amba.datapump.w import Axi_wDatapump
+from hwtLib.examples.showcase0 import Showcase0
+from hwtLib.logic.bitonicSorter import BitonicSorter
+from hwtLib.logic.crcComb import CrcComb
+from hwtLib.mem.cuckooHashTable import CuckooHashTable
+from hwtLib.peripheral.i2c.masterBitCntrl import I2cMasterBitCtrl
+from hwtLib.peripheral.spi.master import SpiMaster
+from hwtLib.peripheral.usb.usb2.device_cdc_vcp import Usb2CdcVcp
+from hwtLib.structManipulators.mmu_2pageLvl import MMU_2pageLvl
+
+# list of HwModule classes or tuples (HwModule class, constructor args)
+DESIGNS = [
+    Showcase0,
+    (AxiBuff, (Axi4Lite,)),
+    AxiTester,
+    RStrictOrderInterconnect,
+    Axi_rDatapump,
+    Axi_wDatapump,
+    BitonicSorter,
+    CrcComb,
+    CuckooHashTable,
+    I2cMasterBitCtrl,
+    SpiMaster,
+    MMU_2pageLvl,
+    Usb2CdcVcp,
+]
+
+
+def designName(design) -> str:
+    if isinstance(design, tuple):
+        design = design[0]
+    return design.__name__
+
+
+def instantiate(design) -> HwModule:
+    if isinstance(design, tuple):
+        cls, args = design
+        return cls(*args)
+    else:
+        return design()
+
+
+def synthesizeAndConvert(design, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS) -> Tuple[HwModule, LNode]:
+    m = instantiate(design)
+    synthesised(m, DEFAULT_PLATFORM)
+    return m, HwModuleToLNode(m, optimizations=optimizations)
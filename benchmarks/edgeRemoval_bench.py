@@ -0,0 +1,74 @@
+"""
+Measure the removal of connections on a net with a high fanout (e.g. clock or reset)
+and the removal of the nodes connected to it
+
+Run as: python3 -m benchmarks.edgeRemoval_bench [ENDPOINT_CNT]
+"""
+import sys
+from time import perf_counter
+from typing import Tuple, List
+
+from hwtGraph.elk.containers.constants import PortType, PortSide
+from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.containers.lPort import LPort
+
+
+def buildFanout(endpointCnt: int) -> Tuple[LNode, LPort, List[LPort]]:
+    root = LNode(name="top")
+    src = root.addPort("clk", PortType.INPUT, PortSide.WEST)
+    dsts = []
+    for i in range(endpointCnt):
+        n = root.addNode(name=f"ff{i:d}", cls="Operator")
+        dsts.append(n.addPort("clk", PortType.INPUT, PortSide.WEST))
+    return root, src, dsts
+
+
+def benchRemoveTarget(endpointCnt: int) -> float:
+    """
+    Remove all targets of a single hyperedge one by one
+    """
+    root, src, dsts = buildFanout(endpointCnt)
+    e = root.addHyperEdge([src], dsts)
+    t = perf_counter()
+    for dst in dsts:
+        e.removeTarget(dst)
+    return perf_counter() - t
+
+
+def benchRemoveEdges(endpointCnt: int) -> float:
+    """
+    Remove edges from a port with a large number of outgoing edges one by one
+    """
+    root, src, dsts = buildFanout(endpointCnt)
+    edges = [root.addEdge(src, dst) for dst in dsts]
+    t = perf_counter()
+    for e in edges:
+        e.remove()
+    return perf_counter() - t
+
+
+def benchRemoveChildren(endpointCnt: int) -> float:
+    """
+    Remove all children nodes one by one (as optimization passes do)
+    """
+    root, _, dsts = buildFanout(endpointCnt)
+    t = perf_counter()
+    for dst in dsts:
+        root.children.remove(dst.parentNode)
+    return perf_counter() - t
+
+
+def main():
+    if len(sys.argv) > 1:
+        endpointCnt = int(sys.argv[1])
+    else:
+        endpointCnt = 100_000
+
+    print(f"endpoints: {endpointCnt:d}")
+    print(f"LEdge.removeTarget for each endpoint: {benchRemoveTarget(endpointCnt):.3f}s")
+    print(f"LEdge.remove for each edge:           {benchRemoveEdges(endpointCnt):.3f}s")
+    print(f"LNode.children.remove for each node:  {benchRemoveChildren(endpointCnt):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
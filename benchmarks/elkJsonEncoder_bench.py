@@ -0,0 +1,46 @@
+"""
+Measure the time of the construction of ELK JSON dictionary (:meth:`hwtGraph.elk.containers.lNode.LNode.toElkJson`)
+and of its serialization by each installed JSON encoder from :mod:`hwtGraph.elk.containers.elkJsonEncoder`
+
+Run as: python3 -m benchmarks.elkJsonEncoder_bench [REPEAT]
+"""
+import sys
+from time import perf_counter
+
+from benchmarks.designs import DESIGNS, designName, synthesizeAndConvert
+from hwtGraph.elk.containers.elkJsonEncoder import ELK_JSON_ENCODERS
+from hwtGraph.elk.containers.idStore import ElkIdStore
+
+
+def bestTime(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        t = perf_counter()
+        fn()
+        t = perf_counter() - t
+        if best is None or t < best:
+            best = t
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    encoders = [cls() for cls in ELK_JSON_ENCODERS if cls.isAvailable()]
+
+    print(f"{'design':<28s} {'toElkJson':>10s} " + " ".join(f"{e.NAME:>9s}" for e in encoders) + f" {'size':>9s}")
+    total = [0.0 for _ in range(len(encoders) + 1)]
+    for design in DESIGNS:
+        _, g = synthesizeAndConvert(design)
+        tDict = bestTime(lambda: g.toElkJson(ElkIdStore()), repeat)
+        d = g.toElkJson(ElkIdStore())
+        times = [bestTime(lambda: e.dumps(d), repeat) for e in encoders]
+        size = len(encoders[0].dumps(d))
+        for i, t in enumerate([tDict, *times]):
+            total[i] += t
+        print(f"{designName(design):<28s} {tDict:9.4f}s " + " ".join(f"{t:8.4f}s" for t in times) + f" {size / 1024:6.0f}KiB")
+
+    print(f"{'total':<28s} {total[0]:9.4f}s " + " ".join(f"{t:8.4f}s" for t in total[1:]))
+
+
+if __name__ == "__main__":
+    main()
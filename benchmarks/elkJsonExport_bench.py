@@ -0,0 +1,53 @@
+"""
+Compare the export to ELK JSON by :meth:`hwtGraph.elk.containers.lNode.LNode.toElkJson`
+(registration of nodes, ports and emit as separate walks)
+with :class:`hwtGraph.elk.containers.elkJsonFusedExporter.ElkJsonFusedExporter` (single walk,
+optionally with the bodies of shared components emitted only once) on the largest designs
+
+Run as: python3 -m benchmarks.elkJsonExport_bench [DESIGN_CNT] [REPEAT]
+"""
+import json
+import sys
+from time import perf_counter
+
+from benchmarks.designs import DESIGNS, designName, synthesizeAndConvert
+from hwtGraph.elk.containers.elkJsonFusedExporter import ElkJsonFusedExporter
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.fromHwt.conversionProfiler import LNode_countObjects
+
+
+def bestTime(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        t = perf_counter()
+        fn()
+        t = perf_counter() - t
+        if best is None or t < best:
+            best = t
+    return best
+
+
+def main():
+    designCnt = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    graphs = []
+    for design in DESIGNS:
+        _, g = synthesizeAndConvert(design)
+        graphs.append((sum(LNode_countObjects(g)), designName(design), g))
+    # the largest designs first
+    graphs.sort(key=lambda x: -x[0])
+
+    print(f"{'design':<28s} {'objects':>8s} {'3 walks':>9s} {'fused':>9s} {'dedup':>9s} {'size':>9s} {'dedup size':>11s}")
+    for objCnt, name, g in graphs[:designCnt]:
+        tRef = bestTime(lambda: g.toElkJson(ElkIdStore()), repeat)
+        tFused = bestTime(lambda: ElkJsonFusedExporter().toElkJson(g), repeat)
+        tDedup = bestTime(lambda: ElkJsonFusedExporter(dedupSharedComponents=True).toElkJson(g), repeat)
+        size = len(json.dumps(ElkJsonFusedExporter().toElkJson(g)))
+        dedupSize = len(json.dumps(ElkJsonFusedExporter(dedupSharedComponents=True).toElkJson(g)))
+        print(f"{name:<28s} {objCnt:8d} {tRef:8.4f}s {tFused:8.4f}s {tDedup:8.4f}s "
+              f"{size / 1024:7.0f}KiB {dedupSize / 1024:9.0f}KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure the joining of nets in NetCtxs (as it happens during the conversion of long chains of assignments
+and wide buses) and the creation of the edges in NetCtxs.applyConnections
+
+Run as: python3 -m benchmarks.netJoin_bench [CHAIN_LEN] [BUS_WIDTH]
+"""
+import sys
+from time import perf_counter
+
+from hwtGraph.elk.containers.constants import PortType, PortSide
+from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.fromHwt.netCtx import NetCtxs, ValidationLevel
+
+
+def benchChain(chainLen: int, busWidth: int) -> float:
+    """
+    Each bit of the bus is driven by a port and passes through a chain of assignments,
+    each signal in the chain has an endpoint port, all signals of the chain are joined to a single net
+    (a = b; b = c; ...)
+    """
+    root = LNode(name="top")
+    n = root.addNode(name="n")
+    srcs = [n.addPort(f"o{b:d}", PortType.OUTPUT, PortSide.EAST) for b in range(busWidth)]
+    dsts = [[n.addPort(f"i{b:d}_{i:d}", PortType.INPUT, PortSide.WEST) for i in range(chainLen)]
+            for b in range(busWidth)]
+
+    t = perf_counter()
+    nets = NetCtxs(root, ValidationLevel.ONCE)
+    for b in range(busWidth):
+        net, _ = nets.getDefault((b, 0))
+        net.addDriver(srcs[b])
+        bDsts = dsts[b]
+        for i in range(chainLen):
+            k = (b, i + 1)
+            net, _ = nets.getDefault(k)
+            net.addEndpoint(bDsts[i])
+            # the driver of the signal is the previous signal in the chain
+            nets.joinNetsByKeyVal(k, nets[(b, i)])
+    nets.applyConnections(root)
+    return perf_counter() - t
+
+
+def main():
+    if len(sys.argv) > 1:
+        chainLen = int(sys.argv[1])
+    else:
+        chainLen = 2000
+    if len(sys.argv) > 2:
+        busWidth = int(sys.argv[2])
+    else:
+        busWidth = 64
+
+    print(f"chain length: {chainLen:d}, bus width: {busWidth:d}")
+    print(f"long chain, 1 bit:           {benchChain(chainLen * 8, 1):.3f}s")
+    print(f"chain of wide bus:           {benchChain(chainLen, busWidth):.3f}s")
+    print(f"wide bus, short chains:      {benchChain(8, busWidth * 256):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Measure the construction of nets in NetCtxs and of the edges in NetCtxs.applyConnections
+for each :class:`hwtGraph.elk.fromHwt.netCtx.ValidationLevel`
+
+Run as: python3 -m benchmarks.netValidation_bench [NET_CNT] [FANOUT]
+(or python3 -O -m ... to see the time without any assertions)
+"""
+import gc
+import sys
+from time import perf_counter
+
+from hwtGraph.elk.containers.constants import PortType, PortSide
+from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.fromHwt.netCtx import NetCtxs, ValidationLevel
+
+
+def bestTime(fn, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        t = fn()
+        if best is None or t < best:
+            best = t
+    return best
+
+
+def benchNets(netCnt: int, fanout: int, validation: ValidationLevel) -> float:
+    """
+    Each net is driven by an output port of a child node and has fanout input ports of other children
+    """
+    root = LNode(name="top")
+    children = [root.addNode(name=f"n{i:d}") for i in range(fanout + 1)]
+    srcs = [children[0].addPort(f"o{i:d}", PortType.OUTPUT, PortSide.EAST) for i in range(netCnt)]
+    dsts = [[n.addPort(f"i{i:d}", PortType.INPUT, PortSide.WEST) for n in children[1:]]
+            for i in range(netCnt)]
+
+    # the measured code allocates only few objects, the collection of the graph would dominate the time
+    gc.collect()
+    gc.disable()
+    t = perf_counter()
+    nets = NetCtxs(root, validation)
+    for i in range(netCnt):
+        net, _ = nets.getDefault(i)
+        net.addDriver(srcs[i])
+        for dst in dsts[i]:
+            net.addEndpoint(dst)
+    nets.applyConnections(root)
+    t = perf_counter() - t
+    gc.enable()
+    return t
+
+
+def main():
+    if len(sys.argv) > 1:
+        netCnt = int(sys.argv[1])
+    else:
+        netCnt = 50_000
+    if len(sys.argv) > 2:
+        fanout = int(sys.argv[2])
+    else:
+        fanout = 4
+
+    print(f"nets: {netCnt:d}, fanout: {fanout:d}, assertions: {__debug__}")
+    for validation in ValidationLevel:
+        t = bestTime(lambda: benchNets(netCnt, fanout, validation), 3)
+        print(f"{validation.name:<5s} {t:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
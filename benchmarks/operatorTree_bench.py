@@ -0,0 +1,56 @@
+"""
+Measure the rendering of the hidden operator trees (StatementRenderer.lazyLoadNet)
+on designs with large shared operator DAGs and on a long chain of operators
+
+Run as: python3 -m benchmarks.operatorTree_bench [CHAIN_DEPTH]
+"""
+import sys
+
+from benchmarks.designs import designName, instantiate
+from hwt.hwIOs.std import HwIOSignal, HwIOVectSignal
+from hwt.hwModule import HwModule
+from hwt.pyUtils.typingFuture import override
+from hwt.synth import synthesised
+from hwtGraph.elk.fromHwt.conversionProfiler import ConversionProfiler
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_PLATFORM
+from hwtLib.logic.bitonicSorter import BitonicSorter
+from hwtLib.logic.crcComb import CrcComb
+
+
+class XorChain(HwModule):
+    DEPTH = 4096
+
+    @override
+    def hwDeclr(self):
+        self.a = HwIOVectSignal(self.DEPTH)
+        self.o = HwIOSignal()._m()
+
+    @override
+    def hwImpl(self):
+        a = self.a
+        r = a[0]
+        for i in range(1, self.DEPTH):
+            r = r ^ a[i]
+        self.o(r)
+
+
+def benchRenderContent(design) -> float:
+    m = instantiate(design)
+    synthesised(m, DEFAULT_PLATFORM)
+    with ConversionProfiler() as profiler:
+        HwModuleToLNode(m, optimizations=[], profiler=profiler)
+    return profiler.summary()["renderContent"]["time"]
+
+
+def main():
+    if len(sys.argv) > 1:
+        XorChain.DEPTH = int(sys.argv[1])
+
+    for design in [CrcComb, BitonicSorter, XorChain]:
+        t = benchRenderContent(design)
+        print(f"{designName(design):<16s} {t:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Measure the conversion time of designs with ParallelHwModuleToLNode for different number of workers
+
+Run as: python3 -m benchmarks.parallelConversion_bench
+"""
+from time import perf_counter
+
+from benchmarks.designs import DESIGNS, designName, instantiate
+from hwt.synth import synthesised
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_PLATFORM
+from hwtGraph.elk.fromHwt.parallelConvertor import ParallelHwModuleToLNode
+
+WORKERS = (1, 2, 4, 8)
+
+
+def main():
+    print(f"{'design':<28s} {'children':>8s}" + "".join(f" {f'{w:d} [s]':>8s}" for w in WORKERS))
+    total = [0.0 for _ in WORKERS]
+    for design in DESIGNS:
+        times = []
+        for i, workers in enumerate(WORKERS):
+            # new instance because the conversion may add signals to the netlist
+            m = instantiate(design)
+            synthesised(m, DEFAULT_PLATFORM)
+            c = ParallelHwModuleToLNode(workers)
+            t = perf_counter()
+            c.convert(m)
+            t = perf_counter() - t
+            times.append(t)
+            total[i] += t
+        print(f"{designName(design):<28s} {len(m._subHwModules):8d}" + "".join(f" {t:8.3f}" for t in times))
+
+    print(f"{'total':<28s} {'':8s}" + "".join(f" {t:8.3f}" for t in total))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measure the time of RtlNetlistPassPropagatePresets on designs with many default assignments
+followed by large Switch/If statements (FSMs)
+
+Run as: python3 -m benchmarks.propagatePresets_bench
+"""
+from time import perf_counter
+
+from hwt.synth import synthesised
+from hwt.synthesizer.dummyPlatform import DummyPlatform
+from hwt.synthesizer.rtlLevel.netlist import RtlNetlist
+from hwtGraph.elk.fromHwt.netlistPreprocessors import RtlNetlistPassUnhideResultsOfIndexingAndConcatOnPublicSignals
+from hwtGraph.elk.fromHwt.propagatePresets import RtlNetlistPassPropagatePresets
+from hwtLib.peripheral.i2c.masterBitCntrl import I2cMasterBitCtrl
+from hwtLib.peripheral.spi.master import SpiMaster
+from hwtLib.peripheral.usb.usb2.device_cdc_vcp import Usb2CdcVcp
+
+DESIGNS = [
+    I2cMasterBitCtrl,
+    SpiMaster,
+    Usb2CdcVcp,
+]
+
+
+class MeasuredRtlNetlistPassPropagatePresets(RtlNetlistPassPropagatePresets):
+    """
+    :ivar ~.time: the total time spent in this pass
+    """
+
+    def __init__(self):
+        super(MeasuredRtlNetlistPassPropagatePresets, self).__init__()
+        self.time = 0.0
+
+    def runOnRtlNetlist(self, netlist: RtlNetlist):
+        t = perf_counter()
+        super(MeasuredRtlNetlistPassPropagatePresets, self).runOnRtlNetlist(netlist)
+        self.time += perf_counter() - t
+
+
+def bestTime(design, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        p = MeasuredRtlNetlistPassPropagatePresets()
+        platform = DummyPlatform()
+        platform.beforeHdlArchGeneration.extend([
+            RtlNetlistPassUnhideResultsOfIndexingAndConcatOnPublicSignals(),
+            p,
+        ])
+        synthesised(design(), platform)
+        if best is None or p.time < best:
+            best = p.time
+    return best
+
+
+def main():
+    print(f"{'design':<28s} {'propagatePresets [s]':>20s}")
+    for design in DESIGNS:
+        print(f"{design.__name__:<28s} {bestTime(design, 3):20.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import json
+from typing import Optional, Sequence
+
+from hwt.synthesizer.componentPath import ComponentPath
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.containers.lNode import LNode
+
+
+class ElkJsonEncoder():
+    """
+    Serializer of ELK JSON dictionaries to UTF-8 encoded bytes (and the parser of them)
+
+    All encoders produce the same bytes for ELK JSON: keys in insertion order, no whitespace,
+    non-ASCII characters are not escaped, "/" is not escaped
+    (ELK JSON contains only str keys, str, int, bool and None values, lists and tuples)
+
+    :cvar ~.NAME: name of the encoder used in :func:`getElkJsonEncoder`
+    """
+    NAME = "json"
+
+    @classmethod
+    def isAvailable(cls) -> bool:
+        return True
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), check_circular=False).encode("utf-8")
+
+    def loads(self, data):
+        """
+        :param data: str, bytes or an object with buffer protocol (e.g. mmap)
+        """
+        if not isinstance(data, (str, bytes)):
+            data = bytes(data)
+        return json.loads(data)
+
+
+class OrjsonElkJsonEncoder(ElkJsonEncoder):
+    """
+    :see: https://github.com/ijl/orjson
+    """
+    NAME = "orjson"
+
+    @classmethod
+    def isAvailable(cls) -> bool:
+        try:
+            import orjson
+        except ImportError:
+            return False
+        return True
+
+    def __init__(self):
+        import orjson
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def dumps(self, obj) -> bytes:
+        return self._dumps(obj)
+
+    def loads(self, data):
+        if isinstance(data, (str, bytes)):
+            return self._loads(data)
+        # parse without copy
+        with memoryview(data) as view:
+            return self._loads(view)
+
+
+class UjsonElkJsonEncoder(ElkJsonEncoder):
+    """
+    :see: https://github.com/ultrajson/ultrajson
+    """
+    NAME = "ujson"
+
+    @classmethod
+    def isAvailable(cls) -> bool:
+        try:
+            import ujson
+        except ImportError:
+            return False
+        return True
+
+    def __init__(self):
+        import ujson
+        self._dumps = ujson.dumps
+        self._loads = ujson.loads
+
+    def dumps(self, obj) -> bytes:
+        return self._dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+
+    def loads(self, data):
+        if not isinstance(data, (str, bytes)):
+            data = bytes(data)
+        return self._loads(data)
+
+
+# the encoders in the order of preference
+ELK_JSON_ENCODERS: Sequence[type] = (OrjsonElkJsonEncoder, UjsonElkJsonEncoder, ElkJsonEncoder)
+
+
+def getElkJsonEncoder(name: Optional[str]=None) -> ElkJsonEncoder:
+    """
+    :param name: the name of the encoder ("orjson", "ujson", "json"),
+        if None the fastest available encoder is used
+    :raise ValueError: if the encoder of specified name does not exist or is not installed
+    """
+    for cls in ELK_JSON_ENCODERS:
+        if name is None or cls.NAME == name:
+            if cls.isAvailable():
+                return cls()
+            elif name is not None:
+                raise ValueError("JSON encoder is not installed", name)
+
+    raise ValueError("Unknown JSON encoder", name, [cls.NAME for cls in ELK_JSON_ENCODERS])
+
+
+def LNode_toElkJsonBytes(root: LNode, idStore: Optional[ElkIdStore]=None,
+                         path_prefix: ComponentPath=ComponentPath(),
+                         encoder: Optional[ElkJsonEncoder]=None) -> bytes:
+    """
+    Convert the graph to ELK JSON (:meth:`hwtGraph.elk.containers.lNode.LNode.toElkJson`)
+    and serialize it to UTF-8 encoded bytes
+
+    :param encoder: the encoder to use, if None the fastest available encoder is used
+    """
+    if idStore is None:
+        idStore = ElkIdStore()
+    if encoder is None:
+        encoder = getElkJsonEncoder()
+    return encoder.dumps(root.toElkJson(idStore, path_prefix))
@@ -0,0 +1,293 @@
+from itertools import chain, zip_longest
+from typing import Dict, List, Optional, Tuple
+
+from hwt.pyUtils.setList import SetList
+from hwt.synthesizer.componentPath import ComponentPath
+from hwtGraph.elk.containers.constants import PortConstraints
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.containers.lPort import LPort
+
+
+def LNode_countIds(root: LNode, expandSharedComponents=True) -> Tuple[int, int]:
+    """
+    Count the ids which are required for nodes and for ports in ELK JSON of the graph
+
+    :param expandSharedComponents: if True the body of a shared component is counted for each use
+    """
+    nodes = 0
+    ports = 0
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        nodes += 1
+        portStack = list(n.iterPorts())
+        while portStack:
+            p = portStack.pop()
+            ports += 1
+            ch = p._children
+            if ch:
+                portStack.extend(ch)
+
+        comp = n._shared_component_with
+        if comp is None:
+            children = n._children
+        elif expandSharedComponents:
+            children = comp._children
+        else:
+            children = None
+        if children:
+            stack.extend(children)
+
+    return nodes, ports
+
+
+class _IdRange():
+    """
+    Generator of ids from the range which was reserved in :class:`ElkIdStore`
+    (can be used in place of ElkIdStore for registration of objects)
+    """
+    __slots__ = ["max_id"]
+
+    def __init__(self, start: int):
+        self.max_id = start
+
+    registerInScope = ElkIdStore.registerInScope
+    getMaxId = ElkIdStore.getMaxId
+
+
+class ElkJsonFusedExporter():
+    """
+    Export of the LNode graph to ELK JSON which assigns ids to nodes, ports and edges and builds the JSON
+    in a single walk of the graph. The output and the ids in idStore are the same as
+    from :meth:`hwtGraph.elk.containers.lNode.LNode.toElkJson`.
+
+    The numbering of ids is: nodes (pre-order), ports (pre-order), edges (post-order),
+    because of this the number of nodes and ports is counted before the walk
+    and a separate range of ids is used for each kind of object.
+    The edges of each body are collected while the ports of the children are converted.
+
+    If dedupSharedComponents is True the body of a shared component is emitted only once
+    (in the node of the original component). The node which uses the shared component (the instance)
+    has no body and its "hwMeta" has "sharedComponentWith" with the id of the node of the original component.
+    The ports of the instance are in the same order as the ports of the original component
+    (including the "children" ports). The frontend can instantiate the body of the instance
+    (e.g. when it is expanded) as follows:
+
+    * deep copy "_children" and "_edges" of the original component into the instance
+    * assign a new id to each node, port and edge in the copy (the ids have to be unique in the whole graph,
+      "maxId" in "hwMeta" of the root is the maximal id used in the document)
+      and replace all references to these ids in the copy (including "sharedComponentWith" of nested instances)
+    * replace the references to the original component by the id of the instance
+      and the references to the ports of the original component by ids of the ports of the instance
+      on the same position
+
+    :note: The ids in this mode are not the same as in the normal mode because the bodies of the instances
+        do not consume any ids.
+
+    :ivar ~.idStore: the ElkIdStore where the objects are registered, the objects must not be registered yet
+    :ivar ~.dedupSharedComponents: if True the body of a shared component is not emitted for each instance
+    :ivar ~._sharedRefs: list of tuples (hwMeta dict of the instance, original component)
+        the id of the original component is resolved after the whole graph is converted
+    """
+
+    def __init__(self, idStore: Optional[ElkIdStore]=None, dedupSharedComponents=False):
+        if idStore is None:
+            idStore = ElkIdStore()
+        self.idStore = idStore
+        self.dedupSharedComponents = dedupSharedComponents
+        self._sharedRefs: List[Tuple[dict, LNode]] = []
+
+    def toElkJson(self, root: LNode, path_prefix: ComponentPath=ComponentPath()) -> dict:
+        idStore = self.idStore
+        ids = idStore.getScope(path_prefix)
+        assert root not in ids, ("The graph was already exported with this idStore", root)
+
+        nodeCnt, portCnt = LNode_countIds(root, not self.dedupSharedComponents)
+        start = idStore.max_id
+        nodeIds = _IdRange(start)
+        portIds = _IdRange(start + nodeCnt)
+        edgeIds = _IdRange(start + nodeCnt + portCnt)
+        d = self._nodeToElkJson(root, path_prefix, ids, True,
+                                nodeIds, portIds, edgeIds, None, None)
+
+        assert nodeIds.max_id == start + nodeCnt, (nodeIds.max_id, start, nodeCnt)
+        assert portIds.max_id == start + nodeCnt + portCnt, (portIds.max_id, start, nodeCnt, portCnt)
+        idStore.max_id = edgeIds.max_id
+
+        for hwMeta, comp in self._sharedRefs:
+            compId = ids.get(comp, None)
+            assert compId is not None, ("The original of the shared component is not in the exported graph", comp)
+            hwMeta["sharedComponentWith"] = str(compId)
+        self._sharedRefs.clear()
+        return d
+
+    def _nodeToElkJson(self, n: LNode, path_prefix: ComponentPath, ids: Dict[object, int], isTop: bool,
+                       nodeIds: _IdRange, portIds: _IdRange, edgeIds: _IdRange,
+                       formalParent: Optional[LNode], parentEdges: Optional[SetList]) -> dict:
+        """
+        :param formalParent: the node which owns the edges of the body where n is
+        :param parentEdges: the edges of the body where n is, the edges of n which belong there are added to it
+        :note: the nested nodes are converted iteratively (the depth of the hierarchy is not limited by the recursion limit)
+        """
+        # stack of the tuples from :meth:`~._nodeToElkJson_begin` for nodes which body is being converted
+        stack = [self._nodeToElkJson_begin(n, path_prefix, ids, isTop, nodeIds, portIds, formalParent, parentEdges)]
+        while True:
+            n, d, children, edges, bodyOwner, chPathPrefix, bodyIds, nodes, hideChildren, sharedRef = stack[-1]
+            ch = next(children, None)
+            if ch is not None:
+                # the JSON of the child is appended to nodes of this node once the child is finished
+                stack.append(self._nodeToElkJson_begin(ch, chPathPrefix, bodyIds, False,
+                                                       nodeIds, portIds, bodyOwner, edges))
+                continue
+
+            stack.pop()
+            if nodes is not None:
+                nodes.sort(key=lambda n: n["id"])
+                d["_children" if hideChildren else "children"] = nodes
+
+                for e in edges:
+                    edgeIds.registerInScope(bodyIds, e)
+                d["_edges" if hideChildren else "edges"] = [e._toElkJson(bodyIds) for e in edges]
+
+            d["hwMeta"] = n._toElkJson_hwMeta(edgeIds.getMaxId())
+            if sharedRef:
+                self._sharedRefs.append((d["hwMeta"], n._shared_component_with))
+            if not stack:
+                return d
+            stack[-1][7].append(d)
+
+    def _nodeToElkJson_begin(self, n: LNode, path_prefix: ComponentPath, ids: Dict[object, int], isTop: bool,
+                             nodeIds: _IdRange, portIds: _IdRange,
+                             formalParent: Optional[LNode], parentEdges: Optional[SetList]):
+        """
+        Register the node and convert it without the body (the part of :meth:`~._nodeToElkJson` before the children are converted)
+
+        :return: tuple (n, JSON of the node, iterator of children, edges of the body, owner of the edges of the body,
+            path_prefix of children, ids of children, list for JSON of children or None if there are no children,
+            hideChildren flag, True if the node only references the body of the shared component)
+        """
+        id_ = nodeIds.registerInScope(ids, n)
+        comp = n._shared_component_with
+        sharedRef = comp is not None and self.dedupSharedComponents
+        if sharedRef:
+            # the body is only referenced, the ports are not aliased
+            assert not n._children, n
+            comp = None
+            children = None
+            bodyIds = ids
+        else:
+            children, path_prefix, bodyIds = n._getUniqRefChildrenScope(self.idStore, path_prefix, ids)
+            if comp is not None:
+                bodyIds[comp] = id_
+
+        d = {
+            # placeholder to keep the order of keys, resolved when the body is converted
+            "hwMeta": None,
+            "properties": n._toElkJson_properties(),
+        }
+        if not isTop:
+            d["id"] = str(id_)
+
+        addIndex = n.portConstraints == PortConstraints.FIXED_ORDER
+        orderFixed = n.portConstraints.isOrderFixed()
+        ports = []
+        i = 0
+        if comp is None:
+            portPairs = ((revIndex, p, None) for revIndex, p in n.iterPortsWithReverseFlag())
+        else:
+            portPairs = self._iterPortsOfSharedComp(n, comp)
+
+        for revIndex, p, orig_p in portPairs:
+            pJson, i = self._portToElkJson(portIds, ids, bodyIds, addIndex, orderFixed,
+                                           p, orig_p, 0, i, revIndex)
+            ports.append(pJson)
+            if parentEdges is not None:
+                for e in chain(p._incomingEdges or (), p._outgoingEdges or ()):
+                    if e.parentNode is formalParent:
+                        parentEdges.append(e)
+        d["ports"] = ports
+
+        if children:
+            return (n, d, iter(children), SetList(), n if comp is None else comp,
+                    path_prefix, bodyIds, [], not isTop, sharedRef)
+        else:
+            return (n, d, iter(()), None, None, path_prefix, bodyIds, None, not isTop, sharedRef)
+
+    @staticmethod
+    def _iterPortsOfSharedComp(n: LNode, comp: LNode):
+        for (revIndex, p), (origRevIndex, orig_p) in zip_longest(n.iterPortsWithReverseFlag(),
+                                                                 comp.iterPortsWithReverseFlag(),
+                                                                 fillvalue=(None, None)):
+            assert p is not None, ("Current component is missing some port", list(n.iterPorts()), list(comp.iterPorts()))
+            assert orig_p is not None, ("Current component has an extra port", list(n.iterPorts()), list(comp.iterPorts()))
+            assert revIndex == origRevIndex, (p, orig_p, "the ports needs to be on same side of component")
+            yield revIndex, p, orig_p
+
+    def _portToElkJson(self, portIds: _IdRange, ids: Dict[object, int], bodyIds: Dict[object, int],
+                       addIndex: bool, orderFixed: bool, p: LPort, orig_p: Optional[LPort],
+                       level: int, i: int, revIndex: bool) -> Tuple[dict, int]:
+        """
+        Register the port, set its index and convert it to ELK JSON
+        (the same as :meth:`hwtGraph.elk.containers.lNode.LNode._toElkJson_registerPorts`
+        and :meth:`hwtGraph.elk.containers.lPort.LPort._toElkJson` together)
+
+        :param orig_p: the port of shared component which corresponds to this port (or None if not shared)
+        :return: tuple (JSON of the port, index for the next port)
+        :note: the children are converted iteratively (the depth is not limited by the recursion limit)
+        """
+        res = []
+        # stack of (port, port of shared component or None, level, list for JSON of the port, None)
+        # or (port, None, None, None, properties of the port) after the children of the port were converted
+        stack = [(p, orig_p, level, res, None)]
+        while stack:
+            p, orig_p, level, siblings, props = stack.pop()
+            if props is not None:
+                if addIndex and revIndex:
+                    p.index = i
+                    i += 1
+                if orderFixed:
+                    assert isinstance(p.index, int), p.index
+                    props["index"] = p.index
+                continue
+
+            if orig_p is not None:
+                assert p is not None, ("Current component is missing some port", orig_p)
+                assert p.name == orig_p.name, (p.name, orig_p.name)
+            if p.connectedAsParent:
+                assert isinstance(p.parent, LPort), p
+
+            if addIndex and not revIndex:
+                p.index = i
+                i += 1
+            id_ = portIds.registerInScope(ids, p)
+            if orig_p is not None:
+                # init also the alias
+                bodyIds[orig_p] = id_
+
+            props = {
+                "side": p.side.name,
+            }
+            children = []
+            siblings.append({
+                "id": str(id_),
+                "hwMeta": {
+                    "level": level,
+                    "name": p.name,
+                    "connectedAsParent": bool(p.connectedAsParent),
+                },
+                "children": children,
+                "direction": p.direction.name,
+                "properties": props,
+            })
+            stack.append((p, None, None, None, props))
+
+            if orig_p is None:
+                for c in reversed(p._children or ()):
+                    stack.append((c, None, level + 1, children, None))
+            else:
+                for c, orig_c in reversed(list(zip_longest(p._children or (), orig_p._children or ()))):
+                    assert orig_c is not None, ("Current component has an extra port", c)
+                    stack.append((c, orig_c, level + 1, children, None))
+
+        return res[0], i
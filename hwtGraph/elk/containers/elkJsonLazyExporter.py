@@ -0,0 +1,135 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+from hwt.synthesizer.componentPath import ComponentPath
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.containers.lNode import LNode
+
+# (node, JSON of the node, path_prefix, scope of idStore for path_prefix, isTop, depth)
+_PendingNode = Tuple[LNode, dict, ComponentPath, Dict[object, int], bool, Optional[int]]
+
+
+class ElkJsonLazyExporter():
+    """
+    Export of the LNode graph to ELK JSON where the bodies of the nodes are exported on demand.
+
+    All nodes, ports and edges are registered in idStore in advance
+    so the ids are the same as in the complete export (:meth:`hwtGraph.elk.containers.lNode.LNode.toElkJson`)
+    and the bodies exported later can be merged into previously exported JSON.
+    The node with a body which is not exported (a stub) has "lazy" flag in "hwMeta" and empty "_children" and "_edges",
+    the body can be exported by :meth:`~.exportSubtree` using id of the node.
+
+    :ivar ~.root: the top node of the graph
+    :ivar ~.idStore: the ElkIdStore with all objects registered
+    :ivar ~.maxIds: {node id: maxId} for each node
+    :ivar ~._nodes: {node id: (LNode, path_prefix, scope of idStore for path_prefix)}
+    """
+
+    def __init__(self, root: LNode, idStore: Optional[ElkIdStore]=None,
+                 path_prefix: ComponentPath=ComponentPath()):
+        if idStore is None:
+            idStore = ElkIdStore()
+        self.root = root
+        self.idStore = idStore
+        self.path_prefix = path_prefix
+
+        ids = idStore.getScope(path_prefix)
+        root._toElkJson_registerNodes(idStore, path_prefix, ids)
+        root._toElkJson_registerPortsOfNode(idStore, path_prefix, ids)
+        self.maxIds: Dict[int, int] = {}
+        root._toElkJson_registerEdges(idStore, path_prefix, ids, self.maxIds)
+
+        self._nodes: Dict[int, Tuple[LNode, ComponentPath, Dict[object, int]]] = {}
+        stack = [(root, path_prefix, ids)]
+        while stack:
+            n, pp, ids = stack.pop()
+            self._nodes[ids[n]] = (n, pp, ids)
+            children, pp, ids = n._getUniqRefChildrenScope(idStore, pp, ids)
+            stack.extend((ch, pp, ids) for ch in children)
+
+    def toElkJson(self, depth: Optional[int]=1) -> dict:
+        """
+        :param depth: number of levels of hierarchy which should be exported,
+            1 means that only the body of the root is exported, None means everything
+        """
+        return self._nodeToElkJson(self.root, self.path_prefix, self.idStore.getScope(self.path_prefix), True, depth)
+
+    def exportSubtree(self, nodeId: Union[int, str], depth: Optional[int]=1) -> dict:
+        """
+        Export the body of the node
+
+        :param nodeId: the ELK id of the node
+        :param depth: number of levels of hierarchy which should be exported (see :meth:`~.toElkJson`)
+        :return: dictionary with "id", "_children" and "_edges" of the node
+            ("children" and "edges" for the root)
+        """
+        n, path_prefix, ids = self._nodes[int(nodeId)]
+        d = {"id": str(nodeId)}
+        children, path_prefix, ids = n._getUniqRefChildrenScope(self.idStore, path_prefix, ids)
+        if children:
+            self._convertBodies(self._addBody(d, n, children, path_prefix, ids, n is self.root, depth))
+        return d
+
+    def _nodeToElkJson(self, n: LNode, path_prefix: ComponentPath, ids: Dict[object, int],
+                       isTop: bool, depth: Optional[int]) -> dict:
+        d = self._nodeToElkJson_head(n, ids, isTop)
+        self._convertBodies([(n, d, path_prefix, ids, isTop, depth)])
+        return d
+
+    def _nodeToElkJson_head(self, n: LNode, ids: Dict[object, int], isTop: bool) -> dict:
+        """
+        Convert the part of the node before the ports (the rest is added by :meth:`~._convertBodies`)
+        """
+        id_ = ids[n]
+        d = {
+            "hwMeta": n._toElkJson_hwMeta(self.maxIds[id_]),
+            "properties": n._toElkJson_properties(),
+        }
+        if not isTop:
+            d["id"] = str(id_)
+        return d
+
+    def _convertBodies(self, stack: List[_PendingNode]):
+        """
+        Add ports and bodies to the JSON of the nodes
+
+        :param stack: the nodes which JSON has only the head (:meth:`~._nodeToElkJson_head`)
+        :note: the nested nodes are converted iteratively (the depth of the hierarchy is not limited by the recursion limit),
+            the ids (and maxIds) are already known, because of this the JSON of the children can be constructed
+            before the children are completed
+        """
+        while stack:
+            n, d, path_prefix, ids, isTop, depth = stack.pop()
+            d["ports"] = [p._toElkJson(ids)
+                          for p in n.iterPorts()]
+
+            children, path_prefix, ids = n._getUniqRefChildrenScope(self.idStore, path_prefix, ids)
+            if children:
+                if depth is not None and depth <= 0:
+                    d["hwMeta"]["lazy"] = True
+                    d["_children"] = []
+                    d["_edges"] = []
+                else:
+                    stack.extend(self._addBody(d, n, children, path_prefix, ids, isTop, depth))
+
+    def _addBody(self, d: dict, n: LNode, children, path_prefix: ComponentPath, ids: Dict[object, int],
+                 isTop: bool, depth: Optional[int]) -> List[_PendingNode]:
+        """
+        Add the children and edges to the JSON of the node
+
+        :return: the children which ports and body has to be converted by :meth:`~._convertBodies`
+        """
+        if depth is not None:
+            depth -= 1
+        edges = n._getEdgesOfChildren(children)
+        pending = []
+        nodes = []
+        for ch in children:
+            chD = self._nodeToElkJson_head(ch, ids, False)
+            nodes.append(chD)
+            pending.append((ch, chD, path_prefix, ids, False, depth))
+        nodes.sort(key=lambda n: n["id"])
+
+        hideChildren = not isTop
+        d["_children" if hideChildren else "children"] = nodes
+        d["_edges" if hideChildren else "edges"] = [e._toElkJson(ids) for e in edges]
+        return pending
@@ -0,0 +1,168 @@
+import mmap
+from typing import List, Optional, Union
+
+from hwtGraph.elk.containers.constants import PortType, PortSide, \
+    PortConstraints
+from hwtGraph.elk.containers.elkJsonEncoder import ElkJsonEncoder, \
+    getElkJsonEncoder
+from hwtGraph.elk.containers.lEdge import LEdge
+from hwtGraph.elk.containers.lGraphTables import LGraphTables
+from hwtGraph.elk.containers.lNode import LNode, LayoutExternalPort
+from hwtGraph.elk.containers.lPort import LPort
+
+
+class ElkJsonToLNode():
+    """
+    Reconstruct the LNode graph from ELK JSON produced by :meth:`hwtGraph.elk.containers.lNode.LNode.toElkJson`
+    (or by other exporters from :mod:`hwtGraph.elk.containers`)
+
+    The ELK ids are dense integers (0..maxId of the root) because of this the objects
+    are stored in a list indexed by id instead of a dictionary.
+    The ids of nodes are assigned in pre-order, the order of the children is restored by sorting them by id.
+
+    :note: originObj is not restored, the name of an edge is the name from ELK JSON
+        (which is a repr of originObj if the edge had no name)
+    :note: the bodies of the shared components are instantiated for each instance (as in ELK JSON),
+        if the JSON was exported with dedupSharedComponents
+        (:class:`hwtGraph.elk.containers.elkJsonFusedExporter.ElkJsonFusedExporter`)
+        the instance has _shared_component_with set to the original component instead
+    :note: the direction of LayoutExternalPort is not stored in ELK JSON, it is None
+    :note: the order of the edges in the LPort.incomingEdges/outgoingEdges is the order of the edges in ELK JSON
+
+    :ivar ~.objs: list of LNode/LPort instances indexed by ELK id
+    """
+
+    def __init__(self):
+        self.objs: List[Union[LNode, LPort, None]] = []
+        self._sharedRefs = []
+
+    def __call__(self, d: dict) -> LNode:
+        hwMeta = d["hwMeta"]
+        self.objs = [None] * (hwMeta["maxId"] + 1)
+        self._sharedRefs = []
+        root = self._loadNode(d, None)
+        for n, ref in self._sharedRefs:
+            n._shared_component_with = self.objs[int(ref)]
+        self._sharedRefs.clear()
+        return root
+
+    def _loadNode(self, d: dict, parent: Optional[LNode]) -> LNode:
+        """
+        :note: the nested nodes are loaded iteratively (the depth of the hierarchy is not limited by the recursion limit),
+            the edges of a body are created after the whole body is loaded (as if this function was recursive)
+        """
+        root = None
+        # stack of (JSON of node, parent LNode, None) or (JSON of node, LNode, edges) after the children were loaded
+        stack = [(d, parent, None)]
+        while stack:
+            d, n, edges = stack.pop()
+            if edges is not None:
+                self._loadEdges(n, edges)
+                continue
+
+            n = self._loadNodeWithoutBody(d, n)
+            if root is None:
+                root = n
+
+            children = d.get("children", None)
+            if children is None:
+                children = d.get("_children", None)
+            if children:
+                edges = d.get("edges", None)
+                if edges is None:
+                    edges = d["_edges"]
+                stack.append((d, n, edges))
+                for ch in sorted(children, key=lambda ch: int(ch["id"]), reverse=True):
+                    stack.append((ch, n, None))
+
+        return root
+
+    def _loadNodeWithoutBody(self, d: dict, parent: Optional[LNode]) -> LNode:
+        hwMeta = d["hwMeta"]
+        if hwMeta.get("lazy", False):
+            raise ValueError("Can not load a body of the node which was not exported", hwMeta["name"])
+
+        if hwMeta.get("isExternalPort", False):
+            n = LayoutExternalPort(parent, name=hwMeta["name"])
+            n.cls = hwMeta["cls"]
+        else:
+            n = LNode(parent, name=hwMeta["name"], cls=hwMeta["cls"])
+        n.bodyText = hwMeta.get("bodyText", None)
+        n.portConstraints = PortConstraints[d["properties"]["org.eclipse.elk.portConstraints"]]
+        id_ = d.get("id", None)
+        if id_ is not None:
+            self.objs[int(id_)] = n
+        sharedRef = hwMeta.get("sharedComponentWith", None)
+        if sharedRef is not None:
+            self._sharedRefs.append((n, sharedRef))
+        if parent is not None:
+            parent.children.append(n)
+
+        # ports are in order of LNode.iterPorts(), south and west side is reversed
+        reversedSides = []
+        for pJson in d["ports"]:
+            p = self._loadPort(pJson, n)
+            sidePorts = n.getPortSideView(p.side)
+            if not sidePorts and (p.side is PortSide.SOUTH or p.side is PortSide.WEST):
+                reversedSides.append(sidePorts)
+            sidePorts.append(p)
+        for sidePorts in reversedSides:
+            sidePorts.reverse()
+
+        return n
+
+    def _loadEdges(self, n: LNode, edges: List[dict]):
+        objs = self.objs
+        for e in edges:
+            sources = e.get("sources", None)
+            if sources is None:
+                srcs = [objs[int(e["sourcePort"])]]
+                dsts = [objs[int(e["targetPort"])]]
+            else:
+                srcs = [objs[int(p)] for _, p in sources]
+                dsts = [objs[int(p)] for _, p in e["targets"]]
+            LEdge(n, srcs, dsts, name=e["hwMeta"]["name"])
+
+    def _loadPort(self, d: dict, parent: Union[LNode, LPort]) -> LPort:
+        """
+        :note: the children are loaded iteratively (the depth is not limited by the recursion limit)
+        """
+        res = None
+        # stack of (JSON of port, parent LNode/LPort)
+        stack = [(d, parent)]
+        while stack:
+            d, parent = stack.pop()
+            hwMeta = d["hwMeta"]
+            props = d["properties"]
+            p = LPort(parent, PortType[d["direction"]], PortSide[props["side"]], name=hwMeta["name"])
+            p.connectedAsParent = hwMeta["connectedAsParent"]
+            p.index = props.get("index", None)
+            self.objs[int(d["id"])] = p
+            if res is None:
+                res = p
+            else:
+                parent.children.append(p)
+
+            for ch in reversed(d["children"]):
+                stack.append((ch, p))
+        return res
+
+
+def loadLNode(fileName: str, decoder: Optional[ElkJsonEncoder]=None) -> LNode:
+    """
+    Load the LNode graph from the file with ELK JSON
+    or with the binary format of :class:`hwtGraph.elk.containers.lGraphTables.LGraphTables`
+    (the format is detected from the content), the file is memory mapped
+
+    :param decoder: the JSON decoder to use, if None the fastest available is used
+    """
+    with open(fileName, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(LGraphTables.BINARY_MAGIC)] == LGraphTables.BINARY_MAGIC:
+                return LGraphTables.fromBytes(data).toLNode()
+
+            if decoder is None:
+                decoder = getElkJsonEncoder()
+            d = decoder.loads(data)
+
+    return ElkJsonToLNode()(d)
@@ -1,26 +1,81 @@
+from typing import Dict, Generator, List, Optional, Tuple
+
+from hwt.synthesizer.componentPath import ComponentPath
 from hwtGraph.elk.containers.lNode import LNode
 from hwtGraph.elk.containers.lPort import LPort
 from hwtGraph.elk.containers.lEdge import LEdge
 
 
-class ElkIdStore(dict):
+class ElkIdStore():
     """
+    Generator of ids for ELK JSON
+
+    The objects are registered in scopes. The scope is a dictionary {object: id} for all objects instantiated
+    on a specific path in the hierarchy (the path changes only in the body of a shared component
+    where the same LNode/LPort/LEdge objects are instantiated for each instance of the component).
+    The export resolves the scope once per node body and then looks up ids directly in the scope dictionary
+    without construction of the paths.
+
+    The store can be also used as a dictionary {path_prefix / obj: id} (the API of the previous versions
+    where this class was a dict subclass), the keys are constructed on demand from the scopes.
+
     :attention: First register nodes then register ports
         otherwise id will not be generated correctly
+    :ivar ~.max_id: the id for the next registered object
+    :ivar ~.scopes: {path prefix: {object: id}}
     """
+
     def __init__(self, *args, **kwargs):
-        dict.__init__(self, *args, **kwargs)
+        """
+        :note: args and kwargs are the same as for dict, the items are set by :meth:`~.update`
+        """
         self.max_id = 0
+        self.scopes: Dict[Tuple, Dict[object, int]] = {}
+        if args or kwargs:
+            self.update(*args, **kwargs)
+
+    def getScope(self, path_prefix: ComponentPath) -> Dict[object, int]:
+        """
+        Get dictionary {object: id} for objects instantiated on the path_prefix
+        """
+        path_prefix = tuple(path_prefix)
+        scope = self.scopes.get(path_prefix, None)
+        if scope is None:
+            scope = self.scopes[path_prefix] = {}
+        return scope
 
-    def register(self, obj):
-        k = self.get(obj, None)
+    def registerInScope(self, scope: Dict[object, int], obj) -> int:
+        k = scope.get(obj, None)
         if k is not None:
             return k
-        k = self.max_id
-        self[obj] = k
+        k = scope[obj] = self.max_id
         self.max_id += 1
         return k
 
+    @staticmethod
+    def _splitPath(path: ComponentPath) -> Tuple[Tuple, object]:
+        """
+        :return: tuple (path prefix, object), the object which is not a path is in the scope of the empty path prefix
+        :raise KeyError: if the path is empty
+        """
+        if not isinstance(path, tuple):
+            return (), path
+        if not path:
+            raise KeyError(path)
+        path = tuple(path)
+        return path[:-1], path[-1]
+
+    def _findScope(self, path: ComponentPath) -> Tuple[Optional[Dict[object, int]], object]:
+        """
+        :return: tuple (scope or None if it does not exist, object), the scope is not created
+        """
+        path_prefix, obj = self._splitPath(path)
+        return self.scopes.get(path_prefix, None), obj
+
+    def register(self, path: ComponentPath) -> int:
+        path_prefix, obj = self._splitPath(path)
+        return self.registerInScope(self.getScope(path_prefix), obj)
+
     def getMaxId(self):
         return self.max_id - 1
 
@@ -32,3 +87,72 @@ class ElkIdStore(dict):
 
     def registerEdge(self, edge: LEdge):
         return self.register(edge)
+
+    def __getitem__(self, path: ComponentPath) -> int:
+        scope, obj = self._findScope(path)
+        if scope is None:
+            raise KeyError(path)
+        return scope[obj]
+
+    def __setitem__(self, path: ComponentPath, id_: int):
+        path_prefix, obj = self._splitPath(path)
+        self.getScope(path_prefix)[obj] = id_
+
+    def get(self, path: ComponentPath, default=None):
+        try:
+            scope, obj = self._findScope(path)
+        except KeyError:
+            return default
+        if scope is None:
+            return default
+        return scope.get(obj, default)
+
+    def __contains__(self, path: ComponentPath):
+        try:
+            scope, obj = self._findScope(path)
+        except KeyError:
+            return False
+        return scope is not None and obj in scope
+
+    def __len__(self):
+        return sum(len(scope) for scope in self.scopes.values())
+
+    def __delitem__(self, path: ComponentPath):
+        scope, obj = self._findScope(path)
+        if scope is None:
+            raise KeyError(path)
+        del scope[obj]
+
+    def items(self) -> List[Tuple[ComponentPath, int]]:
+        """
+        :return: list of tuples (path_prefix / obj, id)
+        """
+        return list(self._iterItems())
+
+    def _iterItems(self) -> Generator[Tuple[ComponentPath, int], None, None]:
+        for path_prefix, scope in self.scopes.items():
+            for obj, id_ in scope.items():
+                yield ComponentPath(*path_prefix, obj), id_
+
+    def keys(self) -> List[ComponentPath]:
+        return [k for k, _ in self._iterItems()]
+
+    def values(self) -> List[int]:
+        return [id_ for scope in self.scopes.values() for id_ in scope.values()]
+
+    def __iter__(self):
+        for k, _ in self._iterItems():
+            yield k
+
+    def update(self, other=(), **kwargs):
+        """
+        Set ids for paths from other dictionary or iterable of tuples (path, id), the max_id is not updated
+        """
+        if hasattr(other, "keys"):
+            for k in other.keys():
+                self[k] = other[k]
+        else:
+            for k, v in other:
+                self[k] = v
+        for k, v in kwargs.items():
+            self[k] = v
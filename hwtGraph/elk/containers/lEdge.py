@@ -1,7 +1,8 @@
-from typing import List
+from typing import Dict, Iterable, List
 
 from hwt.synthesizer.componentPath import ComponentPath
 from hwtGraph.elk.containers.constants import PortType
+from hwtGraph.elk.containers.orderedSetList import OrderedSetList
 
 
 class LEdge():
@@ -11,9 +12,13 @@ class LEdge():
     :ivar ~.parentNode: parent node instance
     :ivar ~.name: name of this edge (label)
     :ivar ~.originObj: optional object which was this edge generated for
-    :ivar ~.srcs: list of LPort instances where this edge starts
-    :ivar ~.dsts: list of LPort instances where this edge ends
+    :ivar ~.srcs: OrderedSetList of LPort instances where this edge starts
+    :ivar ~.dsts: OrderedSetList of LPort instances where this edge ends
+
+    :note: The srcs/dsts and incomingEdges/outgoingEdges of LPort are OrderedSetList
+        because of this the removal of the connection is O(1) and the order is deterministic.
     """
+    __slots__ = ["parentNode", "name", "originObj", "srcs", "dsts"]
 
     def __init__(self, parentNode: "LNode", srcs: List["LPort"], dsts: List["LPort"],
                  name: str=None, originObj=None):
@@ -27,21 +32,49 @@ class LEdge():
         assert isinstance(srcs, list) and len(srcs) >= 1, originObj
         assert isinstance(dsts, list) and len(dsts) >= 1, originObj
 
-        self.srcs = []
-        self.dsts = []
+        self.srcs = OrderedSetList()
+        self.dsts = OrderedSetList()
         for src in srcs:
-            self.addSource(src, addToSrc=False)
-        self.srcs = srcs
+            self.addSource(src)
 
         for dst in dsts:
-            self.addTarget(dst, addToDst=False)
-        self.dsts = dsts
+            self.addTarget(dst)
+
+    @classmethod
+    def fromCheckedPorts(cls, parentNode: "LNode", srcs: Iterable["LPort"], dsts: Iterable["LPort"],
+                         name: str=None, originObj=None) -> "LEdge":
+        """
+        Construct the edge without the checks of the relation of each port to the parentNode
+        (used for the ports which were already checked, e.g. in :class:`hwtGraph.elk.fromHwt.netCtx.NetCtx`)
+
+        :param srcs: unique source ports
+        :param dsts: unique destination ports
+        """
+        self = cls.__new__(cls)
+        self.parentNode = parentNode
+        self.name = name
+        self.originObj = originObj
+        self.srcs = _srcs = OrderedSetList(srcs)
+        self.dsts = _dsts = OrderedSetList(dsts)
+        assert _srcs and _dsts, originObj
+        # the edge is new, it can not be in the lists of the ports yet
+        for src in _srcs:
+            src.outgoingEdges._appendNew(self)
+        for dst in _dsts:
+            dst.incomingEdges._appendNew(self)
+        return self
 
     def removeTarget(self, dst: "LPort"):
         self.dsts.remove(dst)
         dst.incomingEdges.remove(self)
 
-    def addTarget(self, dst: "LPort", addToDst=True):
+    def _checkTarget(self, dst: "LPort") -> bool:
+        """
+        Check if the port can be a target of this edge
+
+        :raise AssertionError: if the port can not be connected
+        :return: True (the check is executed as "assert self._checkTarget(dst)" so it is skipped with python -O)
+        """
         if self.parentNode is dst.parentNode:
             # connection between input and output on nodes with same parent
             assert dst.direction == PortType.OUTPUT, dst
@@ -52,7 +85,10 @@ class LEdge():
             # target is child input port
             assert self.parentNode is dst.parentNode.parent, dst
             assert dst.direction == PortType.INPUT, dst
+        return True
 
+    def addTarget(self, dst: "LPort", addToDst=True):
+        assert self._checkTarget(dst)
         if addToDst:
             self.dsts.append(dst)
         dst.incomingEdges.append(self)
@@ -61,7 +97,12 @@ class LEdge():
         self.srcs.remove(src)
         src.outgoingEdges.remove(self)
 
-    def addSource(self, src: "LPort", addToSrc=True):
+    def _checkSource(self, src: "LPort") -> bool:
+        """
+        Check if the port can be a source of this edge
+
+        :see: :meth:`~._checkTarget`
+        """
         if self.parentNode is src.parentNode:
             # connection between input and output on nodes with same parent
             assert src.direction == PortType.INPUT, src
@@ -72,6 +113,10 @@ class LEdge():
             # source is child output port
             assert self.parentNode is src.parentNode.parent, src
             assert src.direction == PortType.OUTPUT, src
+        return True
+
+    def addSource(self, src: "LPort", addToSrc=True):
+        assert self._checkSource(src)
         if addToSrc:
             self.srcs.append(src)
         src.outgoingEdges.append(self)
@@ -85,9 +130,14 @@ class LEdge():
         self.dsts.clear()
 
     def toElkJson(self, idStore, path_prefix: ComponentPath):
+        return self._toElkJson(idStore.getScope(path_prefix))
+
+    def _toElkJson(self, ids: Dict[object, int]):
+        """
+        :param ids: the scope from ElkIdStore {object: id} for objects on the path of this edge
+        """
         def getId(o):
-            k = path_prefix / o
-            return str(idStore[k])
+            return str(ids[o])
         if len(self.dsts) > 1 or len(self.srcs) > 1:
             # hyperedge
             d = {
@@ -0,0 +1,708 @@
+from array import array
+from itertools import accumulate
+import struct
+import sys
+from typing import List, Optional, Dict, Tuple
+import zlib
+
+from hwtGraph.elk.containers.constants import PortType, PortSide, \
+    PortConstraints
+from hwtGraph.elk.containers.lEdge import LEdge
+from hwtGraph.elk.containers.lNode import LNode, LayoutExternalPort
+from hwtGraph.elk.containers.lPort import LPort
+from hwtGraph.elk.containers.orderedSetList import OrderedSetList
+
+try:
+    import numpy
+except ImportError:
+    # NumPy is optional, it only speeds up the gathers in :class:`_ElkJsonColumns`
+    numpy = None
+
+
+def _gather(values: list, col: array) -> list:
+    """
+    :return: [values[i] for i in col] (vectorized if NumPy is available)
+    """
+    if numpy is None or not col:
+        return [values[i] for i in col]
+    return numpy.array(values, dtype=object)[numpy.frombuffer(col, dtype=col.typecode)].tolist()
+
+
+def _enumNames(enumCls) -> List[Optional[str]]:
+    """
+    :return: list of names of the enum items indexed by the value of the item
+    """
+    names = [None] * (max(e.value for e in enumCls) + 1)
+    for e in enumCls:
+        names[e.value] = e.name
+    return names
+
+
+class _NodeInstance():
+    """
+    Node which is instantiated on specific path in hierarchy
+    (the nodes from body of shared component are instantiated once for each instance)
+
+    :ivar ~.node: the LNode instance
+    :ivar ~.row: index of this node in node tables
+    :ivar ~.scope: dictionary {LNode/LPort/LEdge: row} for objects of the parent path
+    :ivar ~.bodyScope: the scope for the children of this node
+    :ivar ~.children: list of _NodeInstance for children
+    """
+
+    def __init__(self, node: LNode, row: int, scope: dict, bodyScope: dict):
+        self.node = node
+        self.row = row
+        self.scope = scope
+        self.bodyScope = bodyScope
+        self.children: List["_NodeInstance"] = []
+
+
+class _ElkJsonColumns():
+    """
+    The values of ELK JSON for all rows of :class:`LGraphTables` which are resolved column by column
+    (the ids, strings and names of enum values) before the JSON dictionaries are built
+
+    :note: The ids are converted by str() because it is faster than the NumPy conversion of int to str.
+    """
+    __slots__ = ["nodeId", "nodeName", "nodeCls", "nodeBodyText", "nodePortConstraints", "nodeOrderFixed",
+                 "portId", "portName", "portSide", "portDirection",
+                 "edgeId", "edgeName"]
+
+    def __init__(self, t: "LGraphTables"):
+        nodeCnt = t.nodeCnt()
+        portCnt = t.portCnt()
+        edgeIdOffset = nodeCnt + portCnt
+        # the index -1 is a None
+        strings = t.strings + [None]
+
+        self.nodeId = [str(i) for i in range(nodeCnt)]
+        self.nodeName = _gather(strings, t.nodeName)
+        self.nodeCls = _gather(strings, t.nodeCls)
+        self.nodeBodyText = _gather(strings, t.nodeBodyText)
+        self.nodePortConstraints = _gather(_enumNames(PortConstraints), t.nodePortConstraints)
+        self.nodeOrderFixed = _gather([None if pc is None else PortConstraints[pc].isOrderFixed()
+                                       for pc in _enumNames(PortConstraints)], t.nodePortConstraints)
+
+        self.portId = [str(i) for i in range(nodeCnt, edgeIdOffset)]
+        self.portName = _gather(strings, t.portName)
+        self.portSide = _gather(_enumNames(PortSide), t.portSide)
+        self.portDirection = _gather(_enumNames(PortType), t.portDirection)
+
+        self.edgeId = [str(i) for i in range(edgeIdOffset, edgeIdOffset + t.edgeCnt())]
+        self.edgeName = _gather(strings, t.edgeName)
+
+
+class LGraphTables():
+    """
+    Columnar (structure of arrays) representation of the LNode graph as it is exported to ELK JSON.
+    Nodes, ports and edges are stored in tables, each column is :class:`array.array`
+    (and can be used as :func:`numpy.frombuffer` without copy), the adjacency lists are in CSR format
+    (xxxPtr[i]:xxxPtr[i+1] is the range in xxx array for the object on row i).
+
+    The rows are ordered in the order in which :meth:`LNode.toElkJson` registers objects to
+    :class:`hwtGraph.elk.containers.idStore.ElkIdStore` because of this the ELK id is just an index of the row:
+    node id = node row, port id = node count + port row, edge id = node count + port count + edge row.
+    The bodies of shared components are instantiated for every instance as in ELK JSON.
+
+    :note: The tables are a snapshot of the graph, the graph transformations are performed on
+        LNode/LPort/LEdge objects (the transformations are removing/inserting objects which would require a rebuild
+        of the tables), use :meth:`~.fromLNode` after all transformations.
+    :note: The tables are the storage of :attr:`hwtGraph.elk.fromHwt.convertor.LGraphBackend.TABLES`,
+        the read only LNode/LPort/LEdge API over the rows is provided by
+        :class:`hwtGraph.elk.containers.lGraphViews.LNodeView`.
+    :note: The ELK JSON is emitted from whole columns (:class:`_ElkJsonColumns`)
+        which are gathered by NumPy if it is available.
+    :note: the -1 is used as a None in integer columns
+    :note: The tables can be stored in a compact binary format (:meth:`~.toBytes`, :meth:`~.fromBytes`).
+
+    :ivar ~.strings: list of unique strings, the name columns are containing index to this list
+
+    :ivar ~.nodeParent: row of parent node
+    :ivar ~.nodeName: string index of LNode.name
+    :ivar ~.nodeCls: string index of LNode.cls
+    :ivar ~.nodeBodyText: string index of LNode.bodyText
+    :ivar ~.nodePortConstraints: PortConstraints value
+    :ivar ~.nodeExternalPortDirection: PortType value of LayoutExternalPort.direction
+        or -1 if the node is not LayoutExternalPort
+    :ivar ~.nodeChildrenPtr: CSR ptr for nodeChildren
+    :ivar ~.nodeChildren: rows of children nodes
+    :ivar ~.nodePortPtr: ports (including children ports) of the node are on rows nodePortPtr[i]:nodePortPtr[i+1]
+    :ivar ~.nodeEdgeStart: first row of an edge which is in the body of this node
+    :ivar ~.nodeEdgeEnd: end (exclusive) of the range of the edges which are in the body of this node
+        (the edges are ordered in post-order so nodeEdgeEnd is also an index of the last edge in the sub-tree of this node)
+    :ivar ~.nodeOriginObj: list of LNode.originObj (filled only if keepOriginObj)
+
+    :ivar ~.portNode: row of the node of this port (LPort.parentNode)
+    :ivar ~.portParent: row of the parent port
+    :ivar ~.portName: string index of LPort.name
+    :ivar ~.portDirection: PortType value
+    :ivar ~.portSide: PortSide value
+    :ivar ~.portConnectedAsParent: LPort.connectedAsParent
+    :ivar ~.portIndex: LPort.index (computed as in :meth:`LNode.toElkJson_registerPorts`)
+    :ivar ~.portChildrenPtr: CSR ptr for portChildren
+    :ivar ~.portChildren: rows of children ports
+    :ivar ~.portIncomingEdgesPtr: CSR ptr for portIncomingEdges
+    :ivar ~.portIncomingEdges: rows of edges from LPort.incomingEdges
+    :ivar ~.portOutgoingEdgesPtr: CSR ptr for portOutgoingEdges
+    :ivar ~.portOutgoingEdges: rows of edges from LPort.outgoingEdges
+    :ivar ~.portOriginObj: list of LPort.originObj (filled only if keepOriginObj)
+
+    :ivar ~.edgeParent: row of LEdge.parentNode
+    :ivar ~.edgeName: string index of the name of the edge (the repr of originObj is used if the name is not specified)
+    :ivar ~.edgeSrcsPtr: CSR ptr for edgeSrcs
+    :ivar ~.edgeSrcs: rows of ports from LEdge.srcs
+    :ivar ~.edgeDstsPtr: CSR ptr for edgeDsts
+    :ivar ~.edgeDsts: rows of ports from LEdge.dsts
+    :ivar ~.edgeOriginObj: list of LEdge.originObj (filled only if keepOriginObj)
+    """
+    INT_COLUMNS = (
+        "nodeParent", "nodeName", "nodeCls", "nodeBodyText",
+        "nodeChildrenPtr", "nodeChildren", "nodePortPtr", "nodeEdgeStart", "nodeEdgeEnd",
+        "portNode", "portParent", "portName", "portIndex",
+        "portChildrenPtr", "portChildren",
+        "portIncomingEdgesPtr", "portIncomingEdges",
+        "portOutgoingEdgesPtr", "portOutgoingEdges",
+        "edgeParent", "edgeName", "edgeSrcsPtr", "edgeSrcs", "edgeDstsPtr", "edgeDsts",
+    )
+    BYTE_COLUMNS = (
+        "nodePortConstraints", "nodeExternalPortDirection",
+        "portDirection", "portSide", "portConnectedAsParent",
+    )
+    # binary format: MAGIC, version (u8), zlib compressed payload
+    # payload: string lengths in characters (column), size (u32) and UTF-8 of all strings,
+    #          INT_COLUMNS and BYTE_COLUMNS, each column is: typecode (1 char), item count (u32), items (little endian)
+    # :note: the columns are stored as they are so the load is just a copy of the memory,
+    #     the redundancy of the columns (small values in int32) is removed by the compression
+    BINARY_MAGIC = b"LGT\0"
+    BINARY_VERSION = 1
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._stringIds: Dict[str, int] = {}
+        for name in self.INT_COLUMNS:
+            setattr(self, name, array("i"))
+        for name in self.BYTE_COLUMNS:
+            setattr(self, name, array("b"))
+        self.nodeOriginObj = []
+        self.portOriginObj = []
+        self.edgeOriginObj = []
+
+    def nodeCnt(self) -> int:
+        return len(self.nodeParent)
+
+    def portCnt(self) -> int:
+        return len(self.portNode)
+
+    def edgeCnt(self) -> int:
+        return len(self.edgeParent)
+
+    def internString(self, s: Optional[str]) -> int:
+        if s is None:
+            return -1
+        i = self._stringIds.get(s, None)
+        if i is None:
+            i = self._stringIds[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def getString(self, i: int) -> Optional[str]:
+        if i == -1:
+            return None
+        return self.strings[i]
+
+    @classmethod
+    def fromLNode(cls, root: LNode, keepOriginObj=False) -> "LGraphTables":
+        """
+        Build tables from the graph, the order of rows is the order of ids in ELK JSON
+        """
+        t = cls()
+        # nodes are registered in pre-order
+        rootInst = t._addNodeInstance(root, -1, {}, keepOriginObj)
+        nodeInstances = []
+        stack = [rootInst]
+        while stack:
+            inst = stack.pop()
+            nodeInstances.append(inst)
+            stack.extend(reversed(inst.children))
+
+        t.nodeChildrenPtr.append(0)
+        for inst in nodeInstances:
+            t.nodeChildren.extend(ch.row for ch in inst.children)
+            t.nodeChildrenPtr.append(len(t.nodeChildren))
+
+        # then ports of the nodes in the same order
+        portsEdges: List[Tuple[LPort, List[Tuple[LEdge, dict]], List[Tuple[LEdge, dict]]]] = []
+        for inst in nodeInstances:
+            t.nodePortPtr.append(len(t.portNode))
+            t._addPortsOfNodeInstance(inst, portsEdges, keepOriginObj)
+        t.nodePortPtr.append(len(t.portNode))
+        t.portChildrenPtr.append(len(t.portChildren))
+
+        # then edges in post-order
+        t.nodeEdgeStart.extend(0 for _ in range(len(nodeInstances)))
+        t.nodeEdgeEnd.extend(0 for _ in range(len(nodeInstances)))
+        t._addEdges(rootInst, keepOriginObj)
+
+        # resolve edge lists of ports now, when all edges are registered
+        for ptr, edges, portEdges in (
+                (t.portIncomingEdgesPtr, t.portIncomingEdges, (x[1] for x in portsEdges)),
+                (t.portOutgoingEdgesPtr, t.portOutgoingEdges, (x[2] for x in portsEdges)),
+            ):
+            for pEdges in portEdges:
+                ptr.append(len(edges))
+                for e, scope in pEdges:
+                    row = scope.get(e, None)
+                    if row is not None:
+                        # skip edges which are not exported
+                        edges.append(row)
+            ptr.append(len(edges))
+
+        return t
+
+    def _addNodeInstance(self, root: LNode, parentRow: int, scope: dict, keepOriginObj: bool) -> _NodeInstance:
+        """
+        Register the node and all its children in pre-order
+        """
+        rootInst = None
+        # (node, parent instance or None, scope of the node)
+        stack = [(root, None, scope)]
+        while stack:
+            node, parentInst, scope = stack.pop()
+            row = len(self.nodeParent)
+            scope[node] = row
+            comp = node._shared_component_with
+            if comp is None:
+                bodyScope = scope
+                children = node._children
+            else:
+                assert not node._children, node
+                # the body of shared component is instantiated in a new scope
+                # where the shared component is an alias of this node
+                bodyScope = {comp: row}
+                children = comp._children
+
+            inst = _NodeInstance(node, row, scope, bodyScope)
+            if parentInst is None:
+                rootInst = inst
+            else:
+                parentInst.children.append(inst)
+                parentRow = parentInst.row
+
+            self.nodeParent.append(parentRow)
+            self.nodeName.append(self.internString(node.name))
+            self.nodeCls.append(self.internString(node.cls))
+            self.nodeBodyText.append(self.internString(node.bodyText))
+            self.nodePortConstraints.append(node.portConstraints.value)
+            if isinstance(node, LayoutExternalPort):
+                d = node.direction
+                self.nodeExternalPortDirection.append(PortType.UNDEFINED.value if d is None else d.value)
+            else:
+                self.nodeExternalPortDirection.append(-1)
+            if keepOriginObj:
+                self.nodeOriginObj.append(node.originObj)
+
+            if children:
+                for ch in reversed(children):
+                    stack.append((ch, inst, bodyScope))
+
+        return rootInst
+
+    def _addPort(self, p: LPort, nodeRow: int, parentRow: int, scope: dict,
+                 portsEdges: list, keepOriginObj: bool) -> int:
+        row = len(self.portNode)
+        scope[p] = row
+        self.portNode.append(nodeRow)
+        self.portParent.append(parentRow)
+        self.portName.append(self.internString(p.name))
+        self.portDirection.append(p.direction.value)
+        self.portSide.append(p.side.value)
+        self.portConnectedAsParent.append(int(bool(p.connectedAsParent)))
+        self.portIndex.append(-1)
+        if keepOriginObj:
+            self.portOriginObj.append(p.originObj)
+        portsEdges.append((p, [], []))
+        return row
+
+    def _addPortsOfNodeInstance(self, inst: _NodeInstance, portsEdges: list, keepOriginObj: bool):
+        n = inst.node
+        comp = n._shared_component_with
+        addIndex = n.portConstraints == PortConstraints.FIXED_ORDER
+        portChildren = {}
+        i = 0
+        # (port, original port of shared component or None, parent port row, reversed index, is post visit)
+        stack = []
+        if comp is None:
+            for revIndex, p in reversed(list(n.iterPortsWithReverseFlag())):
+                stack.append((p, None, -1, revIndex, False))
+        else:
+            ports = list(n.iterPortsWithReverseFlag())
+            origPorts = list(comp.iterPortsWithReverseFlag())
+            assert len(ports) == len(origPorts), ("Shared component has different ports", n, comp)
+            for (revIndex, p), (origRevIndex, orig_p) in reversed(list(zip(ports, origPorts))):
+                assert revIndex == origRevIndex, (p, orig_p, "the ports needs to be on same side of component")
+                stack.append((p, orig_p, -1, revIndex, False))
+
+        # pre-order for registration, post-order for index of ports on reversed sides
+        while stack:
+            p, orig_p, parentRow, revIndex, isPostVisit = stack.pop()
+            if isPostVisit:
+                row = parentRow
+                if addIndex and revIndex:
+                    self.portIndex[row] = i
+                    i += 1
+                continue
+
+            row = self._addPort(p, inst.row, parentRow, inst.scope, portsEdges, keepOriginObj)
+            _, inEdges, outEdges = portsEdges[-1]
+            for e in p._incomingEdges or ():
+                inEdges.append((e, inst.bodyScope if e.parentNode is n else inst.scope))
+            for e in p._outgoingEdges or ():
+                outEdges.append((e, inst.bodyScope if e.parentNode is n else inst.scope))
+
+            if orig_p is not None:
+                assert p.name == orig_p.name, (p.name, orig_p.name)
+                # alias of the port of the shared component
+                inst.bodyScope[orig_p] = row
+                for e in orig_p._incomingEdges or ():
+                    if e.parentNode is comp:
+                        inEdges.append((e, inst.bodyScope))
+                for e in orig_p._outgoingEdges or ():
+                    if e.parentNode is comp:
+                        outEdges.append((e, inst.bodyScope))
+
+            if parentRow != -1:
+                portChildren.setdefault(parentRow, []).append(row)
+
+            if addIndex and not revIndex:
+                self.portIndex[row] = i
+                i += 1
+
+            stack.append((p, orig_p, row, revIndex, True))
+            children = p._children or ()
+            if orig_p is None:
+                for c in reversed(children):
+                    stack.append((c, None, row, revIndex, False))
+            else:
+                orig_children = orig_p._children or ()
+                assert len(children) == len(orig_children), (p, orig_p)
+                for c, orig_c in reversed(list(zip(children, orig_children))):
+                    stack.append((c, orig_c, row, revIndex, False))
+
+        # children of the ports of this node are on rows after the rows of the ports of previous nodes
+        for row in range(self.nodePortPtr[-1], len(self.portNode)):
+            self.portChildrenPtr.append(len(self.portChildren))
+            self.portChildren.extend(portChildren.get(row, ()))
+
+    def _addEdges(self, rootInst: _NodeInstance, keepOriginObj: bool):
+        # post-order walk of node instances
+        stack = [(rootInst, False)]
+        while stack:
+            inst, isPostVisit = stack.pop()
+            n = inst.node
+            if not isPostVisit:
+                stack.append((inst, True))
+                stack.extend((ch, False) for ch in reversed(inst.children))
+                continue
+
+            self.nodeEdgeStart[inst.row] = len(self.edgeParent)
+            if inst.children:
+                comp = n._shared_component_with
+                formalParent = n if comp is None else comp
+                children = formalParent._children
+                scope = inst.bodyScope
+                for e in n._getEdgesOfChildren(children):
+                    row = len(self.edgeParent)
+                    scope[e] = row
+                    self.edgeParent.append(inst.row)
+                    name = e.name
+                    if name is None and e.originObj is not None:
+                        name = repr(e.originObj)
+                    self.edgeName.append(self.internString(name))
+                    self.edgeSrcsPtr.append(len(self.edgeSrcs))
+                    self.edgeSrcs.extend(scope[p] for p in e.srcs)
+                    self.edgeDstsPtr.append(len(self.edgeDsts))
+                    self.edgeDsts.extend(scope[p] for p in e.dsts)
+                    if keepOriginObj:
+                        self.edgeOriginObj.append(e.originObj)
+
+            self.nodeEdgeEnd[inst.row] = len(self.edgeParent)
+
+        self.edgeSrcsPtr.append(len(self.edgeSrcs))
+        self.edgeDstsPtr.append(len(self.edgeDsts))
+
+    def _portToElkJson(self, cols: "_ElkJsonColumns", row: int, level: int) -> dict:
+        """
+        :return: the JSON of the port and all its children (pre-order walk without recursion)
+        """
+        res = []
+        # (port row, level, list where the JSON of the port should be appended)
+        stack = [(row, level, res)]
+        portChildren = self.portChildren
+        portChildrenPtr = self.portChildrenPtr
+        while stack:
+            row, level, siblings = stack.pop()
+            props = {
+                "side": cols.portSide[row],
+            }
+            if cols.nodeOrderFixed[self.portNode[row]]:
+                index = self.portIndex[row]
+                assert index != -1, row
+                props["index"] = index
+
+            children = []
+            siblings.append({
+                "id": cols.portId[row],
+                "hwMeta": {
+                    "level": level,
+                    "name": cols.portName[row],
+                    "connectedAsParent": bool(self.portConnectedAsParent[row]),
+                },
+                "children": children,
+                "direction": cols.portDirection[row],
+                "properties": props,
+            })
+            for ch in reversed(portChildren[portChildrenPtr[row]:portChildrenPtr[row + 1]]):
+                stack.append((ch, level + 1, children))
+
+        return res[0]
+
+    def _edgeToElkJson(self, cols: "_ElkJsonColumns", row: int) -> dict:
+        nodeId = cols.nodeId
+        portId = cols.portId
+        portNode = self.portNode
+        srcs = self.edgeSrcs[self.edgeSrcsPtr[row]:self.edgeSrcsPtr[row + 1]]
+        dsts = self.edgeDsts[self.edgeDstsPtr[row]:self.edgeDstsPtr[row + 1]]
+        if len(srcs) > 1 or len(dsts) > 1:
+            # hyperedge
+            d = {
+                "sources": [(nodeId[portNode[p]], portId[p]) for p in srcs],
+                "targets": [(nodeId[portNode[p]], portId[p]) for p in dsts],
+            }
+        else:
+            # regular edge
+            src = srcs[0]
+            dst = dsts[0]
+            d = {
+                "source": nodeId[portNode[src]],
+                "sourcePort": portId[src],
+                "target": nodeId[portNode[dst]],
+                "targetPort": portId[dst],
+            }
+        d["id"] = cols.edgeId[row]
+        d["hwMeta"] = {"name": cols.edgeName[row]}
+        return d
+
+    def _nodeToElkJson(self, cols: "_ElkJsonColumns", row: int, isTop: bool) -> dict:
+        """
+        :return: the JSON of the node and all its children (pre-order walk without recursion)
+        """
+        edgeIdOffset = len(cols.nodeId) + len(cols.portId)
+        portParent = self.portParent
+        res = []
+        # (node row, isTop, list where the JSON of the node should be appended)
+        stack = [(row, isTop, res)]
+        while stack:
+            row, isTop, siblings = stack.pop()
+            hw_meta = {
+                "name": cols.nodeName[row],
+                "cls": cols.nodeCls[row],
+            }
+            bodyText = cols.nodeBodyText[row]
+            if bodyText is not None:
+                hw_meta["bodyText"] = bodyText
+            hw_meta["maxId"] = edgeIdOffset + self.nodeEdgeEnd[row] - 1
+            if self.nodeExternalPortDirection[row] != -1:
+                hw_meta["isExternalPort"] = True
+
+            d = {
+                "hwMeta": hw_meta,
+                "properties": {
+                    "org.eclipse.elk.portConstraints": cols.nodePortConstraints[row],
+                    'org.eclipse.elk.layered.mergeEdges': 1,
+                },
+            }
+            if not isTop:
+                d["id"] = cols.nodeId[row]
+
+            d["ports"] = [self._portToElkJson(cols, p, 0)
+                          for p in range(self.nodePortPtr[row], self.nodePortPtr[row + 1])
+                          if portParent[p] == -1]
+
+            children = self.nodeChildren[self.nodeChildrenPtr[row]:self.nodeChildrenPtr[row + 1]]
+            if children:
+                hideChildren = not isTop
+                nodes = []
+                d["_children" if hideChildren else "children"] = nodes
+                d["_edges" if hideChildren else "edges"] = [
+                    self._edgeToElkJson(cols, e)
+                    for e in range(self.nodeEdgeStart[row], self.nodeEdgeEnd[row])
+                ]
+                for ch in reversed(sorted(children, key=str)):
+                    stack.append((ch, False, nodes))
+
+            siblings.append(d)
+
+        return res[0]
+
+    @staticmethod
+    def _packColumn(col: array, buff: List[bytes]):
+        if sys.byteorder != "little" and col.itemsize > 1:
+            col = array(col.typecode, col)
+            col.byteswap()
+        buff.append(struct.pack("<cI", col.typecode.encode(), len(col)))
+        buff.append(col.tobytes())
+
+    @staticmethod
+    def _unpackColumn(data: memoryview, offset: int, typecode: str) -> Tuple[array, int]:
+        itemTypecode, cnt = struct.unpack_from("<cI", data, offset)
+        offset += 5
+        col = array(itemTypecode.decode())
+        end = offset + cnt * col.itemsize
+        col.frombytes(data[offset:end])
+        if sys.byteorder != "little" and col.itemsize > 1:
+            col.byteswap()
+        if col.typecode != typecode:
+            raise ValueError("Unexpected type of LGraphTables column", col.typecode, typecode)
+        return col, end
+
+    def toBytes(self, compressLevel: int=6) -> bytes:
+        """
+        Serialize tables to compact binary format (the originObj columns are not stored)
+        """
+        strings = self.strings
+        buff = []
+        self._packColumn(array("i", (len(s) for s in strings)), buff)
+        strings = "".join(strings).encode("utf-8")
+        buff.append(struct.pack("<I", len(strings)))
+        buff.append(strings)
+        for name in self.INT_COLUMNS + self.BYTE_COLUMNS:
+            self._packColumn(getattr(self, name), buff)
+
+        return b"".join((self.BINARY_MAGIC, struct.pack("<B", self.BINARY_VERSION),
+                         zlib.compress(b"".join(buff), compressLevel)))
+
+    @classmethod
+    def fromBytes(cls, data: bytes) -> "LGraphTables":
+        """
+        Load tables from binary format produced by :meth:`~.toBytes`
+
+        :param data: bytes or an object with buffer protocol (e.g. mmap)
+        :raise ValueError: if the data is not in this format
+        """
+        headerSize = len(cls.BINARY_MAGIC) + 1
+        if data[:len(cls.BINARY_MAGIC)] != cls.BINARY_MAGIC:
+            raise ValueError("Not a LGraphTables binary data")
+        version = data[len(cls.BINARY_MAGIC)]
+        if version != cls.BINARY_VERSION:
+            raise ValueError("Unsupported version of LGraphTables binary data", version)
+
+        with memoryview(data) as view:
+            data = memoryview(zlib.decompress(view[headerSize:]))
+        t = cls()
+        strLens, offset = cls._unpackColumn(data, 0, "i")
+        blobSize, = struct.unpack_from("<I", data, offset)
+        offset += 4
+        end = offset + blobSize
+        blob = str(data[offset:end], "utf-8")
+        offset = end
+        strings = t.strings
+        start = 0
+        for end in accumulate(strLens):
+            strings.append(blob[start:end])
+            start = end
+        t._stringIds = {s: i for i, s in enumerate(strings)}
+
+        for name in cls.INT_COLUMNS:
+            col, offset = cls._unpackColumn(data, offset, "i")
+            setattr(t, name, col)
+        for name in cls.BYTE_COLUMNS:
+            col, offset = cls._unpackColumn(data, offset, "b")
+            setattr(t, name, col)
+        assert offset == len(data), (offset, len(data))
+        return t
+
+    def toElkJson(self, row: int=0) -> dict:
+        """
+        :param row: the row of the node which should be exported (the root node is on row 0,
+            the children of other nodes are hidden and the ids are the ids from the whole graph)
+        :return: same dictionary as LNode.toElkJson(ElkIdStore()) for the graph from which this table was build
+        """
+        return self._nodeToElkJson(_ElkJsonColumns(self), row, row == 0)
+
+    def toLNode(self) -> LNode:
+        """
+        Reconstruct the LNode graph from the tables.
+
+        :note: the bodies of shared components are instantiated (the _shared_component_with is not set)
+        :note: the originObj is set only if the tables were created with keepOriginObj
+            the names of edges are set to a repr(originObj) if the edge had no name
+        """
+        nodes: List[LNode] = []
+        hasOriginObj = bool(self.nodeOriginObj)
+        for row in range(self.nodeCnt()):
+            parentRow = self.nodeParent[row]
+            parent = None if parentRow == -1 else nodes[parentRow]
+            originObj = self.nodeOriginObj[row] if hasOriginObj else None
+            extDir = self.nodeExternalPortDirection[row]
+            if extDir == -1:
+                n = LNode(parent, name=self.getString(self.nodeName[row]),
+                          cls=self.getString(self.nodeCls[row]),
+                          originObj=originObj,
+                          bodyText=self.getString(self.nodeBodyText[row]))
+            else:
+                n = LayoutExternalPort(parent, name=self.getString(self.nodeName[row]),
+                                       direction=PortType(extDir), originObj=originObj)
+                n.cls = self.getString(self.nodeCls[row])
+                n.bodyText = self.getString(self.nodeBodyText[row])
+            n.portConstraints = PortConstraints(self.nodePortConstraints[row])
+            if parent is not None:
+                parent.children.append(n)
+            nodes.append(n)
+
+        ports: List[LPort] = []
+        reversedSides: List[Tuple[LNode, PortSide]] = []
+        for row in range(self.portCnt()):
+            node = nodes[self.portNode[row]]
+            parentRow = self.portParent[row]
+            side = PortSide(self.portSide[row])
+            p = LPort(node if parentRow == -1 else ports[parentRow],
+                      PortType(self.portDirection[row]), side,
+                      name=self.getString(self.portName[row]),
+                      originObj=self.portOriginObj[row] if hasOriginObj else None)
+            p.connectedAsParent = bool(self.portConnectedAsParent[row])
+            index = self.portIndex[row]
+            if index != -1:
+                p.index = index
+            if parentRow == -1:
+                sidePorts = node.getPortSideView(side)
+                if side in (PortSide.SOUTH, PortSide.WEST) and not sidePorts:
+                    # ports on this side are stored in reversed order
+                    reversedSides.append((node, side))
+                sidePorts.append(p)
+            else:
+                ports[parentRow].children.append(p)
+            ports.append(p)
+
+        for node, side in reversedSides:
+            node.getPortSideView(side).reverse()
+
+        edges: List[LEdge] = []
+        for row in range(self.edgeCnt()):
+            e = LEdge(nodes[self.edgeParent[row]],
+                      [ports[p] for p in self.edgeSrcs[self.edgeSrcsPtr[row]:self.edgeSrcsPtr[row + 1]]],
+                      [ports[p] for p in self.edgeDsts[self.edgeDstsPtr[row]:self.edgeDstsPtr[row + 1]]],
+                      name=self.getString(self.edgeName[row]),
+                      originObj=self.edgeOriginObj[row] if hasOriginObj else None)
+            edges.append(e)
+
+        # restore the order of edges on ports
+        for row, p in enumerate(ports):
+            inEdges = self.portIncomingEdges[self.portIncomingEdgesPtr[row]:self.portIncomingEdgesPtr[row + 1]]
+            if inEdges:
+                p.incomingEdges = OrderedSetList(edges[e] for e in inEdges)
+            outEdges = self.portOutgoingEdges[self.portOutgoingEdgesPtr[row]:self.portOutgoingEdgesPtr[row + 1]]
+            if outEdges:
+                p.outgoingEdges = OrderedSetList(edges[e] for e in outEdges)
+
+        return nodes[0]
@@ -0,0 +1,267 @@
+from typing import Generator, List, Optional, Tuple, Union
+
+from hwtGraph.elk.containers.constants import PortConstraints, PortSide, \
+    PortType
+from hwtGraph.elk.containers.lGraphTables import LGraphTables
+
+
+class LNodeView():
+    """
+    Read only view of the node on the row of :class:`hwtGraph.elk.containers.lGraphTables.LGraphTables`
+    with the same API as :class:`hwtGraph.elk.containers.lNode.LNode` has for reading
+    (the views are created on access, the views of the same row are equal).
+
+    :note: The bodies of shared components are instantiated in the tables, _shared_component_with is always None.
+
+    :ivar ~.tables: the tables where the node is stored
+    :ivar ~.row: the row of the node in the tables (the root node is on row 0)
+    """
+    __slots__ = ["tables", "row"]
+    _shared_component_with = None
+
+    def __init__(self, tables: LGraphTables, row: int=0):
+        self.tables = tables
+        self.row = row
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.tables.getString(self.tables.nodeName[self.row])
+
+    @property
+    def cls(self) -> Optional[str]:
+        return self.tables.getString(self.tables.nodeCls[self.row])
+
+    @property
+    def bodyText(self) -> Optional[str]:
+        return self.tables.getString(self.tables.nodeBodyText[self.row])
+
+    @property
+    def originObj(self):
+        originObj = self.tables.nodeOriginObj
+        return originObj[self.row] if originObj else None
+
+    @property
+    def portConstraints(self) -> PortConstraints:
+        return PortConstraints(self.tables.nodePortConstraints[self.row])
+
+    @property
+    def parent(self) -> Optional["LNodeView"]:
+        parent = self.tables.nodeParent[self.row]
+        return None if parent == -1 else LNodeView(self.tables, parent)
+
+    @property
+    def children(self) -> List["LNodeView"]:
+        t = self.tables
+        return [LNodeView(t, ch) for ch in t.nodeChildren[t.nodeChildrenPtr[self.row]:t.nodeChildrenPtr[self.row + 1]]]
+
+    _children = children
+
+    @property
+    def west(self) -> List["LPortView"]:
+        return self.getPortSideView(PortSide.WEST)
+
+    @property
+    def east(self) -> List["LPortView"]:
+        return self.getPortSideView(PortSide.EAST)
+
+    @property
+    def north(self) -> List["LPortView"]:
+        return self.getPortSideView(PortSide.NORTH)
+
+    @property
+    def south(self) -> List["LPortView"]:
+        return self.getPortSideView(PortSide.SOUTH)
+
+    def iterPorts(self) -> Generator["LPortView", None, None]:
+        t = self.tables
+        portParent = t.portParent
+        for p in range(t.nodePortPtr[self.row], t.nodePortPtr[self.row + 1]):
+            if portParent[p] == -1:
+                yield LPortView(t, p)
+
+    def iterPortsWithReverseFlag(self) -> Generator[Tuple[bool, "LPortView"], None, None]:
+        for p in self.iterPorts():
+            yield (p.side in (PortSide.SOUTH, PortSide.WEST), p)
+
+    def getPortSideView(self, side: PortSide) -> List["LPortView"]:
+        """
+        :return: new list of ports on the side (in the same order as in the list of the LNode)
+        """
+        ports = [p for p in self.iterPorts() if p.side == side]
+        if side in (PortSide.SOUTH, PortSide.WEST):
+            # ports on this side are stored in reversed order
+            ports.reverse()
+        return ports
+
+    def iterEdges(self) -> Generator["LEdgeView", None, None]:
+        """
+        Iter edges connected from outside of this unit
+        """
+        for p in self.iterPorts():
+            yield from p.iterEdges()
+
+    def getNode(self):
+        return self
+
+    def toElkJson(self) -> dict:
+        """
+        :return: same dictionary as LNode.toElkJson(ElkIdStore()) of the root node
+            (the children of other nodes are hidden and the ids are the ids from the whole graph)
+        """
+        return self.tables.toElkJson(self.row)
+
+    def __eq__(self, other):
+        return isinstance(other, LNodeView) and self.row == other.row and self.tables is other.tables
+
+    def __hash__(self):
+        return hash(self.row)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} {self.row:d} {self.name}>"
+
+
+class LPortView():
+    """
+    Read only view of the port on the row of :class:`hwtGraph.elk.containers.lGraphTables.LGraphTables`
+    with the same API as :class:`hwtGraph.elk.containers.lPort.LPort` has for reading
+
+    :ivar ~.tables: the tables where the port is stored
+    :ivar ~.row: the row of the port in the tables
+    """
+    __slots__ = ["tables", "row"]
+
+    def __init__(self, tables: LGraphTables, row: int):
+        self.tables = tables
+        self.row = row
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.tables.getString(self.tables.portName[self.row])
+
+    @property
+    def direction(self) -> PortType:
+        return PortType(self.tables.portDirection[self.row])
+
+    @property
+    def side(self) -> PortSide:
+        return PortSide(self.tables.portSide[self.row])
+
+    @property
+    def connectedAsParent(self) -> bool:
+        return bool(self.tables.portConnectedAsParent[self.row])
+
+    @property
+    def index(self) -> Optional[int]:
+        index = self.tables.portIndex[self.row]
+        return None if index == -1 else index
+
+    @property
+    def originObj(self):
+        originObj = self.tables.portOriginObj
+        return originObj[self.row] if originObj else None
+
+    @property
+    def parentNode(self) -> LNodeView:
+        return LNodeView(self.tables, self.tables.portNode[self.row])
+
+    @property
+    def parent(self) -> Union[LNodeView, "LPortView"]:
+        parent = self.tables.portParent[self.row]
+        return self.parentNode if parent == -1 else LPortView(self.tables, parent)
+
+    @property
+    def children(self) -> List["LPortView"]:
+        t = self.tables
+        return [LPortView(t, ch) for ch in t.portChildren[t.portChildrenPtr[self.row]:t.portChildrenPtr[self.row + 1]]]
+
+    _children = children
+
+    @property
+    def incomingEdges(self) -> List["LEdgeView"]:
+        t = self.tables
+        return [LEdgeView(t, e)
+                for e in t.portIncomingEdges[t.portIncomingEdgesPtr[self.row]:t.portIncomingEdgesPtr[self.row + 1]]]
+
+    _incomingEdges = incomingEdges
+
+    @property
+    def outgoingEdges(self) -> List["LEdgeView"]:
+        t = self.tables
+        return [LEdgeView(t, e)
+                for e in t.portOutgoingEdges[t.portOutgoingEdgesPtr[self.row]:t.portOutgoingEdgesPtr[self.row + 1]]]
+
+    _outgoingEdges = outgoingEdges
+
+    def getLevel(self) -> int:
+        """
+        Get nest-level of this port
+        """
+        t = self.tables
+        lvl = 0
+        p = t.portParent[self.row]
+        while p != -1:
+            lvl += 1
+            p = t.portParent[p]
+        return lvl
+
+    def iterEdges(self) -> Generator["LEdgeView", None, None]:
+        yield from self.incomingEdges
+        yield from self.outgoingEdges
+
+    def __eq__(self, other):
+        return isinstance(other, LPortView) and self.row == other.row and self.tables is other.tables
+
+    def __hash__(self):
+        return hash(self.row)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} {self.direction.name:s} {self.row:d} {self.name}>"
+
+
+class LEdgeView():
+    """
+    Read only view of the edge on the row of :class:`hwtGraph.elk.containers.lGraphTables.LGraphTables`
+    with the same API as :class:`hwtGraph.elk.containers.lEdge.LEdge` has for reading
+
+    :note: The name of the edge without a name is the repr of its originObj (the name used in ELK JSON).
+
+    :ivar ~.tables: the tables where the edge is stored
+    :ivar ~.row: the row of the edge in the tables
+    """
+    __slots__ = ["tables", "row"]
+
+    def __init__(self, tables: LGraphTables, row: int):
+        self.tables = tables
+        self.row = row
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.tables.getString(self.tables.edgeName[self.row])
+
+    @property
+    def originObj(self):
+        originObj = self.tables.edgeOriginObj
+        return originObj[self.row] if originObj else None
+
+    @property
+    def parentNode(self) -> LNodeView:
+        return LNodeView(self.tables, self.tables.edgeParent[self.row])
+
+    @property
+    def srcs(self) -> List[LPortView]:
+        t = self.tables
+        return [LPortView(t, p) for p in t.edgeSrcs[t.edgeSrcsPtr[self.row]:t.edgeSrcsPtr[self.row + 1]]]
+
+    @property
+    def dsts(self) -> List[LPortView]:
+        t = self.tables
+        return [LPortView(t, p) for p in t.edgeDsts[t.edgeDstsPtr[self.row]:t.edgeDstsPtr[self.row + 1]]]
+
+    def __eq__(self, other):
+        return isinstance(other, LEdgeView) and self.row == other.row and self.tables is other.tables
+
+    def __hash__(self):
+        return hash(self.row)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} {self.row:d}, {self.srcs} -> {self.dsts}>"
@@ -1,5 +1,6 @@
+import json
 from itertools import chain, zip_longest
-from typing import List, Generator
+from typing import List, Generator, Dict, Union
 
 from hwt.pyUtils.setList import SetList
 from hwt.synthesizer.componentPath import ComponentPath
@@ -7,6 +8,7 @@ from hwtGraph.elk.containers.constants import PortSide, PortType, \
     NodeType, PortConstraints
 from hwtGraph.elk.containers.lEdge import LEdge
 from hwtGraph.elk.containers.lPort import LPort
+from hwtGraph.elk.containers.orderedSetList import OrderedSetList
 
 
 class LNode():
@@ -23,11 +25,17 @@ class LNode():
     :ivar ~.west: list of LPort for on left side.
     :ivar ~.bodyText: text which should be rendered inside body of component
         (if it is not only container of children)
+    :ivar ~.children: OrderedSetList of children LNodes (O(1) remove, keeps insertion order)
     :ivar ~._shared_component_with: optional LNode insance
         if set the body of this component is not filled and it is same
         as the _shared_component_with LNode
     """
 
+    __slots__ = ["originObj", "name", "cls", "bodyText",
+                 "_west", "_east", "_north", "_south",
+                 "parent", "portConstraints", "_children", "origin",
+                 "_shared_component_with", "_node2lnode"]
+
     def __init__(self, parent: "LNode"=None, name: str=None, cls: str=None,
                  originObj=None, node2lnode=None, bodyText=None):
         if name is not None:
@@ -37,27 +45,86 @@ class LNode():
         self.cls = cls
         self.bodyText = bodyText
 
-        self.west = []
-        self.east = []
-        self.north = []
-        self.south = []
+        # lists of ports and children are allocated on first access
+        # (see the properties below) because most of them remain empty
+        self._west = None
+        self._east = None
+        self._north = None
+        self._south = None
 
         self.parent = parent
 
         self.portConstraints = PortConstraints.FIXED_ORDER
-        self.children = []
+        self._children = None
         self.origin = None
         self._shared_component_with = None
         self._node2lnode = node2lnode
 
+    @property
+    def west(self) -> List[LPort]:
+        ports = self._west
+        if ports is None:
+            ports = self._west = []
+        return ports
+
+    @west.setter
+    def west(self, ports: List[LPort]):
+        self._west = ports
+
+    @property
+    def east(self) -> List[LPort]:
+        ports = self._east
+        if ports is None:
+            ports = self._east = []
+        return ports
+
+    @east.setter
+    def east(self, ports: List[LPort]):
+        self._east = ports
+
+    @property
+    def north(self) -> List[LPort]:
+        ports = self._north
+        if ports is None:
+            ports = self._north = []
+        return ports
+
+    @north.setter
+    def north(self, ports: List[LPort]):
+        self._north = ports
+
+    @property
+    def south(self) -> List[LPort]:
+        ports = self._south
+        if ports is None:
+            ports = self._south = []
+        return ports
+
+    @south.setter
+    def south(self, ports: List[LPort]):
+        self._south = ports
+
+    @property
+    def children(self) -> OrderedSetList:
+        children = self._children
+        if children is None:
+            children = self._children = OrderedSetList()
+        return children
+
+    @children.setter
+    def children(self, children: List["LNode"]):
+        if not isinstance(children, OrderedSetList):
+            children = OrderedSetList(children)
+        self._children = children
+
     def iterPorts(self) -> Generator[LPort, None, None]:
-        return chain(self.north, self.east,
-                     reversed(self.south), reversed(self.west))
+        return chain(self._north or (), self._east or (),
+                     reversed(self._south or ()), reversed(self._west or ()))
 
     def iterPortsWithReverseFlag(self) -> Generator[LPort, None, None]:
-        for p in chain(self.north, self.east):
+        for p in chain(self._north or (), self._east or ()):
             yield (False, p)
-        for p in chain(reversed(self.south), reversed(self.west)):
+        for p in chain(reversed(self._south or ()), reversed(self._west or ())):
             yield (True, p)
 
     def getPortSideView(self, side) -> List["LPort"]:
@@ -119,68 +186,127 @@ class LNode():
     def _getUniqRefChildren(self, path_prefix: ComponentPath):
         comp = self._shared_component_with
         if comp is None:
-            children = self.children
+            children = self._children
         else:
-            assert not self.children, self
+            assert not self._children, self
             # reuse the body of an existing component
             path_prefix = path_prefix / self
-            children = comp.children
+            children = comp._children
+
+        if children is None:
+            children = ()
 
         return children, path_prefix
 
+    def _getUniqRefChildrenScope(self, idStore, path_prefix: ComponentPath, ids: Dict[object, int]):
+        """
+        Same as :meth:`~._getUniqRefChildren` but also resolves the scope of ElkIdStore for the children
+        """
+        comp = self._shared_component_with
+        if comp is None:
+            children = self._children
+        else:
+            assert not self._children, self
+            # reuse the body of an existing component
+            path_prefix = path_prefix / self
+            ids = idStore.getScope(path_prefix)
+            children = comp._children
+
+        if children is None:
+            children = ()
+
+        return children, path_prefix, ids
+
     def toElkJson_registerNodes(self, idStore,
                                 path_prefix: ComponentPath):
+        self._toElkJson_registerNodes(idStore, path_prefix, idStore.getScope(path_prefix))
 
-        id_ = idStore.registerNode(path_prefix / self)
-        c = self._shared_component_with
-        if c is not None:
-            idStore[path_prefix / self / c] = id_
+    def _toElkJson_registerNodes(self, idStore, path_prefix: ComponentPath, ids: Dict[object, int]):
+        """
+        Register this node and all nested nodes (in pre-order)
+        """
+        # stack of (node, path_prefix, ids)
+        stack = [(self, path_prefix, ids)]
+        while stack:
+            n, path_prefix, ids = stack.pop()
+            id_ = idStore.registerInScope(ids, n)
+            children, chPathPrefix, bodyIds = n._getUniqRefChildrenScope(idStore, path_prefix, ids)
+            c = n._shared_component_with
+            if c is not None:
+                bodyIds[c] = id_
+
+            for ch in reversed(children):
+                stack.append((ch, chPathPrefix, bodyIds))
+
+    def _toElkJson_registerPorts(self, idStore, ids: Dict[object, int],
+                                 addIndex: bool, p: LPort,
+                                 i: int, revIndex: bool):
+        """
+        Register the port and all its children and set the index of the ports
 
-        children, path_prefix = self._getUniqRefChildren(path_prefix)
-        for ch in children:
-            ch.toElkJson_registerNodes(idStore, path_prefix)
+        :return: the index for the next port
+        """
+        # stack of (port, True if the children of the port were already registered)
+        stack = [(p, False)]
+        while stack:
+            p, isAfterChildren = stack.pop()
+            if isAfterChildren:
+                p.index = i
+                i += 1
+                continue
+
+            if addIndex and not revIndex:
+                p.index = i
+                i += 1
+            idStore.registerInScope(ids, p)
+            if addIndex and revIndex:
+                stack.append((p, True))
+
+            children = p._children
+            if children:
+                for c in reversed(children):
+                    stack.append((c, False))
 
-    def _toElkJson_registerPorts(self, idStore,
-                                 path_prefix: ComponentPath, addIndex: bool, p: LPort,
-                                 i: int, revIndex: bool):
-        if addIndex and not revIndex:
-            p.index = i
-            i += 1
-        idStore.registerPort(path_prefix / p)
-        for c in p.children:
-            i = self._toElkJson_registerPorts(idStore, path_prefix, addIndex, c, i, revIndex)
-
-        if addIndex and revIndex:
-            p.index = i
-            i += 1
         return i
 
     def _toElkJson_registerPorts_shared_comp(self, idStore,
-                                             path_prefix: ComponentPath,
-                                             pp: ComponentPath,
+                                             ids: Dict[object, int],
+                                             bodyIds: Dict[object, int],
                                              c: "LNode",
                                              addIndex: bool, p: LPort, orig_p: LPort,
                                              i: int, revIndex: bool):
-        assert p is not None, (
-            "Current component is missing some port",
-            list(self.iterPorts()), list(c.iterPorts()))
-        assert orig_p is not None, (
-            "Current component has an extra port",
-            list(self.iterPorts()), list(c.iterPorts()))
-        assert p.name == orig_p.name, (p.name, orig_p.name)
-        if addIndex and not revIndex:
-            p.index = i
-            i += 1
-        id_ = idStore.registerPort(path_prefix / p)
-        # init also the alias
-        idStore[pp / orig_p] = id_
-
-        for _c, orig_p in zip_longest(p.children, orig_p.children):
-            i = self._toElkJson_registerPorts_shared_comp(idStore, path_prefix,
-                                                          pp, c, addIndex, _c, orig_p, i, revIndex)
-        if addIndex and revIndex:
-            p.index = i
-            i += 1
+        """
+        :see: :meth:`~._toElkJson_registerPorts`, the ports of the shared component are registered as aliases
+        """
+        # stack of (port, port of shared component, True if the children of the port were already registered)
+        stack = [(p, orig_p, False)]
+        while stack:
+            p, orig_p, isAfterChildren = stack.pop()
+            if isAfterChildren:
+                p.index = i
+                i += 1
+                continue
+
+            assert p is not None, (
+                "Current component is missing some port",
+                list(self.iterPorts()), list(c.iterPorts()))
+            assert orig_p is not None, (
+                "Current component has an extra port",
+                list(self.iterPorts()), list(c.iterPorts()))
+            assert p.name == orig_p.name, (p.name, orig_p.name)
+            if addIndex and not revIndex:
+                p.index = i
+                i += 1
+            id_ = idStore.registerInScope(ids, p)
+            # init also the alias
+            bodyIds[orig_p] = id_
+
+            if addIndex and revIndex:
+                stack.append((p, orig_p, True))
+            children = list(zip_longest(p._children or (), orig_p._children or ()))
+            for _c, _orig_c in reversed(children):
+                stack.append((_c, _orig_c, False))
+
         return i
 
     def toElkJson_registerPorts(self, idStore,
@@ -192,82 +318,247 @@ class LNode():
         and no specific positions are given for the ports. Additionally,
         the option ‘Port Side’ must be defined in this case.
         """
-        addIndex = self.portConstraints == PortConstraints.FIXED_ORDER
-        c = self._shared_component_with
+        self._toElkJson_registerPortsOfNode(idStore, path_prefix, idStore.getScope(path_prefix))
 
-        i = 0
-        if c is None:
-            for revIndex, p in self.iterPortsWithReverseFlag():
-                i = self._toElkJson_registerPorts(idStore, path_prefix, addIndex, p, i, revIndex)
-        else:
-            pp = path_prefix / self
-            for (revIndex, p), (origRevIndex, orig_p) in zip_longest(self.iterPortsWithReverseFlag(),
-                                                                     c.iterPortsWithReverseFlag(),
-                                                                     fillvalue=None):
-                assert revIndex == origRevIndex, (p, orig_p, "the ports needs to be on same side of component")
-                i = self._toElkJson_registerPorts_shared_comp(idStore, path_prefix,
-                                                              pp, c, addIndex, p, orig_p, i, revIndex)
-
-        children, path_prefix = self._getUniqRefChildren(path_prefix)
+    def _toElkJson_registerPortsOfNode(self, idStore, path_prefix: ComponentPath, ids: Dict[object, int]):
+        """
+        Register ports of this node and of all nested nodes (nodes in pre-order)
+        """
+        # stack of (node, path_prefix, ids)
+        stack = [(self, path_prefix, ids)]
+        while stack:
+            n, path_prefix, ids = stack.pop()
+            addIndex = n.portConstraints == PortConstraints.FIXED_ORDER
+            c = n._shared_component_with
+            children, chPathPrefix, bodyIds = n._getUniqRefChildrenScope(idStore, path_prefix, ids)
+
+            i = 0
+            if c is None:
+                for revIndex, p in n.iterPortsWithReverseFlag():
+                    i = n._toElkJson_registerPorts(idStore, ids, addIndex, p, i, revIndex)
+            else:
+                for (revIndex, p), (origRevIndex, orig_p) in zip_longest(n.iterPortsWithReverseFlag(),
+                                                                         c.iterPortsWithReverseFlag(),
+                                                                         fillvalue=None):
+                    assert revIndex == origRevIndex, (p, orig_p, "the ports needs to be on same side of component")
+                    i = n._toElkJson_registerPorts_shared_comp(idStore, ids,
+                                                               bodyIds, c, addIndex, p, orig_p, i, revIndex)
+
+            for ch in reversed(children):
+                stack.append((ch, chPathPrefix, bodyIds))
+
+    def _getEdgesOfChildren(self, children: List["LNode"]) -> SetList:
+        """
+        Collect edges which are connecting the children (and ports of this node)
+        and which are stored in the body of this node
+        """
+        formalParent = self._shared_component_with
+        if formalParent is None:
+            formalParent = self
+        edges = SetList()
         for ch in children:
-            ch.toElkJson_registerPorts(idStore, path_prefix)
+            for e in ch.iterEdges():
+                if e.parentNode is formalParent:
+                    edges.append(e)
+        return edges
+
+    def toElkJson_registerEdges(self, idStore,
+                                path_prefix: ComponentPath,
+                                maxIds: Dict[int, int]):
+        """
+        Register edges in the same order as :meth:`~.toElkJson` does
+        and store the "maxId" of each node into maxIds dictionary {node id: maxId}.
+        """
+        self._toElkJson_registerEdges(idStore, path_prefix, idStore.getScope(path_prefix), maxIds)
 
-    def toElkJson(self, idStore: "ElkIdStore", path_prefix: ComponentPath=ComponentPath(), isTop=True):
-        props = {
-            "org.eclipse.elk.portConstraints": self.portConstraints.name,
-            'org.eclipse.elk.layered.mergeEdges': 1,
-        }
+    def _toElkJson_registerEdges(self, idStore, path_prefix: ComponentPath, ids: Dict[object, int],
+                                 maxIds: Dict[int, int]):
+        """
+        Register edges of this node and of all nested nodes (nodes in post-order)
+        """
+        # stack of (node, path_prefix, ids, (children, bodyIds) if the children were already processed else None)
+        stack = [(self, path_prefix, ids, None)]
+        while stack:
+            n, path_prefix, ids, body = stack.pop()
+            if body is None:
+                children, chPathPrefix, bodyIds = n._getUniqRefChildrenScope(idStore, path_prefix, ids)
+                stack.append((n, path_prefix, ids, (children, bodyIds)))
+                for ch in reversed(children):
+                    stack.append((ch, chPathPrefix, bodyIds, None))
+                continue
+
+            children, bodyIds = body
+            if children:
+                for e in n._getEdgesOfChildren(children):
+                    idStore.registerInScope(bodyIds, e)
+
+            maxIds[ids[n]] = idStore.getMaxId()
+
+    def _toElkJson_hwMeta(self, maxId: int):
         hw_meta = {
             "name": self.name,
             "cls": self.cls,
         }
-        d = {
-            "hwMeta": hw_meta,
-            "properties": props
-        }
-        hideChildren = False
         if self.bodyText is not None:
             hw_meta["bodyText"] = self.bodyText
+        hw_meta["maxId"] = maxId
+        return hw_meta
+
+    def _toElkJson_properties(self):
+        return {
+            "org.eclipse.elk.portConstraints": self.portConstraints.name,
+            'org.eclipse.elk.layered.mergeEdges': 1,
+        }
 
+    def toElkJson(self, idStore: "ElkIdStore", path_prefix: ComponentPath=ComponentPath(), isTop=True):
+        ids = idStore.getScope(path_prefix)
         if isTop:
-            self.toElkJson_registerNodes(idStore, path_prefix)
-            self.toElkJson_registerPorts(idStore, path_prefix)
-        else:
-            d["id"] = str(idStore[path_prefix / self])
-            hideChildren = True
-            # if self.parent.parent is not None:
-            #    props["org.eclipse.elk.noLayout"] = True
+            self._toElkJson_registerNodes(idStore, path_prefix, ids)
+            self._toElkJson_registerPortsOfNode(idStore, path_prefix, ids)
+        return self._toElkJson(idStore, path_prefix, ids, isTop)
 
-        d["ports"] = [p.toElkJson(idStore, path_prefix)
-                      for p in self.iterPorts()]
+    def _toElkJson(self, idStore: "ElkIdStore", path_prefix: ComponentPath, ids: Dict[object, int], isTop: bool):
+        """
+        :param ids: the scope of idStore for path_prefix
+        :note: the nested nodes are converted iteratively (the depth of the hierarchy is not limited by the recursion limit)
+        """
+        # stack of the tuples from :meth:`~._toElkJson_begin` for nodes which body is being converted
+        stack = [self._toElkJson_begin(idStore, path_prefix, ids, isTop)]
+        while True:
+            n, d, children, edges, chPathPrefix, bodyIds, nodes, hideChildren = stack[-1]
+            ch = next(children, None)
+            if ch is not None:
+                # the JSON of the child is appended to nodes of this node once the child is finished
+                stack.append(ch._toElkJson_begin(idStore, chPathPrefix, bodyIds, False))
+                continue
+
+            stack.pop()
+            if edges is not None:
+                nodes.sort(key=lambda n: n["id"])
+                d["_children" if hideChildren else "children"] = nodes
+
+                for e in edges:
+                    idStore.registerInScope(bodyIds, e)
+
+                d["_edges" if hideChildren else "edges"] = [e._toElkJson(bodyIds) for e in edges]
+
+            d["hwMeta"] = n._toElkJson_hwMeta(idStore.getMaxId())
+            if not stack:
+                return d
+            stack[-1][6].append(d)
+
+    def _toElkJson_begin(self, idStore: "ElkIdStore", path_prefix: ComponentPath, ids: Dict[object, int], isTop: bool):
+        """
+        Convert the node without the body (the part of :meth:`~._toElkJson` before the children are converted)
 
-        children, path_prefix = self._getUniqRefChildren(path_prefix)
-        if children:
-            assert isinstance(children, list)
-            formalParent = self._shared_component_with
-            if formalParent is None:
-                formalParent = self
-            nodes = []
-            edges = SetList()
-            for ch in children:
-                for e in ch.iterEdges():
-                    if e.parentNode is formalParent:
-                        edges.append(e)
+        :return: tuple (self, JSON of this node, iterator of children, edges of children or None if there are no children,
+            path_prefix of children, ids of children, list for JSON of children, hideChildren flag)
+        """
+        d = {
+            # placeholder to keep the order of keys, resolved when the body is converted
+            "hwMeta": None,
+            "properties": self._toElkJson_properties(),
+        }
+        if not isTop:
+            d["id"] = str(ids[self])
 
-            for ch in children:
-                nodes.append(ch.toElkJson(idStore, isTop=False, path_prefix=path_prefix))
+        d["ports"] = [p._toElkJson(ids)
+                      for p in self.iterPorts()]
 
-            nodes.sort(key=lambda n: n["id"])
-            d["_children" if hideChildren else "children"] = nodes
+        children, path_prefix, bodyIds = self._getUniqRefChildrenScope(idStore, path_prefix, ids)
+        if children:
+            assert isinstance(children, OrderedSetList)
+            edges = self._getEdgesOfChildren(children)
+        else:
+            edges = None
 
-            for e in edges:
-                idStore.registerEdge(path_prefix / e)
+        return (self, d, iter(children), edges, path_prefix, bodyIds, [], not isTop)
 
-            d["_edges" if hideChildren else "edges"] = [e.toElkJson(idStore, path_prefix) for e in edges]
+    def writeElkJson(self, fp, idStore: "ElkIdStore", path_prefix: ComponentPath=ComponentPath()):
+        """
+        Write the ELK JSON of this graph to a file like object.
+        The output is the same as json.dump(self.toElkJson(idStore), fp)
+        but the whole dictionary is never constructed, the JSON text is written
+        as the graph is walked (see :meth:`~.iterElkJson`).
+        """
+        write = fp.write
+        for chunk in self.iterElkJson(idStore, path_prefix):
+            write(chunk)
 
-        hw_meta["maxId"] = idStore.getMaxId()
+    def iterElkJson(self, idStore: "ElkIdStore", path_prefix: ComponentPath=ComponentPath()) -> Generator[str, None, None]:
+        """
+        Generate ELK JSON text of this graph in chunks
 
-        return d
+        :note: The "maxId" of each node has to be known before its body is written
+            because of this the ids of the edges are registered in a separate walk.
+            (This requires memory for the single int per node, the JSON dicts are constructed only
+            for each port and edge separately.)
+        """
+        ids = idStore.getScope(path_prefix)
+        self._toElkJson_registerNodes(idStore, path_prefix, ids)
+        self._toElkJson_registerPortsOfNode(idStore, path_prefix, ids)
+        maxIds = {}
+        self._toElkJson_registerEdges(idStore, path_prefix, ids, maxIds)
+        return self._iterElkJsonChunks(self._iterElkJson(idStore, path_prefix, ids, True, maxIds))
+
+    @staticmethod
+    def _iterElkJsonChunks(gen: Generator[Union[str, Generator], None, None]) -> Generator[str, None, None]:
+        """
+        Flatten the chunks from :meth:`~._iterElkJson`, the generators of children are iterated using an explicit stack
+        (instead of "yield from" which would nest a generator for each level of the hierarchy)
+        """
+        stack = [gen]
+        while stack:
+            chunk = next(stack[-1], None)
+            if chunk is None:
+                stack.pop()
+            elif isinstance(chunk, str):
+                yield chunk
+            else:
+                stack.append(chunk)
+
+    def _iterElkJson(self, idStore: "ElkIdStore", path_prefix: ComponentPath, ids: Dict[object, int], isTop: bool,
+                     maxIds: Dict[int, int]) -> Generator[Union[str, Generator], None, None]:
+        """
+        :return: generator of str chunks and of generators of the chunks of children (:meth:`~._iterElkJsonChunks`)
+        """
+        dumps = json.dumps
+        id_ = ids[self]
+        yield '{"hwMeta": '
+        yield dumps(self._toElkJson_hwMeta(maxIds[id_]))
+        yield ', "properties": '
+        yield dumps(self._toElkJson_properties())
+        if not isTop:
+            yield ', "id": '
+            yield dumps(str(id_))
+
+        yield ', "ports": ['
+        for i, p in enumerate(self.iterPorts()):
+            if i:
+                yield ", "
+            yield dumps(p._toElkJson(ids))
+        yield "]"
+
+        children, path_prefix, bodyIds = self._getUniqRefChildrenScope(idStore, path_prefix, ids)
+        if children:
+            hideChildren = not isTop
+            edges = self._getEdgesOfChildren(children)
+            yield ', "_children": [' if hideChildren else ', "children": ['
+            children = sorted(children, key=lambda ch: str(bodyIds[ch]))
+            for i, ch in enumerate(children):
+                if i:
+                    yield ", "
+                yield ch._iterElkJson(idStore, path_prefix, bodyIds, False, maxIds)
+            yield "]"
+
+            yield ', "_edges": [' if hideChildren else ', "edges": ['
+            for i, e in enumerate(edges):
+                if i:
+                    yield ", "
+                yield dumps(e._toElkJson(bodyIds))
+            yield "]"
+
+        yield "}"
 
     def getNode(self):
         return self
@@ -278,6 +569,7 @@ class LNode():
 
 
 class LayoutExternalPort(LNode):
+    __slots__ = ["direction", "type"]
 
     def __init__(self, parent: "LNode", name: str=None,
                  direction=None, node2lnode=None, originObj=None):
@@ -292,8 +584,8 @@ class LayoutExternalPort(LNode):
         # else:
         #     raise ValueError(direction)
 
-    def toElkJson(self, idStore, isTop=True, path_prefix=None):
-        d = super(LayoutExternalPort, self).toElkJson(idStore, isTop=isTop, path_prefix=path_prefix)
-        d["hwMeta"]['isExternalPort'] = True
-        # d['properties']["org.eclipse.elk.layered.layering.layerConstraint"] = self.layeringLayerConstraint.name
-        return d
+    def _toElkJson_hwMeta(self, maxId: int):
+        hw_meta = super(LayoutExternalPort, self)._toElkJson_hwMeta(maxId)
+        hw_meta['isExternalPort'] = True
+        # props["org.eclipse.elk.layered.layering.layerConstraint"] = self.layeringLayerConstraint.name
+        return hw_meta
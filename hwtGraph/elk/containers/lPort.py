@@ -1,8 +1,9 @@
 from itertools import chain
-from typing import List
+from typing import List, Dict
 
 from hwt.synthesizer.componentPath import ComponentPath
 from hwtGraph.elk.containers.constants import PortSide, PortType
+from hwtGraph.elk.containers.orderedSetList import OrderedSetList
 
 
 class LPort():
@@ -24,6 +25,9 @@ class LPort():
         and no specific positions are given for the ports. Additionally,
         the option ‘Port Side’ must be defined in this case.
     """
+    __slots__ = ["originObj", "parent", "parentNode", "name", "direction",
+                 "_outgoingEdges", "_incomingEdges", "_children",
+                 "side", "connectedAsParent", "index"]
 
     def __init__(self, parent: "LNode", direction: PortType,
                  side: PortSide, name: str=None, originObj=None):
@@ -39,13 +43,51 @@ class LPort():
         self.name = name
         self.direction = direction
 
-        self.outgoingEdges = []
-        self.incomingEdges = []
-        self.children = []
+        # lists of edges and children are allocated on first access
+        self._outgoingEdges = None
+        self._incomingEdges = None
+        self._children = None
         self.side = side
         self.connectedAsParent = False
         self.index = None
 
+    @property
+    def outgoingEdges(self) -> OrderedSetList:
+        edges = self._outgoingEdges
+        if edges is None:
+            edges = self._outgoingEdges = OrderedSetList()
+        return edges
+
+    @outgoingEdges.setter
+    def outgoingEdges(self, edges: OrderedSetList):
+        if not isinstance(edges, OrderedSetList):
+            edges = OrderedSetList(edges)
+        self._outgoingEdges = edges
+
+    @property
+    def incomingEdges(self) -> OrderedSetList:
+        edges = self._incomingEdges
+        if edges is None:
+            edges = self._incomingEdges = OrderedSetList()
+        return edges
+
+    @incomingEdges.setter
+    def incomingEdges(self, edges: OrderedSetList):
+        if not isinstance(edges, OrderedSetList):
+            edges = OrderedSetList(edges)
+        self._incomingEdges = edges
+
+    @property
+    def children(self) -> List["LPort"]:
+        children = self._children
+        if children is None:
+            children = self._children = []
+        return children
+
+    @children.setter
+    def children(self, children: List["LPort"]):
+        self._children = children
+
     def getLevel(self):
         """
         Get nest-level of this port
@@ -60,9 +102,7 @@ class LPort():
         return lvl
 
     def iterEdges(self, filterSelfLoops=False):
-        assert isinstance(self.incomingEdges, list)
-        assert isinstance(self.outgoingEdges, list)
-        it = chain(self.incomingEdges, self.outgoingEdges)
+        it = chain(self._incomingEdges or (), self._outgoingEdges or ())
         if filterSelfLoops:
             for e in it:
                 if not e.isSelfLoop:
@@ -88,32 +128,47 @@ class LPort():
         return list(reversed(names))
 
     def toElkJson(self, idStore, path_prefix: ComponentPath):
-        if self.connectedAsParent:
-            assert isinstance(self.parent, LPort), self
-
-        props = {
-            "side": self.side.name,
-        }
-
-        if self.parentNode.portConstraints.isOrderFixed():
-            assert isinstance(self.index, int), self.index
-            props["index"] = self.index
-
-        children = []
-        for c in self.children:
-            children.append(c.toElkJson(idStore, path_prefix))
-
-        return {
-            "id": str(idStore[path_prefix / self]),
-            "hwMeta": {
-                "level": self.getLevel(),
-                "name": self.name,
-                "connectedAsParent": bool(self.connectedAsParent),
-            },
-            "children": children,
-            "direction": self.direction.name,
-            "properties": props,
-        }
+        return self._toElkJson(idStore.getScope(path_prefix))
+
+    def _toElkJson(self, ids: Dict[object, int]):
+        """
+        :param ids: the scope from ElkIdStore {object: id} for objects on the path of this port
+        :note: the children are converted iteratively (the depth is not limited by the recursion limit)
+        """
+        orderFixed = self.parentNode.portConstraints.isOrderFixed()
+        res = []
+        # stack of (port, list for JSON of the port, level of the port)
+        stack = [(self, res, self.getLevel())]
+        while stack:
+            p, siblings, level = stack.pop()
+            if p.connectedAsParent:
+                assert isinstance(p.parent, LPort), p
+
+            props = {
+                "side": p.side.name,
+            }
+
+            if orderFixed:
+                assert isinstance(p.index, int), p.index
+                props["index"] = p.index
+
+            children = []
+            siblings.append({
+                "id": str(ids[p]),
+                "hwMeta": {
+                    "level": level,
+                    "name": p.name,
+                    "connectedAsParent": bool(p.connectedAsParent),
+                },
+                "children": children,
+                "direction": p.direction.name,
+                "properties": props,
+            })
+            if p._children:
+                for c in reversed(p._children):
+                    stack.append((c, children, level + 1))
+
+        return res[0]
 
     def __repr__(self):
         return "<{0} {1} {2:#018x} {3}>".format(
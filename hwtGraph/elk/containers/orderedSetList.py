@@ -0,0 +1,102 @@
+from itertools import islice
+from typing import Iterable, TypeVar, Union, List
+
+T = TypeVar("T")
+
+
+class OrderedSetList(dict):
+    """
+    List of unique items with O(1) append/remove/contains
+    (the items are keys of the dictionary, the dictionary keeps the insertion order).
+    It is used for the lists of edges on ports and the lists of ports on edges
+    which are frequently modified by graph transformations.
+
+    :note: Indexing is O(1) only for the first and the last item, otherwise O(n).
+    :note: The dict methods are available but the item access is list-like
+        (obj[0] is the first item, not the value of key 0).
+    """
+    __slots__ = []
+
+    def __init__(self, items: Iterable[T]=()):
+        dict.__init__(self, dict.fromkeys(items))
+
+    def append(self, item: T) -> bool:
+        """
+        :return: True if the item was added, False if it already was in this list
+        """
+        if item in self:
+            return False
+        dict.__setitem__(self, item, None)
+        return True
+
+    def _appendNew(self, item: T):
+        """
+        Append the item which is known not to be in this list yet (without the check)
+        """
+        dict.__setitem__(self, item, None)
+
+    def extend(self, items: Iterable[T]):
+        for item in items:
+            self.append(item)
+
+    def remove(self, item: T):
+        try:
+            del self[item]
+        except KeyError:
+            raise ValueError(item, "not in list") from None
+
+    def discard(self, item: T):
+        dict.pop(self, item, None)
+
+    def pop(self, index: int=-1) -> T:
+        if index == -1:
+            return self.popitem()[0]
+        item = self[index]
+        del self[item]
+        return item
+
+    def index(self, item: T) -> int:
+        if item in self:
+            for i, _item in enumerate(self):
+                if _item is item or _item == item:
+                    return i
+        raise ValueError(item, "not in list")
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if isinstance(index, slice):
+            return list(self)[index]
+
+        if index == 0:
+            try:
+                return next(iter(self))
+            except StopIteration:
+                raise IndexError(index) from None
+        elif index == -1:
+            try:
+                return next(reversed(self))
+            except StopIteration:
+                raise IndexError(index) from None
+        else:
+            _index = index
+            if _index < 0:
+                _index += len(self)
+            if _index < 0 or _index >= len(self):
+                raise IndexError(index)
+            return next(islice(self, _index, None))
+
+    def __setitem__(self, key, value):
+        raise TypeError("OrderedSetList does not support item assignment, use append()", key, value)
+
+    def copy(self) -> "OrderedSetList":
+        return self.__class__(self)
+
+    def __eq__(self, other):
+        return len(self) == len(other) and all(a is b or a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__:s}([{', '.join(repr(i) for i in self):s}])"
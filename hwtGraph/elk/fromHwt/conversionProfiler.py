@@ -0,0 +1,174 @@
+from contextlib import contextmanager, nullcontext
+import json
+from time import perf_counter
+import tracemalloc
+from typing import List, Optional, Tuple, Dict
+
+from hwt.hwModule import HwModule
+from hwtGraph.elk.containers.lNode import LNode
+
+
+def LNode_countObjects(root: LNode) -> Tuple[int, int, int]:
+    """
+    Count nodes, ports (including children ports) and edges in the body of the node (including the node itself)
+
+    :note: the body of shared component is counted only for the component itself
+    """
+    nodes = 0
+    ports = 0
+    edges = set()
+    nodeStack = [root]
+    while nodeStack:
+        n = nodeStack.pop()
+        nodes += 1
+        portStack = list(n.iterPorts())
+        while portStack:
+            p = portStack.pop()
+            ports += 1
+            edges.update(p.iterEdges())
+            portStack.extend(p._children or ())
+        nodeStack.extend(n._children or ())
+    return nodes, ports, len(edges)
+
+
+def notMeasured(phase: str, root: Optional[LNode]):
+    # the record is not stored anywhere
+    return nullcontext({})
+
+
+class ConversionProfiler():
+    """
+    Collects the time, memory allocations and number of objects for each phase of the conversion
+    of each HwModule in :func:`hwtGraph.elk.fromHwt.convertor.HwModuleToLNode`
+    (including each item of optimizations).
+
+    .. code-block:: python
+
+        with ConversionProfiler() as profiler:
+            g = HwModuleToLNode(m, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS, profiler=profiler)
+            with profiler.measure("toElkJson", g):
+                g.toElkJson(ElkIdStore())
+        profiler.writeJson(fp)
+
+    :note: The allocations are measured only if tracemalloc is tracing
+        (it is started in __enter__ if traceAllocations is True), the allocated size is the difference of size
+        of traced memory, the peak is measured only for phases (not for whole HwModule) and only on Python >= 3.9.
+    :note: The time and allocations of the whole HwModule include its children.
+
+    :ivar ~.traceAllocations: if True the tracemalloc is started in __enter__ if it is not running yet
+    :ivar ~.countObjects: if True the number of nodes, ports and edges is counted before and after each phase
+        (this is a walk of the whole body of the HwModule for each phase)
+    :ivar ~.records: list of records for each phase in the order of execution
+    :ivar ~.hwModules: list of records for each HwModule (in post-order)
+    :ivar ~._path: names of HwModules which are currently converted
+    """
+
+    def __init__(self, traceAllocations=True, countObjects=True):
+        self.traceAllocations = traceAllocations
+        self.countObjects = countObjects
+        self.records: List[dict] = []
+        self.hwModules: List[dict] = []
+        self._path: List[str] = []
+        self._startedTracing = False
+
+    def __enter__(self):
+        if self.traceAllocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._startedTracing = True
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._startedTracing:
+            tracemalloc.stop()
+            self._startedTracing = False
+
+    @contextmanager
+    def hwModule(self, m: HwModule):
+        """
+        Measure the conversion of the whole HwModule, the phases measured inside are associated with this HwModule
+        """
+        self._path.append(m._name)
+        path = "/".join(self._path)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            mem0, _ = tracemalloc.get_traced_memory()
+        t0 = perf_counter()
+        try:
+            yield
+        finally:
+            t = perf_counter() - t0
+            rec = {
+                "module": path,
+                "time": t,
+            }
+            if tracing and tracemalloc.is_tracing():
+                mem1, _ = tracemalloc.get_traced_memory()
+                rec["allocated"] = mem1 - mem0
+            self.hwModules.append(rec)
+            self._path.pop()
+
+    @contextmanager
+    def measure(self, phase: str, root: Optional[LNode]):
+        """
+        Measure a single phase of the conversion of the current HwModule
+
+        :param root: the LNode of the current HwModule
+            (or None if the phase does not work with LNodes, e.g. a pass on the netlist, the objects are not counted)
+        :return: the context manager which yields the record of the phase
+            (the measured code may add its own counters to it)
+        """
+        rec = {
+            "module": "/".join(self._path),
+            "phase": phase,
+        }
+        countObjects = self.countObjects and root is not None
+        if countObjects:
+            rec["before"] = LNode_countObjects(root)
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            mem0, _ = tracemalloc.get_traced_memory()
+            resetPeak = getattr(tracemalloc, "reset_peak", None)
+            if resetPeak is not None:
+                resetPeak()
+        t0 = perf_counter()
+        try:
+            yield rec
+        finally:
+            rec["time"] = perf_counter() - t0
+            if tracing and tracemalloc.is_tracing():
+                mem1, peak = tracemalloc.get_traced_memory()
+                rec["allocated"] = mem1 - mem0
+                if resetPeak is not None:
+                    rec["peak"] = peak - mem0
+            if countObjects:
+                rec["after"] = LNode_countObjects(root)
+            self.records.append(rec)
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        :return: {phase name: {"calls": int, "time": float, "allocated": int}} for all HwModules
+        """
+        res = {}
+        for rec in self.records:
+            s = res.get(rec["phase"], None)
+            if s is None:
+                s = res[rec["phase"]] = {"calls": 0, "time": 0.0, "allocated": 0}
+            s["calls"] += 1
+            s["time"] += rec["time"]
+            s["allocated"] += rec.get("allocated", 0)
+        return res
+
+    def toJson(self) -> dict:
+        """
+        :return: the report as JSON serializable dictionary
+            (the object counts are [nodes, ports, edges])
+        """
+        return {
+            "summary": self.summary(),
+            "hwModules": self.hwModules,
+            "phases": self.records,
+        }
+
+    def writeJson(self, fp, indent: Optional[int]=None):
+        json.dump(self.toJson(), fp, indent=indent)
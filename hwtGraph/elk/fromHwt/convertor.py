@@ -1,4 +1,5 @@
-from typing import Optional
+from enum import Enum
+from typing import Generator, Optional, Union
 
 from hwt.constants import INTF_DIRECTION
 from hwt.hdl.portItem import HdlPortItem
@@ -7,11 +8,28 @@ from hwt.hwIOs.hwIOArray import HwIOArray
 from hwt.hwModule import HwModule
 from hwt.serializer.utils import HdlStatement_sort_key, RtlSignal_sort_key
 from hwtGraph.elk.containers.constants import PortType, PortSide
+from hwtGraph.elk.containers.lGraphTables import LGraphTables
+from hwtGraph.elk.containers.lGraphViews import LNodeView
 from hwtGraph.elk.containers.lNode import LNode
-from hwtGraph.elk.fromHwt.netCtx import NetCtxs
+from hwtGraph.elk.fromHwt.conversionProfiler import ConversionProfiler, notMeasured
+from hwtGraph.elk.fromHwt.netCtx import NetCtxs, ValidationLevel
 from hwtGraph.elk.fromHwt.statementRenderer import StatementRenderer
 from hwtGraph.elk.fromHwt.statementRendererUtils import addStmAsLNode, VirtualLNode
-from hwtGraph.elk.fromHwt.utils import addPortToLNode, addPort, originObjOfPort
+from hwtGraph.elk.fromHwt.utils import addPortToLNode, addPort, originObjOfPort, \
+    runIteratively
+
+
+class LGraphBackend(Enum):
+    """
+    The storage of the graph returned from :func:`HwModuleToLNode`
+
+    :cvar ~.OBJECTS: LNode/LPort/LEdge objects (default)
+    :cvar ~.TABLES: the columns of :class:`hwtGraph.elk.containers.lGraphTables.LGraphTables`,
+        the result is a read only :class:`hwtGraph.elk.containers.lGraphViews.LNodeView` of the root node
+        (the optimizations are performed on LNode objects, the objects are released once the graph is stored in the tables)
+    """
+    OBJECTS = 0
+    TABLES = 1
 
 
 def HwIO_isEmptyArray(hwio: HwIO):
@@ -29,11 +47,64 @@ def HwIO_isEmptyArray(hwio: HwIO):
 
 def HwModuleToLNode(m: HwModule, node: Optional[LNode]=None,
                 toL: Optional[dict]=None,
-                optimizations=[]) -> LNode:
+                optimizations=[],
+                childProvider=None,
+                profiler: Optional[ConversionProfiler]=None,
+                validation: ValidationLevel=ValidationLevel.FULL,
+                backend: LGraphBackend=LGraphBackend.OBJECTS) -> Union[LNode, LNodeView]:
     """
     Build LNode instance (a graph) from :class:`hwt.hwModule.HwModule` instance (a RTL graph)
 
     :attention: unit has to be synthesized
+    :param childProvider: optional object which may provide already converted LNodes for children HwModules
+        (:class:`hwtGraph.elk.fromHwt.incrementalConvertor.IncrementalHwModuleToLNode`,
+        :class:`hwtGraph.elk.fromHwt.parallelConvertor.ParallelHwModuleToLNode`),
+        childProvider.tryReuse(parentLNode, subHwModule, toL) returns the LNode already added to parent or None,
+        childProvider.record(hwModule, lnode, toL) is called after the conversion of each HwModule
+    :param profiler: optional :class:`hwtGraph.elk.fromHwt.conversionProfiler.ConversionProfiler`
+        which measures each phase of the conversion of each HwModule
+    :param validation: the level of checks of the connections of ports
+        (:class:`hwtGraph.elk.fromHwt.netCtx.ValidationLevel`), ONCE/OFF can be used for trusted designs
+    :param backend: the storage of the result (:class:`~.LGraphBackend`),
+        the node and toL can not be specified for LGraphBackend.TABLES (the objects are not kept)
+    :note: the hierarchy of HwModules is walked iteratively, the depth of the hierarchy is not limited
+        by the recursion limit
+    """
+    if backend == LGraphBackend.TABLES and (node is not None or toL is not None):
+        raise ValueError("The node and toL can not be used with LGraphBackend.TABLES, the LNode objects are not kept")
+
+    root = runIteratively(_HwModuleToLNodeProfiled(m, node, toL, optimizations, childProvider, profiler, validation))
+    if backend == LGraphBackend.OBJECTS:
+        return root
+
+    assert backend == LGraphBackend.TABLES, backend
+    measure = notMeasured if profiler is None else profiler.measure
+    with measure("toTables", root):
+        tables = LGraphTables.fromLNode(root, keepOriginObj=True)
+    return LNodeView(tables)
+
+
+def _HwModuleToLNodeProfiled(m: HwModule, node: Optional[LNode],
+                             toL: Optional[dict],
+                             optimizations,
+                             childProvider,
+                             profiler: Optional[ConversionProfiler],
+                             validation: ValidationLevel) -> Generator[Generator, object, LNode]:
+    if profiler is None:
+        return (yield from _HwModuleToLNode(m, node, toL, optimizations, childProvider, None, validation))
+
+    with profiler.hwModule(m):
+        return (yield from _HwModuleToLNode(m, node, toL, optimizations, childProvider, profiler, validation))
+
+
+def _HwModuleToLNode(m: HwModule, node: Optional[LNode],
+                     toL: Optional[dict],
+                     optimizations,
+                     childProvider,
+                     profiler: Optional[ConversionProfiler],
+                     validation: ValidationLevel) -> Generator[Generator, object, LNode]:
+    """
+    :see: :func:`~.HwModuleToLNode`, the conversion of children is yielded (and executed by :func:`runIteratively`)
     """
     if toL is None:
         toL = {}
@@ -56,65 +127,73 @@ def HwModuleToLNode(m: HwModule, node: Optional[LNode]=None,
     else:
         root = node
 
+    measure = notMeasured if profiler is None else profiler.measure
     stmPorts = {}
 
     # {RtlSignal: NetCtx}
-    netCtx = NetCtxs(root)
+    netCtx = NetCtxs(root, validation)
 
     # create subunits
     for su in m._subHwModules:
-        n = root.addNode(name=su._name, cls="HwModule", originObj=su)
-        HwModuleToLNode(su, n, toL, optimizations)
-
-    # create subunits from statements
-    statements = sorted(m._rtlCtx.statements, key=HdlStatement_sort_key)
-    for stm in statements:
-        addStmAsLNode(root, stm, stmPorts, netCtx)
-
-    # create ports for this unit
-    for hwIO in m._hwIOs:
-        if HwIO_isEmptyArray(hwIO):
+        if childProvider is not None and childProvider.tryReuse(root, su, toL) is not None:
             continue
-        addPort(root, hwIO)
-
-    # k0 = HdlStatement_sort_key(statements[0])[1]
-    # render content of statements
-    for stm in statements:
-        # k = HdlStatement_sort_key(stm)
-        # k = (k[0], k[1] - k0)
-        # print(k)
-        # print([HdlStatement_sort_key(_k)[1] - k0 for _k in stm._iter_stms()])
-        # print(stm)
-        n = toL.get(stm, None)
-        if n is not None:
-            if isinstance(n, VirtualLNode):
-                # statement is not in wrap and does not need any port context
-                p = None
-            else:
-                # statement is in wrap and needs a port context
-                # to resolve port connections to wrap
-                p = stmPorts[n]
-
-            r = StatementRenderer(n, toL, p, netCtx)
-            r.renderContent()
-
-    # connect nets inside this unit
-    # print(list(x._name for x in sorted(m._rtlCtx.signals, key=RtlSignal_sort_key)))
-    for s in sorted(m._rtlCtx.signals, key=RtlSignal_sort_key):
-        if not s._isUnnamedExpr:
-            net, _ = netCtx.getDefault(s)
-            for e in s._rtlEndpoints:
-                if isinstance(e, HdlPortItem):
-                    net.addEndpoint(toL[e])
+        n = root.addNode(name=su._name, cls="HwModule", originObj=su)
+        yield _HwModuleToLNodeProfiled(su, n, toL, optimizations, childProvider, profiler, validation)
 
-            for d in s._rtlDrivers:
-                if isinstance(d, HdlPortItem):
-                    net.addDriver(toL[d])
+    with measure("addStatements", root):
+        # create subunits from statements
+        statements = sorted(m._rtlCtx.statements, key=HdlStatement_sort_key)
+        for stm in statements:
+            addStmAsLNode(root, stm, stmPorts, netCtx)
 
-    netCtx.applyConnections(root)
+        # create ports for this unit
+        for hwIO in m._hwIOs:
+            if HwIO_isEmptyArray(hwIO):
+                continue
+            addPort(root, hwIO)
+
+    with measure("renderContent", root):
+        # k0 = HdlStatement_sort_key(statements[0])[1]
+        # render content of statements
+        for stm in statements:
+            # k = HdlStatement_sort_key(stm)
+            # k = (k[0], k[1] - k0)
+            # print(k)
+            # print([HdlStatement_sort_key(_k)[1] - k0 for _k in stm._iter_stms()])
+            # print(stm)
+            n = toL.get(stm, None)
+            if n is not None:
+                if isinstance(n, VirtualLNode):
+                    # statement is not in wrap and does not need any port context
+                    p = None
+                else:
+                    # statement is in wrap and needs a port context
+                    # to resolve port connections to wrap
+                    p = stmPorts[n]
+
+                r = StatementRenderer(n, toL, p, netCtx)
+                r.renderContent()
+
+    with measure("connectNets", root):
+        # connect nets inside this unit
+        # print(list(x._name for x in sorted(m._rtlCtx.signals, key=RtlSignal_sort_key)))
+        for s in sorted(m._rtlCtx.signals, key=RtlSignal_sort_key):
+            if not s._isUnnamedExpr:
+                net, _ = netCtx.getDefault(s)
+                for e in s._rtlEndpoints:
+                    if isinstance(e, HdlPortItem):
+                        net.addEndpoint(toL[e])
+
+                for d in s._rtlDrivers:
+                    if isinstance(d, HdlPortItem):
+                        net.addDriver(toL[d])
+
+    with measure("applyConnections", root):
+        netCtx.applyConnections(root)
 
     for opt in optimizations:
-        opt(root)
+        with measure(getattr(opt, "__name__", repr(opt)), root):
+            opt(root)
 
     isRootOfWholeGraph = root.parent is None
     if not isRootOfWholeGraph:
@@ -135,4 +214,7 @@ def HwModuleToLNode(m: HwModule, node: Optional[LNode]=None,
 
             root.addEdge(src, dst, name=repr(hwIO), originObj=hwIO)
 
+    if childProvider is not None:
+        childProvider.record(m, root, toL)
+
     return root
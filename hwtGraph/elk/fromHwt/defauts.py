@@ -1,4 +1,7 @@
+from typing import Optional
+
 from hwt.synthesizer.dummyPlatform import DummyPlatform
+from hwtGraph.elk.fromHwt.conversionProfiler import ConversionProfiler
 from hwtGraph.elk.fromHwt.extractSplits import extractSplits
 from hwtGraph.elk.fromHwt.flattenTrees import flattenTrees
 from hwtGraph.elk.fromHwt.mergeSplitsOnInterfaces import mergeSplitsOnInterfaces
@@ -9,17 +12,33 @@ from hwtGraph.elk.fromHwt.resolveSharedConnections import resolveSharedConnectio
 from hwtGraph.elk.fromHwt.sortStatementPorts import sortStatementPorts
 
 
-DEFAULT_PLATFORM = DummyPlatform()
-DEFAULT_PLATFORM.beforeHdlArchGeneration.extend([
-    RtlNetlistPassUnhideResultsOfIndexingAndConcatOnPublicSignals(),
-    RtlNetlistPassPropagatePresets(),
-])
+def createDefaultPlatform(profiler: Optional[ConversionProfiler]=None) -> DummyPlatform:
+    """
+    Create the platform with the netlist passes required for the conversion (same as DEFAULT_PLATFORM)
+
+    :param profiler: optional ConversionProfiler where the netlist passes record their time and counters
+        (the passes run during the synthesis, before :func:`hwtGraph.elk.fromHwt.convertor.HwModuleToLNode`)
+    """
+    platform = DummyPlatform()
+    platform.beforeHdlArchGeneration.extend([
+        RtlNetlistPassUnhideResultsOfIndexingAndConcatOnPublicSignals(profiler),
+        RtlNetlistPassPropagatePresets(),
+    ])
+    return platform
+
+
+DEFAULT_PLATFORM = createDefaultPlatform()
+
+
+def flattenConcatTrees(root):
+    flattenTrees(root, lambda node: node.cls == "Operator" and node.name == "CONCAT", True)
+
 
 DEFAULT_LAYOUT_OPTIMIZATIONS = [
     # optimizations
     reduceUselessAssignments,
     extractSplits,
-    lambda root: flattenTrees(root, lambda node: node.cls == "Operator" and node.name == "CONCAT", True),
+    flattenConcatTrees,
     mergeSplitsOnInterfaces,
     resolveSharedConnections,
     # prettyfications
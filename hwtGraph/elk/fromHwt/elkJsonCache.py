@@ -0,0 +1,156 @@
+import json
+import os
+from typing import Optional, Sequence, Callable
+import zlib
+
+from hwt.hwModule import HwModule
+from hwtGraph.elk.containers.elkJsonEncoder import ElkJsonEncoder, \
+    getElkJsonEncoder, LNode_toElkJsonBytes
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_LAYOUT_OPTIMIZATIONS
+from hwtGraph.elk.fromHwt.fingerprint import HwModule_fingerprint, \
+    optimizations_fingerprint, converter_fingerprint
+
+
+class ElkJsonCache():
+    """
+    Content addressed on-disk cache of ELK JSON generated by
+    :func:`hwtGraph.elk.fromHwt.convertor.HwModuleToLNode` and :meth:`hwtGraph.elk.containers.lNode.LNode.toElkJson`
+
+    The key is a hash of the synthesized HwModule (:func:`hwtGraph.elk.fromHwt.fingerprint.HwModule_fingerprint`),
+    of the optimizations, of the source code of the converter
+    (:func:`hwtGraph.elk.fromHwt.fingerprint.converter_fingerprint`) and of the format version.
+    Each record is a zlib compressed JSON in a separate file.
+    The least recently used records are removed if the size of the cache exceeds maxSize.
+
+    :ivar ~.directory: directory where the records are stored
+    :ivar ~.maxSize: maximum size of all records in bytes
+    :ivar ~.optimizations: list of functions which are applied on LNode of each HwModule
+    :ivar ~.encoder: the JSON encoder used for new records
+    :ivar ~.hits: number of HwModules loaded from the cache
+    :ivar ~.misses: number of HwModules which had to be converted
+    """
+    FORMAT_VERSION = 1
+    RECORD_SUFFIX = ".json.z"
+
+    def __init__(self, directory: str, maxSize: int=256 * 1024 * 1024,
+                 optimizations: Sequence[Callable]=DEFAULT_LAYOUT_OPTIMIZATIONS,
+                 compressLevel: int=6,
+                 encoder: Optional[ElkJsonEncoder]=None):
+        self.directory = directory
+        self.maxSize = maxSize
+        self.optimizations = optimizations
+        self.compressLevel = compressLevel
+        if encoder is None:
+            encoder = getElkJsonEncoder()
+        self.encoder = encoder
+        self.hits = 0
+        self.misses = 0
+        self._optimizationsFingerprint = optimizations_fingerprint(optimizations)
+        self._converterFingerprint = converter_fingerprint()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, m: HwModule) -> str:
+        """
+        :return: key of the record for the synthesized HwModule
+        """
+        fp = HwModule_fingerprint(m)
+        return (f"v{self.FORMAT_VERSION:d}-{self._converterFingerprint.hex():s}"
+                f"-{self._optimizationsFingerprint.hex():s}-{fp.hex():s}")
+
+    def _recordPath(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.RECORD_SUFFIX)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        :return: the JSON of the record or None if the record is not in cache
+        """
+        fileName = self._recordPath(key)
+        try:
+            # :note: the record is decompressed as a whole, mmap would only add syscalls
+            with open(fileName, "rb") as f:
+                data = f.read()
+            res = zlib.decompress(data)
+        except (FileNotFoundError, zlib.error):
+            # zlib.error: damaged or empty record
+            return None
+
+        try:
+            # update the time for LRU
+            os.utime(fileName)
+        except FileNotFoundError:
+            pass
+        return res
+
+    def put(self, key: str, data: bytes):
+        """
+        Store the JSON of the record and remove the least recently used records if the cache is too large
+        """
+        fileName = self._recordPath(key)
+        tmpFileName = f"{fileName:s}.{os.getpid():d}.tmp"
+        with open(tmpFileName, "wb") as f:
+            f.write(zlib.compress(data, self.compressLevel))
+        # atomic in order to avoid reading of incomplete records from other processes
+        os.replace(tmpFileName, fileName)
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used records until the size of the cache is lower or equal to maxSize
+        """
+        records = []
+        totalSize = 0
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if not e.name.endswith(self.RECORD_SUFFIX):
+                    continue
+                try:
+                    st = e.stat()
+                except FileNotFoundError:
+                    continue
+                records.append((st.st_mtime, e.path, st.st_size))
+                totalSize += st.st_size
+
+        if totalSize <= self.maxSize:
+            return
+
+        records.sort()
+        for _, path, size in records:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            totalSize -= size
+            if totalSize <= self.maxSize:
+                break
+
+    def clear(self):
+        """
+        Remove all records
+        """
+        with os.scandir(self.directory) as it:
+            for e in it:
+                if e.name.endswith(self.RECORD_SUFFIX):
+                    os.remove(e.path)
+
+    def convertToJsonBytes(self, m: HwModule) -> bytes:
+        """
+        Get ELK JSON of synthesized HwModule as UTF-8 encoded bytes, convert it only if it is not in cache
+        """
+        key = self.key(m)
+        data = self.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        self.misses += 1
+        g = HwModuleToLNode(m, optimizations=self.optimizations)
+        data = LNode_toElkJsonBytes(g, encoder=self.encoder)
+        self.put(key, data)
+        return data
+
+    def convert(self, m: HwModule) -> dict:
+        """
+        Get ELK JSON of synthesized HwModule, convert it only if it is not in cache
+        """
+        return json.loads(self.convertToJsonBytes(m))
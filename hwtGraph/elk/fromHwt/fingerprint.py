@@ -0,0 +1,146 @@
+from functools import lru_cache
+from hashlib import sha1
+import os
+from types import CodeType
+from typing import Dict, Optional, Sequence, Callable
+
+from hwt.hdl.portItem import HdlPortItem
+from hwt.hwIO import HwIO
+from hwt.hwModule import HwModule
+from hwt.serializer.utils import HdlStatement_sort_key, RtlSignal_sort_key
+import hwtGraph.elk
+from hwtGraph.elk.fromHwt.utils import toStr
+
+
+def _HwIO_fingerprint(h, hwIO: HwIO):
+    # (HwIO or None for the end of the HwIO)
+    stack = [hwIO]
+    while stack:
+        hwIO = stack.pop()
+        if hwIO is None:
+            h.update(b">")
+            continue
+        h.update(f"<{hwIO._name:s} {hwIO._direction} {hwIO._masterDir}".encode())
+        dtype = getattr(hwIO, "_dtype", None)
+        if dtype is not None:
+            h.update(repr(dtype).encode())
+        stack.append(None)
+        stack.extend(reversed(hwIO._hwIOs))
+
+
+def _HwModule_fingerprint_begin(m: HwModule):
+    """
+    :return: the hash with the part of the fingerprint which is before the fingerprints of the children
+        and the iterator of the children
+    """
+    h = sha1()
+    h.update(f"{m._name:s} {m.__class__.__module__:s}.{m.__class__.__qualname__:s}".encode())
+    for hwIO in m._hwIOs:
+        _HwIO_fingerprint(h, hwIO)
+
+    if m._shared_component_with:
+        shared_comp, _, _ = m._shared_component_with
+        h.update(b"shared")
+        children = (shared_comp,)
+    else:
+        children = m._subHwModules
+    return (m, h, iter(children))
+
+
+def _HwModule_fingerprint_end(m: HwModule, h) -> bytes:
+    if not m._shared_component_with:
+        for s in sorted(m._rtlCtx.signals, key=RtlSignal_sort_key):
+            if s._isUnnamedExpr:
+                continue
+            h.update(f"{s._name:s} {s._dtype} {s.def_val}".encode())
+            for d in s._rtlDrivers:
+                if isinstance(d, HdlPortItem):
+                    h.update(f"<{d.module._name:s}.{d.name:s}".encode())
+            for e in s._rtlEndpoints:
+                if isinstance(e, HdlPortItem):
+                    h.update(f">{e.module._name:s}.{e.name:s}".encode())
+
+        for stm in sorted(m._rtlCtx.statements, key=HdlStatement_sort_key):
+            h.update(toStr(stm).encode())
+
+    return h.digest()
+
+
+def HwModule_fingerprint(m: HwModule, fingerprints: Optional[Dict[HwModule, bytes]]=None) -> bytes:
+    """
+    Get hash of the synthesized HwModule which changes if any part of it or its children which affects the LNode changes
+    (name, class, IO, named signals, statements, children)
+
+    :param fingerprints: optional cache of already resolved fingerprints {HwModule: fingerprint}
+    """
+    if fingerprints is None:
+        fingerprints = {}
+    else:
+        fp = fingerprints.get(m, None)
+        if fp is not None:
+            return fp
+
+    # post-order walk of the HwModule hierarchy, the fingerprint of the parent depends on fingerprints of the children
+    stack = [_HwModule_fingerprint_begin(m)]
+    while True:
+        m, h, children = stack[-1]
+        for ch in children:
+            fp = fingerprints.get(ch, None)
+            if fp is None:
+                stack.append(_HwModule_fingerprint_begin(ch))
+                break
+            h.update(fp)
+        else:
+            stack.pop()
+            fp = fingerprints[m] = _HwModule_fingerprint_end(m, h)
+            if not stack:
+                return fp
+            stack[-1][1].update(fp)
+
+
+def _code_fingerprint(h, code: CodeType):
+    h.update(code.co_code)
+    for c in code.co_consts:
+        if isinstance(c, CodeType):
+            # repr of code object contains its address
+            _code_fingerprint(h, c)
+        else:
+            h.update(repr(c).encode())
+    h.update(repr(code.co_names).encode())
+
+
+def optimizations_fingerprint(optimizations: Sequence[Callable]) -> bytes:
+    """
+    Get hash of the list of the optimization passes (the name and the bytecode of each pass)
+    """
+    h = sha1()
+    for opt in optimizations:
+        h.update(f"{getattr(opt, '__module__', '')}.{getattr(opt, '__qualname__', repr(opt))};".encode())
+        code = getattr(opt, "__code__", None)
+        if code is not None:
+            _code_fingerprint(h, code)
+    return h.digest()
+
+
+@lru_cache(maxsize=None)
+def converter_fingerprint() -> bytes:
+    """
+    Get hash of the source code of the converter and of the containers (all modules of :mod:`hwtGraph.elk`)
+    which changes if hwtGraph is upgraded or modified
+    """
+    h = sha1()
+    root = os.path.dirname(os.path.abspath(hwtGraph.elk.__file__))
+    files = []
+    for dirPath, dirNames, fileNames in os.walk(root):
+        dirNames[:] = [d for d in dirNames if d != "__pycache__"]
+        for f in fileNames:
+            if f.endswith(".py"):
+                files.append(os.path.relpath(os.path.join(dirPath, f), root))
+
+    for f in sorted(files):
+        h.update(f.replace(os.sep, "/").encode())
+        h.update(b"\0")
+        with open(os.path.join(root, f), "rb") as fp:
+            h.update(fp.read())
+        h.update(b"\0")
+    return h.digest()
@@ -3,6 +3,7 @@ from typing import Callable, Set
 from hwt.pyUtils.setList import SetList
 from hwtGraph.elk.containers.constants import PortType, PortSide
 from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.containers.orderedSetList import OrderedSetList
 
 
 def searchRootOfTree(reducibleChildren: Set[LNode], nodeFromTree: LNode, removedNodes: Set[LNode]):
@@ -77,7 +78,7 @@ def flattenTrees(root, nodeSelector: Callable[[LNode], bool], reversePortOrder):
     :attention: selected nodes has to have single output
                 and has to be connected to nets with single driver
     """
-    assert isinstance(root.children, list)
+    assert isinstance(root.children, OrderedSetList)
     for ch in root.children:
         if ch.children:
             flattenTrees(ch, nodeSelector, reversePortOrder)
@@ -0,0 +1,229 @@
+from typing import Dict, List, Optional, Tuple, Generator
+
+from hwt.hwIO import HwIO
+from hwt.hwModule import HwModule
+from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.containers.lPort import LPort
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode, HwIO_isEmptyArray
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_LAYOUT_OPTIMIZATIONS
+from hwtGraph.elk.fromHwt.fingerprint import HwModule_fingerprint
+from hwtGraph.elk.fromHwt.utils import originObjOfPort
+
+
+def iterHwIOsOfHwModule(m: HwModule) -> Generator[HwIO, None, None]:
+    """
+    Walk all interfaces of the module in the order in which the ports
+    are created by :func:`hwtGraph.elk.fromHwt.convertor.HwModuleToLNode`
+    """
+    stack = [hwIO for hwIO in reversed(m._hwIOs) if not HwIO_isEmptyArray(hwIO)]
+    while stack:
+        hwIO = stack.pop()
+        yield hwIO
+        stack.extend(reversed(hwIO._hwIOs))
+
+
+def _LPort_iterEdgesRecursively(p: LPort):
+    stack = [p]
+    while stack:
+        p = stack.pop()
+        yield from p.iterEdges()
+        stack.extend(reversed(p._children or ()))
+
+
+class _HwModuleRecord():
+    """
+    The result of the conversion of a single HwModule instance
+
+    :ivar ~.fingerprint: fingerprint of the HwModule (and all its children) from which the node was generated
+    :ivar ~.node: the LNode generated for the HwModule
+    :ivar ~.ports: the ports of the node in the order of :func:`iterHwIOsOfHwModule`
+    :ivar ~.children: list of records for children HwModules (the shared components do not have a record)
+    """
+    __slots__ = ["fingerprint", "node", "ports", "children"]
+
+    def __init__(self, fingerprint: bytes, node: LNode, ports: List[LPort], children: List["_HwModuleRecord"]):
+        self.fingerprint = fingerprint
+        self.node = node
+        self.ports = ports
+        self.children = children
+
+
+class IncrementalHwModuleToLNode():
+    """
+    Incremental version of :func:`hwtGraph.elk.fromHwt.convertor.HwModuleToLNode`
+
+    Keeps the LNode graph from the previous conversion and on each conversion
+    converts only the HwModule instances with a changed fingerprint
+    (the fingerprint is a hash of the name, IO, signals, statements and children of the HwModule).
+    The LNodes of unchanged HwModules are disconnected from the old parent and moved to the new graph,
+    the optimizations are not executed on their body again.
+
+    :note: The HwModule instances are matched by the path of the names from the top HwModule.
+        If the fingerprint of the top HwModule did not change the previous LNode is returned as it is.
+    :note: The originObj of the objects inside of reused LNode refer to the objects
+        of the netlist from which the node was originally converted,
+        the reused LNode itself, the LNodes of its children HwModules and their ports are updated
+        to refer the current HwModules (also if the whole graph is reused).
+    :attention: The optimizations are expected to be idempotent because
+        in the non incremental conversion they are executed on each subtree once for each parent.
+
+    :ivar ~.optimizations: list of functions which are applied on LNode of each HwModule
+    :ivar ~.root: the LNode from the last conversion
+    :ivar ~.toL: the dictionary {hwt object: LNode/LPort} from the last conversion
+        (contains all objects from the converted HwModules, only the HwModules and their ports from reused ones)
+    :ivar ~.reusedCnt: number of HwModule instances reused in the last conversion
+    :ivar ~.convertedCnt: number of HwModule instances converted in the last conversion
+    :ivar ~._topFingerprint: fingerprint of the top HwModule from the last conversion
+    :ivar ~._records: {path of HwModule names: _HwModuleRecord} from the last conversion
+    """
+
+    def __init__(self, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS):
+        self.optimizations = optimizations
+        self.root: Optional[LNode] = None
+        self.toL: Optional[dict] = None
+        self.reusedCnt = 0
+        self.convertedCnt = 0
+        self._topFingerprint: Optional[bytes] = None
+        self._records: Dict[Tuple[str, ...], _HwModuleRecord] = {}
+
+        # state of the conversion in progress
+        self._newRecords: Dict[Tuple[str, ...], _HwModuleRecord] = {}
+        self._paths: Dict[HwModule, Tuple[str, ...]] = {}
+        self._fingerprints: Dict[HwModule, bytes] = {}
+        self._hiddenBodies: List[Tuple[LNode, object]] = []
+
+    def fingerprint(self, m: HwModule) -> bytes:
+        return HwModule_fingerprint(m, self._fingerprints)
+
+    def convert(self, m: HwModule) -> LNode:
+        """
+        Convert the synthesized HwModule to LNode, reuse the parts of the graph from previous conversion if possible
+        """
+        self.reusedCnt = 0
+        self.convertedCnt = 0
+        fp = self.fingerprint(m)
+        if self.root is not None and fp == self._topFingerprint:
+            toL = {}
+            self._rebind(m, self._records[(m._name,)], toL)
+            self.toL = toL
+            self.reusedCnt = 1
+            self._fingerprints.clear()
+            return self.root
+
+        toL = {}
+        self._paths[m] = (m._name,)
+        try:
+            root = HwModuleToLNode(m, toL=toL, optimizations=self.optimizations, childProvider=self)
+        except BaseException:
+            # the old graph may be corrupted by the reuse of its parts
+            self.root = None
+            self.toL = None
+            self._topFingerprint = None
+            self._records = {}
+            self._newRecords = {}
+            raise
+        finally:
+            for n, children in self._hiddenBodies:
+                n._children = children
+            self._hiddenBodies.clear()
+            self._paths.clear()
+            self._fingerprints.clear()
+
+        self.root = root
+        self.toL = toL
+        self._topFingerprint = fp
+        self._records = self._newRecords
+        self._newRecords = {}
+        return root
+
+    def tryReuse(self, parent: LNode, m: HwModule, toL: dict) -> Optional[LNode]:
+        """
+        Try to reuse the LNode from previous conversion for the children HwModule m
+        of HwModule of the parent LNode.
+
+        :return: the reused LNode (already added to parent) or None if the HwModule has to be converted
+        """
+        path = self._paths[parent.originObj] + (m._name,)
+        self._paths[m] = path
+        if m._shared_component_with:
+            return None
+
+        rec = self._records.get(path, None)
+        if rec is None or rec.fingerprint != self.fingerprint(m):
+            return None
+
+        n = rec.node
+        # disconnect the node from the graph of the old parent
+        # (the edges inside of the node have the node itself as a parentNode)
+        for p in n.iterPorts():
+            for e in list(_LPort_iterEdgesRecursively(p)):
+                if e.parentNode is not n:
+                    e.remove()
+
+        n.parent = parent
+        parent.children.append(n)
+        # the HwModules inside may be used as a shared component by other HwModules
+        self._rebind(m, rec, {} if toL is None else toL)
+
+        # the old toL is not needed anymore, the body of this node will not be modified
+        stack = [n]
+        while stack:
+            _n = stack.pop()
+            if _n._node2lnode is not None:
+                _n._node2lnode = None
+                stack.extend(_n._children or ())
+
+        # hide the body of the node so the optimizations of parents do not process it again
+        self._hiddenBodies.append((n, n._children))
+        n._children = None
+
+        self._addRecord(path, rec)
+        self.reusedCnt += 1
+        return n
+
+    @staticmethod
+    def _rebind(m: HwModule, rec: _HwModuleRecord, toL: dict):
+        """
+        Update the originObj of the reused LNode of HwModule m, of the LNodes of its children HwModules and of their ports
+        to refer the current HwModules and register them in toL
+        """
+        stack = [(m, rec)]
+        while stack:
+            m, rec = stack.pop()
+            rec.node.originObj = m
+            toL[m] = rec.node
+            for hwIO, p in zip(iterHwIOsOfHwModule(m), rec.ports):
+                origin = originObjOfPort(hwIO)
+                p.originObj = origin
+                toL[origin] = p
+
+            if rec.children:
+                childRecs = {ch.node.name: ch for ch in rec.children}
+                for su in m._subHwModules:
+                    ch = childRecs.get(su._name, None)
+                    if ch is not None:
+                        stack.append((su, ch))
+
+    def _addRecord(self, path: Tuple[str, ...], rec: _HwModuleRecord):
+        stack = [(path, rec)]
+        while stack:
+            path, rec = stack.pop()
+            self._newRecords[path] = rec
+            for ch in reversed(rec.children):
+                # the children records have same paths as in the previous conversion
+                stack.append((path + (ch.node.name,), ch))
+
+    def record(self, m: HwModule, node: LNode, toL: dict):
+        """
+        Store the result of the conversion of HwModule m for the next conversion
+        """
+        self.convertedCnt += 1
+        path = self._paths[m]
+        children = []
+        for su in m._subHwModules:
+            rec = self._newRecords.get(self._paths[su], None)
+            if rec is not None:
+                children.append(rec)
+
+        ports = [toL[originObjOfPort(hwIO)] for hwIO in iterHwIOsOfHwModule(m)]
+        self._newRecords[path] = _HwModuleRecord(self.fingerprint(m), node, ports, children)
@@ -1,94 +1,146 @@
-from typing import Union
+from enum import Enum
+from typing import Generator, List, Optional, Tuple, Union
 
 from hwt.pyUtils.setList import SetList
 from hwt.mainBases import RtlSignalBase
 from hwtGraph.elk.containers.constants import PortType
+from hwtGraph.elk.containers.lEdge import LEdge
 from hwtGraph.elk.containers.lNode import LNode
 from hwtGraph.elk.containers.lPort import LPort
+from hwtGraph.elk.containers.orderedSetList import OrderedSetList
+
+
+class ValidationLevel(Enum):
+    """
+    The level of checks of the connections of ports during the conversion
+
+    :cvar ~.FULL: the ports are checked when added to the net and again once per net when the LEdge is constructed (default)
+    :cvar ~.ONCE: the ports are checked only when added to the net
+    :cvar ~.OFF: the ports are not checked (for trusted designs)
+
+    :note: The checks are assertions, they are not executed at all with python -O.
+    """
+    FULL = 0
+    ONCE = 1
+    OFF = 2
 
 
 class NetCtxs(dict):
     """
     Dictionary of NetCtx instances
+
+    The nets are joined as sets in union-find data structure, each key is stored with the NetCtx which was created for it
+    (the values are in the order of creation) and the item access returns the representative NetCtx of the joined nets.
+    The ports and the keys of the joined nets are merged only once in :meth:`~.applyConnections`.
+
+    :note: :meth:`~.get`/:meth:`~.values`/:meth:`~.items` return the representative NetCtx for each key
+        (as the item access does), dict.values()/dict.items() contain also the NetCtx instances
+        which were joined to another net.
+
+    :ivar ~.validation: the level of checks of the ports in nets
     """
 
-    def __init__(self, parentNode: LNode):
+    def __init__(self, parentNode: LNode, validation: ValidationLevel=ValidationLevel.FULL):
         dict.__init__(self)
         self.parentNode = parentNode
+        self.validation = validation
+
+    def __getitem__(self, k) -> "NetCtx":
+        return dict.__getitem__(self, k).find()
+
+    def get(self, k, default=None) -> Optional["NetCtx"]:
+        v = dict.get(self, k, None)
+        if v is None:
+            return default
+        return v.find()
+
+    def values(self) -> Generator["NetCtx", None, None]:
+        for v in dict.values(self):
+            yield v.find()
+
+    def items(self) -> Generator[Tuple[object, "NetCtx"], None, None]:
+        for k, v in dict.items(self):
+            yield k, v.find()
 
     def applyConnections(self, root: LNode):
-        seen = set()
-        for sig, net in sorted(self.items(), key=lambda x: x[1].seqNo):
-            if net in seen:
-                continue
-            seen.add(net)
+        """
+        Create a LEdge for each net
 
-            if net.endpoints:
-                assert net.drivers, ("Drivers lost somewhere during conversion", sig, net)
+        The ports of the net were already checked in :meth:`NetCtx.addDriver`/:meth:`NetCtx.addEndpoint`,
+        because of this the edges are constructed by :meth:`LEdge.fromCheckedPorts` without checks of each added port.
+        The ports are checked again against the edge in a single loop per net if the validation is
+        :attr:`ValidationLevel.FULL` or if root is not the parent of this nets.
+        The edges are created in the order of seqNo of the nets, the name of the edge is the repr
+        of the first key of the net in this dictionary.
+        """
+        firstKeys = {}
+        for k, net in dict.items(self):
+            net = net.find()
+            if net not in firstKeys:
+                firstKeys[net] = k
 
-            if not net.endpoints:
+        check = root is not self.parentNode or self.validation is ValidationLevel.FULL
+        for net in dict.values(self):
+            if net._parent is not None:
+                # the net was joined to another one
+                continue
+            sig = firstKeys[net]
+            drivers = net.getDrivers()
+            endpoints = net.getEndpoints()
+            if not endpoints:
                 # unconnected input or constant which was replaced by value
                 # assert not sig.endpoints\
                 #        or isConst(sig), (sig, sig.endpoints)
                 continue
 
-            if len(net.actualKeys) == 1:
-                originObj = net.actualKeys[0]
+            assert drivers, ("Drivers lost somewhere during conversion", sig, net)
+
+            actualKeys = net.actualKeys
+            if len(actualKeys) == 1:
+                originObj = actualKeys[0]
             else:
-                originObj = tuple(net.actualKeys)
-            root.addHyperEdge(list(net.drivers), list(net.endpoints),
-                              name=repr(sig), originObj=originObj)
+                originObj = tuple(actualKeys)
+            e = LEdge.fromCheckedPorts(root, drivers, endpoints,
+                                       name=repr(sig), originObj=originObj)
+            if check:
+                assert all(e._checkSource(p) for p in drivers) and all(e._checkTarget(p) for p in endpoints)
 
     def joinNetsByKey(self, k0, k1):
         v0, _ = self.getDefault(k0)
         v1, _ = self.getDefault(k1)
-        if v0 is v1:
-            return v0
-
-        v0.extend(v1)
-        v0.actualKeys.extend(v1.actualKeys)
-
-        self[k1] = v0
-        return v0
+        return v0.union(v1)
 
     def joinNetsByKeyVal(self, k0, v1: "NetCtx"):
         v0, _ = self.getDefault(k0)
-        if v0 is v1:
-            return v0
-
-        v0.extend(v1)
-        v0.actualKeys.extend(v1.actualKeys)
-
-        for k in v1.actualKeys:
-            self[k] = v0
-
-        return v0
+        return v0.union(v1)
 
     def joinNetsByValKey(self, v0: "NetCtx", k1):
         v1, _ = self.getDefault(k1)
-        if v0 is v1:
-            return v0
-
-        v0.extend(v1)
-        v0.actualKeys.extend(v1.actualKeys)
-
-        for k in v1.actualKeys:
-            self[k] = v0
-
-        return v0
+        return v0.union(v1)
 
     def getDefault(self, k):
         """
         :return: tuple (value, True if key was there before else False)
         """
         try:
-            return self[k], True
+            return dict.__getitem__(self, k).find(), True
         except KeyError:
-            v = self[k] = NetCtx(self, k, len(self))
+            v = NetCtx(self, k, len(self))
+            dict.__setitem__(self, k, v)
             return v, False
 
 
 class NetCtx():
+    """
+    Set of ports (and keys) which are connected together (the node of union-find data structure)
+
+    :ivar ~.drivers: the driver ports added directly to this net (without the ports of the joined nets)
+    :ivar ~.endpoints: the endpoint ports added directly to this net (without the ports of the joined nets)
+    :ivar ~._parent: the net where this net was joined to or None if this net is the representative of the set
+    :ivar ~._joined: list of tuples (joined net, len(drivers), len(endpoints)) the positions
+        are the positions where the ports of the joined net are merged in the lists of ports
+        (the order of ports is the same as if the ports were copied on join)
+    """
 
     def __init__(self, others: NetCtxs, actualKey, seqNo: int):
         """
@@ -97,46 +149,146 @@ class NetCtx():
         """
         self.parentNode = others.parentNode
         assert isinstance(self.parentNode, LNode), self.parentNode
-        self.actualKeys = [actualKey, ]
+        self._actualKey = actualKey
         self.others = others
         self.drivers = SetList()
         self.endpoints = SetList()
         self.seqNo = seqNo
+        self._parent: Optional[NetCtx] = None
+        self._joined: List[Tuple[NetCtx, int, int]] = []
+        self._validate = others.validation is not ValidationLevel.OFF
+
+    def find(self) -> "NetCtx":
+        """
+        :return: the representative of the set of joined nets where this net is
+        """
+        root = self
+        while root._parent is not None:
+            root = root._parent
+
+        # path compression
+        n = self
+        while n is not root:
+            n._parent, n = root, n._parent
+
+        return root
+
+    def union(self, other: "NetCtx") -> "NetCtx":
+        """
+        Join other net to this net
+
+        :return: the representative of joined nets (the representative of this net)
+        """
+        v0 = self.find()
+        v1 = other.find()
+        if v0 is v1:
+            return v0
+
+        v1._parent = v0
+        v0._joined.append((v1, len(v0.drivers), len(v0.endpoints)))
+        return v0
+
+    def _iterJoined(self, listIndex: int) -> Generator[Union[LPort, object], None, None]:
+        """
+        Iterate items of all joined nets in the order as if the items were copied on join
+
+        :param listIndex: 0 for drivers, 1 for endpoints, 2 for actualKeys
+        """
+        # stack of (net, index in own items, index in _joined)
+        stack = [(self, 0, 0)]
+        while stack:
+            net, i, ji = stack.pop()
+            if listIndex == 2:
+                items = (net._actualKey,)
+            elif listIndex == 1:
+                items = net.endpoints
+            else:
+                items = net.drivers
+
+            joined = net._joined
+            if ji < len(joined):
+                j = joined[ji]
+                end = 1 if listIndex == 2 else j[1 + listIndex]
+                yield from items[i:end]
+                stack.append((net, end, ji + 1))
+                stack.append((j[0], 0, 0))
+            else:
+                yield from items[i:]
+
+    def getDrivers(self) -> OrderedSetList:
+        """
+        :return: unique driver ports of this net and all joined nets
+        """
+        if not self._joined:
+            return OrderedSetList(self.drivers)
+        return OrderedSetList(self._iterJoined(0))
+
+    def getEndpoints(self) -> OrderedSetList:
+        """
+        :return: unique endpoint ports of this net and all joined nets
+        """
+        if not self._joined:
+            return OrderedSetList(self.endpoints)
+        return OrderedSetList(self._iterJoined(1))
+
+    @property
+    def actualKeys(self) -> list:
+        """
+        Keys of this net and all joined nets
+        """
+        if not self._joined:
+            return [self._actualKey, ]
+        return list(self._iterJoined(2))
+
+    def _checkDriver(self, src: LPort) -> bool:
+        """
+        Check if the port can be a driver of this net
+
+        :raise AssertionError: if the port can not be connected
+        :return: True (the check is executed as "assert self._checkDriver(src)" so it is skipped with python -O)
+        """
+        if self.parentNode is src.parentNode:
+            # connection between input and output on nodes with same parent
+            assert src.direction == PortType.INPUT, src
+        elif self.parentNode.parent is src.parentNode:
+            # source is parent input port
+            assert src.direction == PortType.INPUT, src
+        else:
+            # source is child output port
+            assert self.parentNode is src.parentNode.parent, src
+            assert src.direction == PortType.OUTPUT, src
+        return True
 
-    def extend(self, other: "NetCtx"):
-        self.drivers.extend(other.drivers)
-        self.endpoints.extend(other.endpoints)
+    def _checkEndpoint(self, dst: LPort) -> bool:
+        """
+        Check if the port can be an endpoint of this net
+
+        :see: :meth:`~._checkDriver`
+        """
+        if self.parentNode is dst.parentNode:
+            # connection between input and output on nodes with same parent
+            assert dst.direction == PortType.OUTPUT, dst
+        elif self.parentNode.parent is dst.parentNode:
+            # target is parent output port
+            assert dst.direction == PortType.INPUT, dst
+        else:
+            # target is child input port
+            assert self.parentNode is dst.parentNode.parent, dst
+            assert dst.direction == PortType.INPUT, dst
+        return True
 
     def addDriver(self, src: Union[RtlSignalBase, LPort]):
         if isinstance(src, RtlSignalBase):
             return self.others.joinNetsByKeyVal(src, self)
         else:
-            if self.parentNode is src.parentNode:
-                # connection between input and output on nodes with same parent
-                assert src.direction == PortType.INPUT, src
-            elif self.parentNode.parent is src.parentNode:
-                # source is parent input port
-                assert src.direction == PortType.INPUT, src
-            else:
-                # source is child output port
-                assert self.parentNode is src.parentNode.parent, src
-                assert src.direction == PortType.OUTPUT, src
-
-            return self.drivers.append(src)
+            if self._validate:
+                assert self._checkDriver(src)
+            return self.find().drivers.append(src)
 
     def addEndpoint(self, dst: Union[RtlSignalBase, LPort]):
         if isinstance(dst, RtlSignalBase):
             return self.others.joinNetsByValKey(self, dst)
         else:
-            if self.parentNode is dst.parentNode:
-                # connection between input and output on nodes with same parent
-                assert dst.direction == PortType.OUTPUT, dst
-            elif self.parentNode.parent is dst.parentNode:
-                # target is parent output port
-                assert dst.direction == PortType.INPUT, dst
-            else:
-                # target is child input port
-                assert self.parentNode is dst.parentNode.parent, dst
-                assert dst.direction == PortType.INPUT, dst
-
-            return self.endpoints.append(dst)
+            if self._validate:
+                assert self._checkEndpoint(dst)
+            return self.find().endpoints.append(dst)
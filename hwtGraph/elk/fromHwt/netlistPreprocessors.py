@@ -1,3 +1,5 @@
+from typing import Optional
+
 from hwt.hdl.operator import HOperatorNode
 from hwt.hdl.operatorDefs import HwtOps
 from hwt.hdl.statements.statement import HdlStatement
@@ -8,31 +10,79 @@ from hwt.serializer.utils import RtlSignal_sort_key
 from hwt.synthesizer.rtlLevel.netlist import RtlNetlist
 from hwt.synthesizer.rtlLevel.rtlNetlistPass import RtlNetlistPass
 from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+from hwtGraph.elk.fromHwt.conversionProfiler import ConversionProfiler, notMeasured
+
+
+def _isIndexToUnhide(s: RtlSignal, ep) -> bool:
+    """
+    :return: True if ep is an INDEX operator on s with unnamed result which is not an index of BRAM write
+    """
+    if isinstance(ep, HOperatorNode)\
+            and ep.operator == HwtOps.INDEX\
+            and ep.operands[0] is s\
+            and ep.result._isUnnamedExpr:
+        ep: HOperatorNode
+        isIndexInBramWrite = isinstance(s._dtype, HArray)\
+            and arr_all(ep.result._rtlEndpoints,
+                        lambda ep: isinstance(ep, HdlStatement)\
+                                   and ep._event_dependent_from_branch == 0)
+        return not isIndexInBramWrite
+    return False
 
 
 class RtlNetlistPassUnhideResultsOfIndexingAndConcatOnPublicSignals(RtlNetlistPass):
+    """
+    Replace the unnamed result of INDEX operator on a named signal by a named signal
+    (assigned from the new unnamed result of the same INDEX operator) so the result of indexing is visible
+    in the schematic. The new named signals are processed as well.
+
+    Each signal is processed once, the endpoints of a signal are scanned once and the replaced operators
+    are removed from the endpoints of the signal in bulk (the time is linear in the size of the netlist).
+
+    :ivar ~.profiler: optional ConversionProfiler where the time of this pass and the number
+        of processed signals ("signals"), scanned endpoints ("endpoints")
+        and replaced operators ("replaced") is recorded
+    """
+
+    def __init__(self, profiler: Optional[ConversionProfiler]=None):
+        super(RtlNetlistPassUnhideResultsOfIndexingAndConcatOnPublicSignals, self).__init__()
+        self.profiler = profiler
 
     def runOnRtlNetlist(self, netlist:RtlNetlist):
+        measure = notMeasured if self.profiler is None else self.profiler.measure
+        with measure("unhideResultsOfIndexing", None) as rec:
+            signals, endpoints, replaced = self._unhideResultsOfIndexing(netlist)
+            rec["signals"] = signals
+            rec["endpoints"] = endpoints
+            rec["replaced"] = replaced
+
+    def _unhideResultsOfIndexing(self, netlist:RtlNetlist):
+        """
+        :return: tuple (number of processed signals, number of scanned endpoints, number of replaced operators)
+        """
         openset = SetList(sorted(
             (s for s in netlist.signals if not s._isUnnamedExpr),
             key=RtlSignal_sort_key
         ))
-        epsToReplace = []
+        signals = 0
+        endpoints = 0
+        replaced = 0
         while openset:
             s = openset.pop()
             s: RtlSignal
-            for ep in s._rtlEndpoints:
-                # search for index ops
-                if isinstance(ep, HOperatorNode)\
-                        and ep.operator == HwtOps.INDEX\
-                        and ep.operands[0] is s:
-                    ep: HOperatorNode
-                    isIndexInBramWrite = isinstance(s._dtype, HArray)\
-                        and arr_all(ep.result._rtlEndpoints,
-                                    lambda ep: isinstance(ep, HdlStatement)\
-                                               and ep._event_dependent_from_branch == 0)
-                    if not isIndexInBramWrite and ep.result._isUnnamedExpr:
-                        epsToReplace.append(ep)
+            signals += 1
+            eps = s._rtlEndpoints
+            endpoints += len(eps)
+            epsToReplace = [ep for ep in eps if _isIndexToUnhide(s, ep)]
+            if not epsToReplace:
+                continue
+
+            # remove the operators from endpoints at once, the removal in ep._destroy() is then O(1)
+            # instead of O(len(eps)) for each operator
+            toRemove = set(epsToReplace)
+            keep = [ep for ep in eps if ep not in toRemove]
+            eps.clear()
+            eps.extend(keep)
 
             for ep in epsToReplace:
                 ep: HOperatorNode
@@ -50,4 +100,6 @@ class RtlNetlistPassUnhideResultsOfIndexingAndConcatOnPublicSignals(RtlNetlistPa
                 r(new_r)
                 openset.append(r)
 
-            epsToReplace.clear()
+            replaced += len(epsToReplace)
+
+        return signals, endpoints, replaced
@@ -0,0 +1,104 @@
+from typing import Dict, Hashable, Optional, Set, Union
+
+from hwt.hdl.const import HConst
+from hwt.hdl.operator import HOperatorNode
+from hwt.hdl.portItem import HdlPortItem
+from hwt.hdl.statements.statement import HdlStatement
+from hwt.hwIO import HwIO
+from hwt.hwModule import HwModule
+from hwt.mainBases import RtlSignalBase
+from hwt.serializer.utils import HdlStatement_sort_key, RtlSignal_sort_key
+from hwtGraph.elk.containers.lEdge import LEdge
+from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.containers.lPort import LPort
+
+
+def _hierarchyPath(o: Union[HwModule, HwIO]) -> tuple:
+    path = []
+    while o is not None:
+        path.append(o._name)
+        o = o._parent
+    path.reverse()
+    return tuple(path)
+
+
+def originObjKey(o) -> Optional[Hashable]:
+    """
+    Get a key of the hwt object (originObj of LNode/LPort/LEdge) which does not reference any hwt object
+    (a tuple of str and int), the key of the same object is always the same
+
+    * signals and statements are identified by :func:`hwt.serializer.utils.RtlSignal_sort_key`
+      and :func:`hwt.serializer.utils.HdlStatement_sort_key` (the name and the id of the instance)
+    * operators by the key of the result signal
+    * HwModule and HwIO by the names on the path in the hierarchy, HdlPortItem by the path of HwModule and its name
+    * constants by its repr
+    """
+    if o is None:
+        return None
+    elif isinstance(o, RtlSignalBase):
+        return ("RtlSignal", *RtlSignal_sort_key(o))
+    elif isinstance(o, HdlStatement):
+        return (o.__class__.__name__, *HdlStatement_sort_key(o))
+    elif isinstance(o, HOperatorNode):
+        return ("HOperatorNode", o.operator.id, *RtlSignal_sort_key(o.result))
+    elif isinstance(o, HdlPortItem):
+        return ("HdlPortItem", *_hierarchyPath(o.module), o.name)
+    elif isinstance(o, HwModule):
+        return ("HwModule", *_hierarchyPath(o))
+    elif isinstance(o, HwIO):
+        return ("HwIO", *_hierarchyPath(o))
+    elif isinstance(o, HConst):
+        return ("HConst", repr(o))
+    elif isinstance(o, tuple):
+        return (o.__class__.__name__, *(originObjKey(i) for i in o))
+    else:
+        return (o.__class__.__name__, repr(o))
+
+
+def LNode_releaseNetlist(root: LNode) -> Dict[Hashable, Union[LNode, LPort]]:
+    """
+    Remove all references to the hwt netlist from the graph, so the netlist can be released from memory
+    while the graph is kept (e.g. for a schematic viewer).
+
+    The originObj of each LNode/LPort/LEdge is replaced by :func:`originObjKey` of it,
+    the node2lnode dictionary (which is shared by all nodes) is replaced by a returned index
+    {:func:`originObjKey`: LNode/LPort} which can be used for cross-probing.
+    The name of LEdge without name is set to repr of its originObj (the name which is used in ELK JSON)
+    so ELK JSON does not change.
+
+    :attention: The graph can not be used for an incremental conversion
+        (:class:`hwtGraph.elk.fromHwt.incrementalConvertor.IncrementalHwModuleToLNode`) after this
+    :return: index {originObjKey: LNode/LPort} created from the node2lnode dictionary of root
+    """
+    toL = root._node2lnode
+    if toL is None:
+        # the graph does not come from the conversion or it was already released
+        return {}
+
+    index = {}
+    for o, lo in toL.items():
+        if o is not None and isinstance(lo, (LNode, LPort)):
+            index[originObjKey(o)] = lo
+
+    edges: Set[LEdge] = set()
+    nodeStack = [root]
+    while nodeStack:
+        n = nodeStack.pop()
+        n.originObj = originObjKey(n.originObj)
+        n._node2lnode = None
+        portStack = list(n.iterPorts())
+        while portStack:
+            p = portStack.pop()
+            p.originObj = originObjKey(p.originObj)
+            edges.update(p.iterEdges())
+            portStack.extend(p._children or ())
+        nodeStack.extend(n._children or ())
+
+    for e in edges:
+        o = e.originObj
+        if o is not None:
+            if e.name is None:
+                e.name = repr(o)
+            e.originObj = originObjKey(o)
+
+    return index
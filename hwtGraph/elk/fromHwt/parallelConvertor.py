@@ -0,0 +1,231 @@
+import multiprocessing
+from typing import Dict, List, Optional, Set, Tuple, Generator, Union
+
+from hwt.hwModule import HwModule
+from hwtGraph.elk.containers.lGraphTables import LGraphTables
+from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.containers.lPort import LPort
+from hwtGraph.elk.fromHwt.conversionProfiler import ConversionProfiler
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_LAYOUT_OPTIMIZATIONS
+from hwtGraph.elk.fromHwt.incrementalConvertor import iterHwIOsOfHwModule
+from hwtGraph.elk.fromHwt.netCtx import ValidationLevel
+from hwtGraph.elk.fromHwt.utils import originObjOfPort
+
+# the converter which started the worker processes, the workers are forked so they can access it
+_forkedConvertor: Optional["ParallelHwModuleToLNode"] = None
+
+
+# list of tuples (index in :func:`_iterNodesAndPorts`, index of HwModule in :func:`_iterHwModules`,
+# index of HwIO in :func:`iterHwIOsOfHwModule` or -1 for the HwModule itself)
+_OriginRows = List[Tuple[int, int, int]]
+# the records and hwModules of :class:`ConversionProfiler` from the worker or None if the profiler is not used
+_ProfilerRecords = Optional[Tuple[List[dict], List[dict]]]
+_WorkerResult = Tuple[LGraphTables, _OriginRows, _OriginRows, _ProfilerRecords]
+
+
+def _convertInWorker(index: int) -> _WorkerResult:
+    self = _forkedConvertor
+    return self._convertChild(self._top._subHwModules[index])
+
+
+def _iterPortsInTableOrder(n: LNode) -> Generator[LPort, None, None]:
+    """
+    Walk ports (including children ports) in the order of rows in :class:`LGraphTables`
+    """
+    stack = [p for _, p in reversed(list(n.iterPortsWithReverseFlag()))]
+    while stack:
+        p = stack.pop()
+        yield p
+        stack.extend(reversed(p._children or ()))
+
+
+def _iterNodesAndPorts(n: LNode) -> Generator[Union[LNode, LPort], None, None]:
+    """
+    Walk all nodes and ports in the graph in deterministic order
+    (the order is the same for the LNode rebuilt from :class:`LGraphTables`)
+    """
+    stack = [n]
+    while stack:
+        n = stack.pop()
+        yield n
+        yield from _iterPortsInTableOrder(n)
+        stack.extend(reversed(n._children or ()))
+
+
+def _iterHwModules(m: HwModule) -> Generator[HwModule, None, None]:
+    stack = [m]
+    while stack:
+        m = stack.pop()
+        yield m
+        stack.extend(m._subHwModules)
+
+
+class ParallelHwModuleToLNode():
+    """
+    Conversion of :class:`hwt.hwModule.HwModule` to LNode (same as :func:`hwtGraph.elk.fromHwt.convertor.HwModuleToLNode`)
+    where the children of the top HwModule are converted in worker processes.
+
+    The workers are forked from the current process (the netlist does not need to be pickled),
+    each worker converts a child HwModule and returns it as :class:`hwtGraph.elk.containers.lGraphTables.LGraphTables`,
+    the main process rebuilds the LNode from the tables and continues the conversion of the top HwModule
+    as if the child was converted in the main process.
+
+    :note: The children which are shared components or which contain a HwModule
+        which is used as a shared component are converted in the main process.
+    :note: The originObj of the nodes and ports which were generated for HwModules and their HwIOs
+        is restored in the main process (and also the items in toL dictionary for them),
+        the originObj of the other objects inside of the LNodes converted in workers is None
+        and the names of edges are resolved in the worker.
+    :note: If the "fork" start method is not available the conversion is performed in the main process.
+    :note: The records of the profiler from the workers are added to the profiler in the main process
+        in the place where the child would be converted, the time of the child does not include the transfer
+        of the result from the worker.
+
+    :ivar ~.workers: number of worker processes
+    :ivar ~.optimizations: list of functions which are applied on LNode of each HwModule
+    :ivar ~.profiler: optional :class:`hwtGraph.elk.fromHwt.conversionProfiler.ConversionProfiler`
+        (same as for :func:`hwtGraph.elk.fromHwt.convertor.HwModuleToLNode`)
+    :ivar ~.validation: the level of checks of the connections of ports
+        (same as for :func:`hwtGraph.elk.fromHwt.convertor.HwModuleToLNode`)
+    :ivar ~.parallelCnt: number of children converted in workers in the last conversion
+    :ivar ~._top: the HwModule which is converted
+    :ivar ~._results: {child HwModule: result from worker}
+        (the tables, the rows of the objects for which originObj and toL should be restored
+        and the records of the profiler)
+    """
+
+    def __init__(self, workers: Optional[int]=None, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS,
+                 profiler: Optional[ConversionProfiler]=None,
+                 validation: ValidationLevel=ValidationLevel.FULL):
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        self.workers = workers
+        self.optimizations = optimizations
+        self.profiler = profiler
+        self.validation = validation
+        self.parallelCnt = 0
+        self._top: Optional[HwModule] = None
+        self._results: Dict[HwModule, _WorkerResult] = {}
+
+    @staticmethod
+    def _isSelfContained(m: HwModule, sharedComponents: Set[HwModule]) -> bool:
+        """
+        :return: True if the HwModule can be converted without the knowledge of the rest of the design
+        """
+        for _m in _iterHwModules(m):
+            if _m._shared_component_with or (_m is not m and _m in sharedComponents):
+                return False
+        return True
+
+    @staticmethod
+    def _iterOrigins(m: HwModule) -> Generator[Tuple[object, int, int], None, None]:
+        """
+        Walk HwModules and their HwIOs which can be an originObj of a node/port generated for m
+
+        :return: generator of tuples (originObj, index of HwModule, index of HwIO or -1)
+        """
+        for mi, _m in enumerate(_iterHwModules(m)):
+            yield _m, mi, -1
+            for hi, hwIO in enumerate(iterHwIOsOfHwModule(_m)):
+                yield originObjOfPort(hwIO), mi, hi
+
+    def _convertChild(self, m: HwModule) -> _WorkerResult:
+        """
+        Convert the child HwModule of the top (executed in worker)
+
+        :return: the tables of the LNode, the rows of nodes/ports with originObj which can be restored in the main process,
+            the rows of nodes/ports which are in toL for these originObjs and the records of the profiler
+        """
+        toL = {}
+        parent = LNode(name=self._top._name, originObj=self._top, node2lnode=toL)
+        n = parent.addNode(name=m._name, cls="HwModule", originObj=m)
+        profiler = self.profiler
+        if profiler is not None:
+            # the tracemalloc is already started (or not) by the profiler in the main process
+            profiler = ConversionProfiler(traceAllocations=False, countObjects=profiler.countObjects)
+            profiler._path.append(self._top._name)
+        HwModuleToLNode(m, n, toL, self.optimizations, profiler=profiler, validation=self.validation)
+
+        # :note: the id() is used because the originObj of other objects may not be hashable (e.g. HConst)
+        origins = {id(o): (o, mi, hi) for o, mi, hi in self._iterOrigins(m)}
+        rows = {}
+        originRows = []
+        for i, obj in enumerate(_iterNodesAndPorts(n)):
+            rows[obj] = i
+            o = origins.get(id(obj.originObj), None)
+            if o is not None:
+                originRows.append((i, o[1], o[2]))
+
+        toLRows = []
+        for o, mi, hi in origins.values():
+            i = rows.get(toL.get(o, None), None)
+            if i is not None:
+                toLRows.append((i, mi, hi))
+
+        profilerRecords = None if profiler is None else (profiler.records, profiler.hwModules)
+        return LGraphTables.fromLNode(n), originRows, toLRows, profilerRecords
+
+    def convert(self, m: HwModule) -> LNode:
+        """
+        Convert the synthesized HwModule to LNode
+        """
+        self.parallelCnt = 0
+        if self.workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+            sharedComponents = set(_m._shared_component_with[0]
+                                   for _m in _iterHwModules(m)
+                                   if _m._shared_component_with)
+            toConvert = [i for i, su in enumerate(m._subHwModules)
+                         if self._isSelfContained(su, sharedComponents)]
+        else:
+            toConvert = []
+
+        global _forkedConvertor
+        self._top = m
+        try:
+            if len(toConvert) > 1:
+                _forkedConvertor = self
+                try:
+                    with multiprocessing.get_context("fork").Pool(min(self.workers, len(toConvert))) as pool:
+                        results = pool.map(_convertInWorker, toConvert, chunksize=1)
+                finally:
+                    _forkedConvertor = None
+
+                for i, res in zip(toConvert, results):
+                    self._results[m._subHwModules[i]] = res
+
+            return HwModuleToLNode(m, optimizations=self.optimizations, childProvider=self,
+                                   profiler=self.profiler, validation=self.validation)
+        finally:
+            self._top = None
+            self._results.clear()
+
+    def tryReuse(self, parent: LNode, m: HwModule, toL: dict) -> Optional[LNode]:
+        """
+        Graft the LNode converted in worker into the parent
+        """
+        res = self._results.pop(m, None)
+        if res is None:
+            return None
+
+        tables, originRows, toLRows, profilerRecords = res
+        if profilerRecords is not None:
+            records, hwModules = profilerRecords
+            self.profiler.records.extend(records)
+            self.profiler.hwModules.extend(hwModules)
+        n = tables.toLNode()
+        n.parent = parent
+        parent.children.append(n)
+
+        origins = {(mi, hi): o for o, mi, hi in self._iterOrigins(m)}
+        objs = list(_iterNodesAndPorts(n))
+        for i, mi, hi in originRows:
+            objs[i].originObj = origins[(mi, hi)]
+        for i, mi, hi in toLRows:
+            toL[origins[(mi, hi)]] = objs[i]
+
+        self.parallelCnt += 1
+        return n
+
+    def record(self, m: HwModule, node: LNode, toL: dict):
+        pass
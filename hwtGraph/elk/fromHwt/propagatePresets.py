@@ -1,4 +1,6 @@
 from copy import deepcopy
+from itertools import islice
+from typing import Dict, List, Optional, Set, Tuple
 
 from hwt.hdl.statements.assignmentContainer import HdlAssignmentContainer
 from hwt.hdl.statements.codeBlockContainer import HdlStmCodeBlockContainer
@@ -12,77 +14,163 @@ from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 
 
 class HdlStatementCopier():
+    """
+    Factory of copies of the statement which are used to fill code branches of other statement
+    (called by HdlStatement._fill_enclosure for each branch where the copy is required)
+
+    The assignment (the most common case, e.g. default values in FSMs) is copied by construction
+    of a new virtual assignment which is much faster than deepcopy (the deep copy of the assignment
+    also shares src/dst and copies indexes only shallowly), other statements are deep copied.
+    """
 
     def __init__(self, stm: HdlStatement):
         self.stm = stm
 
     def __call__(self) -> HdlStatement:
-        stm = deepcopy(self.stm)
+        orig = self.stm
+        if isinstance(orig, HdlAssignmentContainer):
+            indexes = orig.indexes
+            if indexes:
+                indexes = list(indexes)
+            stm = HdlAssignmentContainer(orig.src, orig.dst, indexes, virtualOnly=True)
+            stm._event_dependent_from_branch = orig._event_dependent_from_branch
+        else:
+            stm = deepcopy(orig)
         assert stm.parentStm is None, stm
         return stm
 
 
-def propagatePresets_stm_list(stm_list: ListOfHdlStatement, output_sig: RtlSignal):
+class StmListPresetsCtx():
+    """
+    The state of :func:`propagatePresets_stm_list` for a single statement list
+    which is shared by the calls for all output signals of the parent statement
+
+    :ivar ~.stm_list: the statement list
+    :ivar ~.drivers: index {signal: list of (index in stm_list, statement)} of the statements in stm_list
+        or None if it has to be rebuilt because stm_list (or IO of some statement in it) was modified
+    :ivar ~.processed: True if all statements in stm_list were already processed by :func:`propagatePresets_stm`
+    :ivar ~.modified: statements which were modified by a merge after they were processed
+    """
+
+    def __init__(self, stm_list: ListOfHdlStatement):
+        self.stm_list = stm_list
+        self.drivers: Optional[Dict[RtlSignal, List[Tuple[int, HdlStatement]]]] = None
+        self.processed = False
+        self.modified: Set[HdlStatement] = set()
+
+    def getDrivers(self, sig: RtlSignal) -> List[Tuple[int, HdlStatement]]:
+        """
+        :return: list of (index, statement) for all statements in stm_list which are driving the sig
+        """
+        drivers = self.drivers
+        if drivers is None:
+            drivers = self.drivers = {}
+            for i, stm in enumerate(self.stm_list):
+                for o in stm._outputs:
+                    d = drivers.get(o, None)
+                    if d is None:
+                        drivers[o] = [(i, stm)]
+                    else:
+                        d.append((i, stm))
+
+        return drivers.get(sig, ())
+
+
+def propagatePresets_stm_list(stm_list: ListOfHdlStatement, output_sig: RtlSignal,
+                              ctx: Optional[StmListPresetsCtx]=None) -> bool:
     """
     If multiple statements are driving output_sig merge them into just one.
+
+    :param ctx: the context shared by the calls for the same stm_list (if None a new one is used)
+    :return: True if stm_list or any of statements in it was modified
     """
-    currently_last_driver = None
-    removed = []
-    for i, stm in enumerate(stm_list):
-        stm: HdlStatement
-        if output_sig in stm._outputs:
-            if currently_last_driver is None:
-                currently_last_driver = (i, stm)
-            else:
-                prev_i, prev_stm = currently_last_driver
-                prev_stm: HdlStatement
-                stm._discover_enclosure()
-                stm._fill_enclosure({output_sig: HdlStatementCopier(prev_stm)})
-                stm._clean_signal_meta()
-                removed.append((prev_i, prev_stm))
-                currently_last_driver = (i, stm)
-
-    if removed:
+    if ctx is None:
+        ctx = StmListPresetsCtx(stm_list)
+    else:
+        assert ctx.stm_list is stm_list
+
+    modified = False
+    drivers = ctx.getDrivers(output_sig)
+    if len(drivers) > 1:
+        # merge all drivers to the last one
+        removed = []
+        prev_i, prev_stm = drivers[0]
+        for i, stm in islice(drivers, 1, None):
+            stm: HdlStatement
+            prev_stm: HdlStatement
+            stm._discover_enclosure()
+            stm._fill_enclosure({output_sig: HdlStatementCopier(prev_stm)})
+            stm._clean_signal_meta()
+            removed.append((prev_i, prev_stm))
+            ctx.modified.add(stm)
+            prev_i, prev_stm = i, stm
+
         for i, stm in reversed(removed):
+            ctx.modified.discard(stm)
             if stm.parentStm is not None:
                 stm.parentStm._replace_child_statement(stm, [], False)
             else:
                 # we must pop from the end in order to not break the indexing
                 stm_list.pop(i)
+        ctx.drivers = None
+        modified = True
+
+    # the processing of the statement which was already processed and which was not modified since does nothing
+    if ctx.processed:
+        toProcess = ctx.modified
+        if toProcess:
+            toProcess = [stm for stm in stm_list if stm in toProcess]
+            ctx.modified = set()
+    else:
+        toProcess = stm_list
+        ctx.processed = True
+        ctx.modified.clear()
+
+    childModified = False
+    for stm in toProcess:
+        childModified |= propagatePresets_stm(stm)
 
-    for stm in stm_list:
-        propagatePresets_stm(stm)
+    if childModified:
+        # the IO of the child statements may have changed
+        ctx.drivers = None
 
+    return modified or childModified
 
-def propagatePresets_stm(stm: HdlStatement):
+
+def propagatePresets_stm(stm: HdlStatement) -> bool:
+    """
+    :return: True if the statement was modified
+    """
     if isinstance(stm, HdlAssignmentContainer):
-        pass
+        return False
 
     elif isinstance(stm, IfContainer):
         stm: IfContainer
-        for output_sig in stm._outputs:
-            propagatePresets_stm_list(stm.ifTrue, output_sig)
-            for _, stms in stm.elIfs:
-                propagatePresets_stm_list(stms, output_sig)
-            if stm.ifFalse:
-                propagatePresets_stm_list(stm.ifFalse, output_sig)
+        stm_lists = [stm.ifTrue, *(stms for _, stms in stm.elIfs)]
+        if stm.ifFalse:
+            stm_lists.append(stm.ifFalse)
 
     elif isinstance(stm, SwitchContainer):
         stm: SwitchContainer
-        for output_sig in stm._outputs:
-            for _, stms in stm.cases:
-                propagatePresets_stm_list(stms, output_sig)
-            if stm.default is not None:
-                propagatePresets_stm_list(stm.default, output_sig)
+        stm_lists = [stms for _, stms in stm.cases]
+        if stm.default is not None:
+            stm_lists.append(stm.default)
 
     elif isinstance(stm, HdlStmCodeBlockContainer):
         stm: HdlStmCodeBlockContainer
-        for output_sig in stm._outputs:
-            propagatePresets_stm_list(stm.statements, output_sig)
+        stm_lists = [stm.statements]
 
     else:
         raise NotImplementedError(stm)
 
+    ctxs = [StmListPresetsCtx(stm_list) for stm_list in stm_lists]
+    modified = False
+    for output_sig in stm._outputs:
+        for ctx in ctxs:
+            modified |= propagatePresets_stm_list(ctx.stm_list, output_sig, ctx)
+
+    return modified
+
 
 class RtlNetlistPassPropagatePresets(RtlNetlistPass):
 
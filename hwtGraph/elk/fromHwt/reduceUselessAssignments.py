@@ -48,5 +48,6 @@ def reduceUselessAssignments(root: LNode):
                     root.addEdge(srcPort, dstPort,
                                  originObj=originObj)
 
-    if to_remove:
-        root.children = [n for n in root.children if n not in to_remove]
+    children = root.children
+    for n in to_remove:
+        children.remove(n)
@@ -28,7 +28,8 @@ def portTryReduce(root: LNode, port: LPort):
     :note: use reduceUselessAssignments, extractSplits, flattenTrees before this function
         to maximize it's effect
     """
-    if not port.children:
+    # :note: the list of children is read directly to avoid the allocation of an empty list
+    if not port._children:
         return
 
     for p in port.children:
@@ -137,10 +138,10 @@ def countDirectlyConnected(port: LPort, result: dict) -> int:
 
     :return: cumulative sum of port counts
     """
-    inEdges = port.incomingEdges
-    outEdges = port.outgoingEdges
+    inEdges = port._incomingEdges or ()
+    outEdges = port._outgoingEdges or ()
 
-    if port.connectedAsParent or (port.children and not all(p.connectedAsParent for p in port.children)):
+    if port.connectedAsParent or (port._children and not all(p.connectedAsParent for p in port.children)):
         ch_cnt = 0
         # try:
         #    assert not inEdges, (port, port.children, inEdges)
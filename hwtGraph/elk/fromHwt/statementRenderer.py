@@ -1,5 +1,5 @@
 from itertools import chain
-from typing import Union, List, Optional, Tuple
+from typing import Generator, List, Optional, Tuple, Union
 
 from hwt.code import And
 from hwt.hdl.const import HConst
@@ -22,7 +22,7 @@ from hwtGraph.elk.fromHwt.netCtx import NetCtx, NetCtxs
 from hwtGraph.elk.fromHwt.statementRendererUtils import VirtualLNode, \
     walkStatementsForSig, Signal2stmPortCtx
 from hwtGraph.elk.fromHwt.utils import ValueAsLNode, \
-    isUselessTernary, isUselessEq
+    isUselessTernary, isUselessEq, runIteratively
 
 
 FF = "FF"
@@ -46,24 +46,39 @@ ITEM_SET = "ITEM_SET"
 #
 
 
+def _mayContainRamPorts(stm: IfContainer):
+    if stm.ifFalse or stm.elIfs:
+        astm = stm.ifFalse[0]
+        if len(stm.ifFalse) == 1 and isinstance(astm, HdlAssignmentContainer) and isinstance(astm.src, HConst) and  astm.src.vld_mask == 0:
+            # clear of the ram read out when not en
+            return True
+        else:
+            return False
+    return True
+
+
 def detectRamPorts(stm: IfContainer, current_en: RtlSignalBase):
     """
     Detect RAM ports in If statement
 
     :param stm: statement to detect the ram ports in
     :param current_en: current en/clk signal
+    :note: the nested IfContainers are walked iteratively
     """
-    if stm.ifFalse or stm.elIfs:
-        astm = stm.ifFalse[0]
-        if len(stm.ifFalse) == 1 and isinstance(astm, HdlAssignmentContainer) and isinstance(astm.src, HConst) and  astm.src.vld_mask == 0:
-            # clear of the ram read out when not en
-            pass
-        else:
-            return
-
-    for _stm in stm.ifTrue:
-        if isinstance(_stm, IfContainer):
-            yield from detectRamPorts(_stm, _stm.cond & current_en)
+    if not _mayContainRamPorts(stm):
+        return
+
+    # stack of (iterator of statements in ifTrue branch, en/clk signal of the branch)
+    stack = [(iter(stm.ifTrue), current_en)]
+    while stack:
+        stms, current_en = stack[-1]
+        _stm = next(stms, None)
+        if _stm is None:
+            stack.pop()
+        elif isinstance(_stm, IfContainer):
+            en = _stm.cond & current_en
+            if _mayContainRamPorts(_stm):
+                stack.append((iter(_stm.ifTrue), en))
         elif isinstance(_stm, HdlAssignmentContainer):
             if isinstance(_stm.dst._dtype, HArray):
                 assert len(_stm.indexes) == 1, ("expects only a single address per RAM port", _stm)
@@ -107,7 +122,7 @@ class StatementRenderer():
         else:
             assert portCtx is not None
             self.node = node
-            self.netCtxs = NetCtxs(node)
+            self.netCtxs = NetCtxs(node, rootNetCtxs.validation)
 
     def addInputPort(self, node, name,
                      i: Union[HConst, RtlSignalBase],
@@ -384,12 +399,16 @@ class StatementRenderer():
         :param signal: top signal of hidden operator tree
         :note: operator tree is constrained by signals with hidden==False
         :note: statement nodes are not connected automatically
+        :note: the tree is walked iteratively, the depth of the tree is not limited by the recursion limit
         """
+        runIteratively(self._lazyLoadNet(signal))
+
+    def _lazyLoadNet(self, signal: RtlSignalBase) -> Generator[Generator, object, None]:
         d_cnt = len(signal._rtlDrivers)
         if d_cnt == 1:
             driver = signal._rtlDrivers[0]
             if isinstance(driver, HOperatorNode):
-                d = self.addOperatorAsLNode(driver)
+                d = yield from self._addOperatorAsLNode(driver)
 
                 if isinstance(d, LNode):
                     c, _ = self.netCtxs.getDefault(signal)
@@ -403,12 +422,22 @@ class StatementRenderer():
             raise AssertionError(signal, signal._rtlDrivers)
 
     def addOperatorAsLNode(self, op: HOperatorNode) -> Union[LNode, NetCtx]:
-        root = self.node
+        """
+        :return: the node of the operator or NetCtx of the operand if the operator is not rendered
+        """
+        return runIteratively(self._addOperatorAsLNode(op))
+
+    def _addOperatorAsLNode(self, op: HOperatorNode) -> Generator[Generator, object, Union[LNode, NetCtx]]:
         if isUselessTernary(op) or isUselessEq(op):
             # is in format 1 if cond else 0
             # return NetCtx of cond directly
             s = op.operands[0]
-            net_ctx = self.getInputNetCtx(s)
+            if s._isUnnamedExpr:
+                net_ctx, wasThereBefore = self.netCtxs.getDefault(s)
+                if not wasThereBefore:
+                    yield self._lazyLoadNet(s)
+            else:
+                net_ctx = self.getInputNetCtx(s)
             # self.netCtxs.joinNetsByValKey(net_ctx, op.result)
             return net_ctx
 
@@ -431,11 +460,21 @@ class StatementRenderer():
         else:
             inputNames = [None for _ in op.operands]
 
-        m = root.addNode(originObj=op, name=op.operator.id, cls="Operator")
+        m = self.node.addNode(originObj=op, name=op.operator.id, cls="Operator")
         m.addPort(None, PortType.OUTPUT, PortSide.EAST)
 
+        netCtxs = self.netCtxs
         for inpName, _op in zip(inputNames, ops):
-            self.addInputPort(m, inpName, _op)
+            if not isConst(_op) and _op._isUnnamedExpr:
+                # same as in addInputPort, but the operand tree is rendered
+                # by runIteratively instead of the recursion
+                port = m.addPort(inpName, PortType.INPUT, PortSide.WEST)
+                ctx, wasThereBefore = netCtxs.getDefault(_op)
+                if not wasThereBefore:
+                    yield self._lazyLoadNet(_op)
+                ctx.addEndpoint(port)
+            else:
+                self.addInputPort(m, inpName, _op)
 
         return m
 
@@ -483,6 +522,10 @@ class StatementRenderer():
 
     def renderEventDepIfContainer(self, ifStm: IfContainer,
                                   s: RtlSignalBase, connectOut):
+        return runIteratively(self._renderEventDepIfContainer(ifStm, s, connectOut))
+
+    def _renderEventDepIfContainer(self, ifStm: IfContainer,
+                                   s: RtlSignalBase, connectOut) -> Generator[Generator, object, Tuple[LNode, LPort]]:
         assert not ifStm.ifFalse, ifStm
         if ifStm.elIfs:
             raise NotImplementedError(MUX)
@@ -512,7 +555,7 @@ class StatementRenderer():
             break
 
         if assig is None:
-            _, _in = self.renderForSignal(subStm, s, False)
+            _, _in = yield self._renderForSignal(subStm, s, False)
             return self.createFFNode(s, ifStm.cond, _in, connectOut)
 
         if len(assig.indexes) != 1:
@@ -537,7 +580,14 @@ class StatementRenderer():
         """
         Walk statement and render nodes which are representing
         hardware components (MUX, LATCH, FF, ...) for specified signal
+
+        :note: the nested statements are walked iteratively, the depth of nesting is not limited by the recursion limit
         """
+        return runIteratively(self._renderForSignal(stm, s, connectOut))
+
+    def _renderForSignal(self, stm: Union[HdlStatement, ListOfHdlStatement],
+                         s: RtlSignalBase,
+                         connectOut) -> Generator[Generator, object, Optional[Tuple[LNode, Union[RtlSignalBase, LPort]]]]:
         # filter statements for this signal only if required
         if not isinstance(stm, HdlStatement):
             stm = list(walkStatementsForSig(stm, s))
@@ -562,14 +612,14 @@ class StatementRenderer():
             stm: IfContainer
             if full_ev_dep and not parent_ev_dep:
                 # FF with optional MUX
-                return self.renderEventDepIfContainer(stm, s, connectOut)
+                return (yield self._renderEventDepIfContainer(stm, s, connectOut))
 
             else:
                 assert encl is not None, stm
                 latched = par is None and not parent_ev_dep and s not in encl
                 # MUX/LATCH/MUX+LATCH
                 controls = [stm.cond]
-                ren = self.renderForSignal(stm.ifTrue, s, False)
+                ren = yield self._renderForSignal(stm.ifTrue, s, False)
                 if ren is not None:
                     inputs = [ren[1]]
                 else:
@@ -577,12 +627,12 @@ class StatementRenderer():
 
                 for c, stms in stm.elIfs:
                     controls.append(c)
-                    ren = self.renderForSignal(stms, s, False)
+                    ren = yield self._renderForSignal(stms, s, False)
                     if ren is not None:
                         inputs.append(ren[1])
 
                 if stm.ifFalse:
-                    ren = self.renderForSignal(stm.ifFalse, s, False)
+                    ren = yield self._renderForSignal(stm.ifFalse, s, False)
                     if ren is not None:
                         inputs.append(ren[1])
 
@@ -595,7 +645,7 @@ class StatementRenderer():
             latched = s not in encl
             inputs = []
             for _, stms in stm.cases:
-                d = self.renderForSignal(stms, s, False)
+                d = yield self._renderForSignal(stms, s, False)
                 if d is not None:
                     _, port = d
                     inputs.append(port)
@@ -603,7 +653,7 @@ class StatementRenderer():
                     assert latched, (s, stm)
 
             if stm.default:
-                d = self.renderForSignal(stm.default, s, False)
+                d = yield self._renderForSignal(stm.default, s, False)
                 if d is not None:
                     _, port = d
                     inputs.append(port)
@@ -623,6 +673,6 @@ class StatementRenderer():
                     stm_for_this_output = _stm
             assert stm_for_this_output is not None, (
                 "The _output property of stm has members which are not true output of statement", s, stm)
-            return self.renderForSignal(stm_for_this_output, s, connectOut)
+            return (yield self._renderForSignal(stm_for_this_output, s, connectOut))
         else:
             raise TypeError(stm.__class__, stm)
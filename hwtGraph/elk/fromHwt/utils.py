@@ -1,5 +1,5 @@
 from io import StringIO
-from typing import Union, List, Optional
+from typing import Generator, Union, List, Optional
 
 from hwt.constants import INTF_DIRECTION
 from hwt.hwIO import HwIO
@@ -19,6 +19,47 @@ from hwtGraph.elk.containers.lPort import LPort
 from ipCorePackager.constants import DIRECTION
 
 
+def runIteratively(gen: Generator[Generator, object, object]):
+    """
+    Run the generator which implements a recursive function without the recursion
+
+    The generator yields the generators of the nested calls instead of calling itself,
+    the return value of the nested generator is sent back to the yield
+    (e.g. ``ren = yield self._renderForSignal(stm, s, False)``),
+    the exceptions are propagated to the generator which yielded the failing one.
+    The stack of the generators is on the heap, the depth of the recursion is not limited by the recursion limit.
+
+    :return: the return value of gen
+    """
+    stack = [gen]
+    res = None
+    exc = None
+    while True:
+        top = stack[-1]
+        try:
+            if exc is None:
+                sub = top.send(res)
+            else:
+                sub = top.throw(exc)
+        except StopIteration as e:
+            stack.pop()
+            if not stack:
+                return e.value
+            res = e.value
+            exc = None
+            continue
+        except BaseException as e:
+            stack.pop()
+            if not stack:
+                raise
+            exc = e
+            continue
+
+        stack.append(sub)
+        res = None
+        exc = None
+
+
 def toStr(obj):
     """
     Convert hwt object to string
@@ -63,24 +104,32 @@ def _addPort(n: LNode, lp: LPort, hwIO: HwIO,
              reverseDirection=False):
     """
     add port to LPort for interface
-    """
-    origin = originObjOfPort(hwIO)
-    d = hwIO._direction
-    d = PortTypeFromDir(d)
 
-    if reverseDirection:
-        d = PortType.opposite(d)
-
-    new_lp = LPort(lp, d, lp.side, name=hwIO._name, originObj=origin)
-    if hwIO._hwIOs:
-        for cHwIO in hwIO._hwIOs:
-            _addPort(n, new_lp, cHwIO,
-                     reverseDirection=reverseDirection)
-
-    lp.children.append(new_lp)
-    new_lp.parent = lp
-    if n._node2lnode is not None:
-        n._node2lnode[origin] = new_lp
+    :note: the hierarchy of the interface is walked iteratively (the ports are appended in post-order
+        as if this function was recursive)
+    """
+    node2lnode = n._node2lnode
+    # stack of (parent LPort, HwIO, LPort of HwIO or None if children were not processed yet)
+    stack = [(lp, hwIO, None)]
+    while stack:
+        parent, _hwIO, new_lp = stack.pop()
+        if new_lp is None:
+            d = _hwIO._direction
+            d = PortTypeFromDir(d)
+
+            if reverseDirection:
+                d = PortType.opposite(d)
+
+            new_lp = LPort(parent, d, parent.side, name=_hwIO._name, originObj=originObjOfPort(_hwIO))
+            stack.append((parent, _hwIO, new_lp))
+            if _hwIO._hwIOs:
+                for cHwIO in reversed(_hwIO._hwIOs):
+                    stack.append((new_lp, cHwIO, None))
+        else:
+            parent.children.append(new_lp)
+            new_lp.parent = parent
+            if node2lnode is not None:
+                node2lnode[new_lp.originObj] = new_lp
 
     return new_lp
 
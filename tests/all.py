@@ -5,6 +5,13 @@ import sys
 from unittest import TestLoader, TextTestRunner, TestSuite
 
 from tests.conversibility_test import Conversibility_TC
+from tests.conversionProfiler_test import ConversionProfiler_TC
+from tests.elkJsonCache_test import ElkJsonCache_TC
+from tests.elkJson_test import ElkJson_TC
+from tests.incrementalConvertor_test import IncrementalConvertor_TC
+from tests.orderedSetList_test import OrderedSetList_TC
+from tests.originIndex_test import OriginIndex_TC
+from tests.parallelConvertor_test import ParallelConvertor_TC
 
 
 def testSuiteFromTCs(*tcs):
@@ -16,6 +23,13 @@ def testSuiteFromTCs(*tcs):
 
 suite = testSuiteFromTCs(
     Conversibility_TC,
+    ConversionProfiler_TC,
+    ElkJson_TC,
+    ElkJsonCache_TC,
+    IncrementalConvertor_TC,
+    OrderedSetList_TC,
+    OriginIndex_TC,
+    ParallelConvertor_TC,
 )
 
 if __name__ == '__main__':
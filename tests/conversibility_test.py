@@ -1,7 +1,7 @@
 import unittest
 
 from hwt.code import If
-from hwt.hwIOs.std import HwIOSignal
+from hwt.hwIOs.std import HwIOSignal, HwIOVectSignal
 from hwt.hwModule import HwModule
 from hwt.pyUtils.typingFuture import override
 from hwt.serializer.utils import RtlSignal_sort_key, \
@@ -11,6 +11,7 @@ from hwtGraph.elk.containers.idStore import ElkIdStore
 from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode
 from hwtGraph.elk.fromHwt.defauts import DEFAULT_PLATFORM, \
     DEFAULT_LAYOUT_OPTIMIZATIONS
+from hwtGraph.elk.fromHwt.netCtx import ValidationLevel
 from hwtLib.amba.axi4Lite import Axi4Lite
 from hwtLib.amba.axi4s_fullduplex import Axi4StreamFullDuplex
 from hwtLib.amba.axiLite_comp.to_axi import AxiLite_to_Axi
@@ -133,6 +134,27 @@ class Axi4StreamFullDuplex_wire_nested(HwModule):
         self.dataOut(self.core.dataOut)
 
 
+class XorChain(HwModule):
+    """
+    Long chain of hidden operators (deeper than the recursion limit of the convertor would allow if the tree
+    was rendered recursively)
+    """
+    DEPTH = 512
+
+    @override
+    def hwDeclr(self):
+        self.a = HwIOVectSignal(self.DEPTH)
+        self.o = HwIOSignal()._m()
+
+    @override
+    def hwImpl(self):
+        a = self.a
+        r = a[0]
+        for i in range(1, self.DEPTH):
+            r = r ^ a[i]
+        self.o(r)
+
+
 class Conversibility_TC(unittest.TestCase):
 
     def test_ArrayBuff_writer(self):
@@ -388,6 +410,32 @@ class Conversibility_TC(unittest.TestCase):
             assert_HwModule_lexical_eq(u0, u1)
             self.assertDictEqual(d0, d1, comp.__name__)
 
+    def test_validationLevel_same_output(self):
+        for comp in [Showcase0, BitonicSorter, Axi_wDatapump]:
+            res = []
+            for validation in ValidationLevel:
+                m = comp()
+                synthesised(m, DEFAULT_PLATFORM)
+                g = HwModuleToLNode(m, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS, validation=validation)
+                res.append(g.toElkJson(ElkIdStore()))
+
+            for validation, d in zip(ValidationLevel, res):
+                self.assertDictEqual(res[0], d, (comp.__name__, validation))
+
+    def test_deepOperatorTree(self):
+        m = XorChain()
+        synthesised(m, DEFAULT_PLATFORM)
+        # without optimizations, flattenTrees would merge the chain to a single node
+        g = HwModuleToLNode(m, optimizations=[])
+        xors = []
+        nodes = [g, ]
+        while nodes:
+            n = nodes.pop()
+            if n.cls == "Operator" and n.name == "XOR":
+                xors.append(n)
+            nodes.extend(n.children)
+        self.assertEqual(len(xors), XorChain.DEPTH - 1)
+
 
 if __name__ == "__main__":
     testLoader = unittest.TestLoader()
@@ -0,0 +1,79 @@
+from io import StringIO
+import json
+import unittest
+
+from hwt.synth import synthesised
+from hwt.synthesizer.dummyPlatform import DummyPlatform
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.fromHwt.conversionProfiler import ConversionProfiler, \
+    LNode_countObjects
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_PLATFORM, \
+    DEFAULT_LAYOUT_OPTIMIZATIONS, createDefaultPlatform
+from hwtGraph.elk.fromHwt.netlistPreprocessors import RtlNetlistPassUnhideResultsOfIndexingAndConcatOnPublicSignals
+from hwtGraph.elk.fromHwt.propagatePresets import RtlNetlistPassPropagatePresets
+from hwtLib.peripheral.usb.usb2.device_cdc_vcp import Usb2CdcVcp
+
+
+class ConversionProfiler_TC(unittest.TestCase):
+
+    def test_report(self):
+        m = Usb2CdcVcp()
+        synthesised(m, DEFAULT_PLATFORM)
+        with ConversionProfiler() as profiler:
+            g = HwModuleToLNode(m, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS, profiler=profiler)
+            with profiler.measure("toElkJson", g):
+                g.toElkJson(ElkIdStore())
+
+        summary = profiler.summary()
+        for phase in ["addStatements", "renderContent", "connectNets", "applyConnections",
+                      *(opt.__name__ for opt in DEFAULT_LAYOUT_OPTIMIZATIONS), "toElkJson"]:
+            self.assertIn(phase, summary)
+            self.assertIn("allocated", summary[phase])
+
+        self.assertEqual(summary["toElkJson"]["calls"], 1)
+        top = profiler.hwModules[-1]
+        self.assertEqual(top["module"], m._name)
+        self.assertEqual(len(profiler.hwModules), summary["applyConnections"]["calls"])
+        self.assertEqual(tuple(profiler.records[-1]["after"]), LNode_countObjects(g))
+
+        buff = StringIO()
+        profiler.writeJson(buff)
+        self.assertEqual(json.loads(buff.getvalue())["summary"]["toElkJson"]["calls"], 1)
+
+    def test_netlistPass(self):
+        m = Usb2CdcVcp()
+        with ConversionProfiler(traceAllocations=False) as profiler:
+            platform = DummyPlatform()
+            platform.beforeHdlArchGeneration.extend([
+                RtlNetlistPassUnhideResultsOfIndexingAndConcatOnPublicSignals(profiler),
+                RtlNetlistPassPropagatePresets(),
+            ])
+            synthesised(m, platform)
+
+        recs = [rec for rec in profiler.records if rec["phase"] == "unhideResultsOfIndexing"]
+        self.assertTrue(recs)
+        for rec in recs:
+            self.assertNotIn("before", rec)
+            self.assertGreaterEqual(rec["endpoints"], 0)
+            self.assertLessEqual(rec["replaced"], rec["endpoints"])
+        self.assertGreater(sum(rec["signals"] for rec in recs), 0)
+
+    def test_defaultPlatform_with_profiler(self):
+        m = Usb2CdcVcp()
+        with ConversionProfiler(traceAllocations=False) as profiler:
+            synthesised(m, createDefaultPlatform(profiler))
+            HwModuleToLNode(m, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS, profiler=profiler)
+
+        summary = profiler.summary()
+        self.assertIn("unhideResultsOfIndexing", summary)
+        self.assertIn("applyConnections", summary)
+        # the pass runs before the conversion
+        self.assertEqual(profiler.records[0]["phase"], "unhideResultsOfIndexing")
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(ConversionProfiler_TC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,73 @@
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from hwt.synth import synthesised
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_PLATFORM, \
+    DEFAULT_LAYOUT_OPTIMIZATIONS
+from hwtGraph.elk.fromHwt.elkJsonCache import ElkJsonCache
+from hwtGraph.elk.fromHwt.fingerprint import converter_fingerprint
+from hwtLib.examples.showcase0 import Showcase0
+from hwtLib.peripheral.usb.usb2.device_cdc_vcp import Usb2CdcVcp
+
+
+class ElkJsonCache_TC(unittest.TestCase):
+
+    def _synthesised(self, comp):
+        m = comp()
+        synthesised(m, DEFAULT_PLATFORM)
+        return m
+
+    def test_hit_same_as_conversion(self):
+        with TemporaryDirectory() as d:
+            for comp in [Showcase0, Usb2CdcVcp]:
+                ref = HwModuleToLNode(self._synthesised(comp),
+                                      optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS).toElkJson(ElkIdStore())
+                cache = ElkJsonCache(d)
+                self.assertDictEqual(cache.convert(self._synthesised(comp)), ref)
+                self.assertEqual((cache.hits, cache.misses), (0, 1))
+                # new instance of cache to check that the key is stable
+                cache = ElkJsonCache(d)
+                self.assertDictEqual(cache.convert(self._synthesised(comp)), ref)
+                self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_optimizations_are_part_of_key(self):
+        with TemporaryDirectory() as d:
+            m = self._synthesised(Showcase0)
+            self.assertNotEqual(ElkJsonCache(d).key(m), ElkJsonCache(d, optimizations=[]).key(m))
+
+    def test_converter_is_part_of_key(self):
+        with TemporaryDirectory() as d:
+            m = self._synthesised(Showcase0)
+            cache = ElkJsonCache(d)
+            self.assertIn(converter_fingerprint().hex(), cache.key(m))
+            cache._converterFingerprint = bytes(20)
+            self.assertNotIn(converter_fingerprint().hex(), cache.key(m))
+
+    def test_damaged_record_is_miss(self):
+        with TemporaryDirectory() as d:
+            cache = ElkJsonCache(d)
+            m = self._synthesised(Showcase0)
+            key = cache.key(m)
+            self.assertIsNone(cache.get(key))
+            for data in [b"", b"not zlib"]:
+                with open(cache._recordPath(key), "wb") as f:
+                    f.write(data)
+                self.assertIsNone(cache.get(key))
+            cache.put(key, b"{}")
+            self.assertEqual(cache.get(key), b"{}")
+
+    def test_lru_eviction(self):
+        with TemporaryDirectory() as d:
+            cache = ElkJsonCache(d, maxSize=0)
+            cache.convert(self._synthesised(Showcase0))
+            self.assertEqual(os.listdir(d), [])
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(ElkJsonCache_TC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,297 @@
+from io import StringIO
+import json
+import os
+import sys
+from tempfile import TemporaryDirectory
+import unittest
+
+from hwt.synth import synthesised
+from hwt.synthesizer.componentPath import ComponentPath
+from hwtGraph.elk.containers.elkJsonEncoder import ElkJsonEncoder, \
+    LNode_toElkJsonBytes, OrjsonElkJsonEncoder, UjsonElkJsonEncoder
+from hwtGraph.elk.containers.elkJsonFusedExporter import ElkJsonFusedExporter
+from hwtGraph.elk.containers.elkJsonLazyExporter import ElkJsonLazyExporter
+from hwtGraph.elk.containers.elkJsonLoader import ElkJsonToLNode, loadLNode
+from hwtGraph.elk.containers.constants import PortType, PortSide
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.containers.lGraphTables import LGraphTables
+from hwtGraph.elk.containers.lGraphViews import LNodeView
+from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.containers.lPort import LPort
+from hwtGraph.elk.fromHwt.conversionProfiler import LNode_countObjects
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode, LGraphBackend
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_PLATFORM, \
+    DEFAULT_LAYOUT_OPTIMIZATIONS
+from hwtGraph.elk.fromHwt.parallelConvertor import _iterNodesAndPorts
+from hwtLib.amba.datapump.interconnect.rStricOrder import RStrictOrderInterconnect
+from hwtLib.examples.hierarchy.hwModuleWrapper_test import HwIOArrayExample
+from hwtLib.examples.showcase0 import Showcase0
+from hwtLib.peripheral.usb.usb2.device_cdc_vcp import Usb2CdcVcp
+from tests.conversibility_test import Axi4StreamFullDuplex_wire_nested
+
+
+class ElkJson_TC(unittest.TestCase):
+    COMPONENTS = [
+        Showcase0,
+        Axi4StreamFullDuplex_wire_nested,
+        HwIOArrayExample,
+        RStrictOrderInterconnect,
+        Usb2CdcVcp,
+    ]
+
+    def _convert(self, comp):
+        m = comp()
+        synthesised(m, DEFAULT_PLATFORM)
+        return HwModuleToLNode(m, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS)
+
+    def test_writeElkJson_same_as_toElkJson(self):
+        for comp in self.COMPONENTS:
+            g = self._convert(comp)
+            ref = json.dumps(g.toElkJson(ElkIdStore()))
+            buff = StringIO()
+            g.writeElkJson(buff, ElkIdStore())
+            self.assertEqual(buff.getvalue(), ref, comp.__name__)
+
+    def test_ElkIdStore_dictApi(self):
+        g = self._convert(Showcase0)
+        idStore = ElkIdStore()
+        g.toElkJson(idStore)
+        items = idStore.items()
+        self.assertEqual(len(items), len(idStore))
+        self.assertEqual(len(set(idStore.values())), len(idStore))
+        self.assertEqual(idStore.keys(), list(idStore))
+        for k, v in items:
+            self.assertIn(k, idStore)
+            self.assertEqual(idStore[k], v)
+
+        idStore1 = ElkIdStore()
+        idStore1.update(dict(items))
+        self.assertEqual(sorted(idStore1.values()), sorted(idStore.values()))
+        k, v = items[0]
+        del idStore1[k]
+        self.assertNotIn(k, idStore1)
+        self.assertEqual(len(idStore1), len(idStore) - 1)
+
+        # the lookup does not create scopes
+        scopeCnt = len(idStore.scopes)
+        unknown = ComponentPath(object(), object())
+        self.assertNotIn(unknown, idStore)
+        self.assertIsNone(idStore.get(unknown))
+        with self.assertRaises(KeyError):
+            idStore[unknown]
+        with self.assertRaises(KeyError):
+            idStore[ComponentPath()]
+        self.assertNotIn(ComponentPath(), idStore)
+        self.assertEqual(len(idStore.scopes), scopeCnt)
+
+        idStore2 = ElkIdStore(dict(items))
+        self.assertEqual(sorted(idStore2.items(), key=lambda x: x[1]), sorted(items, key=lambda x: x[1]))
+
+    def test_LGraphTables_toElkJson(self):
+        for comp in self.COMPONENTS:
+            g = self._convert(comp)
+            t = LGraphTables.fromLNode(g, keepOriginObj=True)
+            ref = g.toElkJson(ElkIdStore())
+            self.assertDictEqual(t.toElkJson(), ref, comp.__name__)
+            g1 = t.toLNode()
+            self.assertDictEqual(g1.toElkJson(ElkIdStore()), ref, comp.__name__)
+
+    def test_LGraphTables_binary(self):
+        for comp in self.COMPONENTS:
+            g = self._convert(comp)
+            ref = g.toElkJson(ElkIdStore())
+            data = LGraphTables.fromLNode(g).toBytes()
+            t = LGraphTables.fromBytes(data)
+            self.assertDictEqual(t.toElkJson(), ref, comp.__name__)
+            self.assertDictEqual(t.toLNode().toElkJson(ElkIdStore()), ref, comp.__name__)
+            self.assertLess(len(data), len(json.dumps(ref)), comp.__name__)
+
+        with self.assertRaises(ValueError):
+            LGraphTables.fromBytes(b"{}")
+
+    def test_LNodeView(self):
+        for comp in self.COMPONENTS:
+            g = self._convert(comp)
+            ref = g.toElkJson(ElkIdStore())
+            t = LGraphTables.fromLNode(g, keepOriginObj=True)
+            v = LNodeView(t)
+            self.assertDictEqual(v.toElkJson(), ref, comp.__name__)
+            # the bodies of shared components are instantiated in the tables
+            g1 = t.toLNode()
+            self.assertEqual(LNode_countObjects(v), LNode_countObjects(g1), comp.__name__)
+            for o, ov in zip(_iterNodesAndPorts(g1), _iterNodesAndPorts(v)):
+                self.assertEqual((o.name, o.originObj), (ov.name, ov.originObj), comp.__name__)
+                if isinstance(o, LPort):
+                    self.assertEqual((o.direction, o.side, o.index), (ov.direction, ov.side, ov.index))
+                    self.assertEqual([(e.name, len(e.srcs), len(e.dsts)) for e in o.iterEdges()],
+                                     [(e.name, len(e.srcs), len(e.dsts)) for e in ov.iterEdges()])
+                else:
+                    self.assertEqual((o.cls, len(o.children)), (ov.cls, len(ov.children)))
+
+    def test_LGraphBackend_TABLES(self):
+        for comp in self.COMPONENTS:
+            g = self._convert(comp)
+            ref = g.toElkJson(ElkIdStore())
+            m = comp()
+            synthesised(m, DEFAULT_PLATFORM)
+            v = HwModuleToLNode(m, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS, backend=LGraphBackend.TABLES)
+            self.assertIsInstance(v, LNodeView)
+            self.assertIs(v.originObj, m)
+            self.assertDictEqual(v.toElkJson(), ref, comp.__name__)
+
+    def _expandLazy(self, exporter: ElkJsonLazyExporter, d: dict):
+        for ch in d.get("children", d.get("_children", ())):
+            if ch["hwMeta"].pop("lazy", False):
+                body = exporter.exportSubtree(ch["id"])
+                ch["_children"] = body["_children"]
+                ch["_edges"] = body["_edges"]
+            self._expandLazy(exporter, ch)
+
+    def test_ElkJsonLazyExporter(self):
+        for comp in self.COMPONENTS:
+            g = self._convert(comp)
+            ref = g.toElkJson(ElkIdStore())
+            exporter = ElkJsonLazyExporter(g)
+            self.assertDictEqual(exporter.toElkJson(depth=None), ref, comp.__name__)
+            d = exporter.toElkJson()
+            self._expandLazy(exporter, d)
+            self.assertDictEqual(d, ref, comp.__name__)
+
+    def test_ElkJsonFusedExporter(self):
+        for comp in self.COMPONENTS:
+            g = self._convert(comp)
+            refIdStore = ElkIdStore()
+            ref = g.toElkJson(refIdStore)
+            idStore = ElkIdStore()
+            self.assertDictEqual(ElkJsonFusedExporter(idStore).toElkJson(g), ref, comp.__name__)
+            self.assertEqual(idStore.max_id, refIdStore.max_id, comp.__name__)
+
+    def _collectNodes(self, d: dict, nodes: dict):
+        nodes[d.get("id")] = d
+        for ch in d.get("children", d.get("_children", ())):
+            self._collectNodes(ch, nodes)
+        return nodes
+
+    def test_ElkJsonFusedExporter_dedupSharedComponents(self):
+        for comp in self.COMPONENTS:
+            g = self._convert(comp)
+            ref = g.toElkJson(ElkIdStore())
+            d = ElkJsonFusedExporter(dedupSharedComponents=True).toElkJson(g)
+            nodes = self._collectNodes(d, {})
+            instances = [n for n in nodes.values() if "sharedComponentWith" in n["hwMeta"]]
+            if not instances:
+                self.assertDictEqual(d, ref, comp.__name__)
+            for n in instances:
+                self.assertNotIn("_children", n)
+                orig = nodes[n["hwMeta"]["sharedComponentWith"]]
+                self.assertNotIn("sharedComponentWith", orig["hwMeta"])
+                self.assertEqual([p["hwMeta"]["name"] for p in n["ports"]],
+                                 [p["hwMeta"]["name"] for p in orig["ports"]])
+
+    def test_ElkJsonEncoder(self):
+        e = ElkJsonEncoder()
+        for comp in self.COMPONENTS:
+            g = self._convert(comp)
+            ref = g.toElkJson(ElkIdStore())
+            data = LNode_toElkJsonBytes(g, encoder=e)
+            self.assertEqual(json.loads(data), json.loads(json.dumps(ref)), comp.__name__)
+
+    def _test_ElkJsonEncoder_same_as_json(self, encoderCls):
+        ref = ElkJsonEncoder()
+        e = encoderCls()
+        for comp in self.COMPONENTS:
+            g = self._convert(comp)
+            self.assertEqual(LNode_toElkJsonBytes(g, encoder=e),
+                             LNode_toElkJsonBytes(g, encoder=ref), comp.__name__)
+
+    @unittest.skipUnless(OrjsonElkJsonEncoder.isAvailable(), "requires orjson")
+    def test_OrjsonElkJsonEncoder_same_as_json(self):
+        self._test_ElkJsonEncoder_same_as_json(OrjsonElkJsonEncoder)
+
+    @unittest.skipUnless(UjsonElkJsonEncoder.isAvailable(), "requires ujson")
+    def test_UjsonElkJsonEncoder_same_as_json(self):
+        self._test_ElkJsonEncoder_same_as_json(UjsonElkJsonEncoder)
+
+    def test_ElkJsonToLNode(self):
+        with TemporaryDirectory() as tmp:
+            for comp in self.COMPONENTS:
+                g = self._convert(comp)
+                ref = g.toElkJson(ElkIdStore())
+                refJson = json.dumps(ref)
+                g1 = ElkJsonToLNode()(json.loads(refJson))
+                self.assertDictEqual(g1.toElkJson(ElkIdStore()), ref, comp.__name__)
+
+                jsonFile = os.path.join(tmp, "graph.json")
+                with open(jsonFile, "w") as f:
+                    f.write(refJson)
+                binFile = os.path.join(tmp, "graph.bin")
+                with open(binFile, "wb") as f:
+                    f.write(LGraphTables.fromLNode(g).toBytes())
+                for fileName in (jsonFile, binFile):
+                    g1 = loadLNode(fileName)
+                    self.assertDictEqual(g1.toElkJson(ElkIdStore()), ref, (comp.__name__, fileName))
+
+                dedup = ElkJsonFusedExporter(dedupSharedComponents=True).toElkJson(g)
+                g1 = ElkJsonToLNode()(json.loads(json.dumps(dedup)))
+                self.assertDictEqual(g1.toElkJson(ElkIdStore()), ref, comp.__name__)
+
+    def test_deepHierarchy(self):
+        # deeper than the recursion limit would allow for a recursive walk
+        depth = sys.getrecursionlimit() + 100
+        g = LNode(name="top")
+        n = g
+        for i in range(depth):
+            n = n.addNode(name=f"n{i:d}")
+        p = n.addPort("p", PortType.INPUT, PortSide.WEST)
+
+        # the JSON of the nodes with shallow ports can be streamed
+        # (json.loads would hit the recursion limit)
+        data = "".join(g.iterElkJson(ElkIdStore()))
+        self.assertEqual(data.count('"children": [{"hwMeta"'), 1)
+        self.assertEqual(data.count('"_children": [{"hwMeta"'), depth - 1)
+
+        for i in range(depth):
+            c = LPort(p, PortType.INPUT, PortSide.WEST, name=f"c{i:d}")
+            p.children.append(c)
+            p = c
+
+        ref = g.toElkJson(ElkIdStore())
+        data = ref
+        for _ in range(depth):
+            data = data.get("children", None) or data["_children"]
+            data = data[0]
+        pJson = data["ports"][0]
+        for i in range(depth):
+            pJson = pJson["children"][0]
+            self.assertEqual(pJson["hwMeta"]["level"], i + 1)
+
+        self._assertDeepJsonEqual(ElkJsonFusedExporter().toElkJson(g), ref)
+        self._assertDeepJsonEqual(ElkJsonLazyExporter(g).toElkJson(depth=None), ref)
+        t = LGraphTables.fromLNode(g)
+        self._assertDeepJsonEqual(t.toElkJson(), ref)
+        self._assertDeepJsonEqual(t.toLNode().toElkJson(ElkIdStore()), ref)
+        self._assertDeepJsonEqual(LGraphTables.fromBytes(t.toBytes()).toElkJson(), ref)
+        self._assertDeepJsonEqual(ElkJsonToLNode()(ref).toElkJson(ElkIdStore()), ref)
+
+    def _assertDeepJsonEqual(self, d0, d1):
+        # assertDictEqual (and ==) would hit the recursion limit
+        stack = [(d0, d1)]
+        while stack:
+            d0, d1 = stack.pop()
+            if isinstance(d0, dict):
+                self.assertIsInstance(d1, dict)
+                self.assertEqual(list(d0.keys()), list(d1.keys()))
+                stack.extend((v, d1[k]) for k, v in d0.items())
+            elif isinstance(d0, list):
+                self.assertIsInstance(d1, list)
+                self.assertEqual(len(d0), len(d1))
+                stack.extend(zip(d0, d1))
+            else:
+                self.assertEqual(d0, d1)
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(ElkJson_TC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
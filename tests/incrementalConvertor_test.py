@@ -0,0 +1,68 @@
+import unittest
+
+from hwt.synth import synthesised
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_PLATFORM, \
+    DEFAULT_LAYOUT_OPTIMIZATIONS
+from hwtGraph.elk.fromHwt.incrementalConvertor import IncrementalHwModuleToLNode
+from hwtLib.amba.datapump.interconnect.rStricOrder import RStrictOrderInterconnect
+from hwtLib.examples.hierarchy.hwModuleWrapper_test import HwIOArrayExample
+from hwtLib.examples.showcase0 import Showcase0
+from hwtLib.peripheral.usb.usb2.device_cdc_vcp import Usb2CdcVcp
+from tests.conversibility_test import Axi4StreamFullDuplex_wire_nested
+
+
+class IncrementalConvertor_TC(unittest.TestCase):
+    COMPONENTS = [
+        Showcase0,
+        Axi4StreamFullDuplex_wire_nested,
+        HwIOArrayExample,
+        RStrictOrderInterconnect,
+        Usb2CdcVcp,
+    ]
+
+    def _synthesised(self, comp):
+        m = comp()
+        synthesised(m, DEFAULT_PLATFORM)
+        return m
+
+    def test_unchanged_top_is_reused(self):
+        inc = IncrementalHwModuleToLNode()
+        g0 = inc.convert(self._synthesised(self.COMPONENTS[0]))
+        g1 = inc.convert(self._synthesised(self.COMPONENTS[0]))
+        self.assertIs(g0, g1)
+        self.assertEqual(inc.convertedCnt, 0)
+
+    def test_unchanged_top_is_rebound(self):
+        comp = Axi4StreamFullDuplex_wire_nested
+        inc = IncrementalHwModuleToLNode()
+        inc.convert(self._synthesised(comp))
+        m = self._synthesised(comp)
+        g = inc.convert(m)
+        self.assertEqual(inc.convertedCnt, 0)
+        self.assertIs(g.originObj, m)
+        self.assertIs(inc.toL[m], g)
+        for su in m._subHwModules:
+            n = inc.toL[su]
+            self.assertIs(n.originObj, su)
+            self.assertIn(n, g.children)
+
+    def test_reused_children_same_as_full_conversion(self):
+        for comp in self.COMPONENTS:
+            inc = IncrementalHwModuleToLNode()
+            inc.convert(self._synthesised(comp))
+            # force the conversion of the top so only the children are reused
+            inc._topFingerprint = None
+            g = inc.convert(self._synthesised(comp))
+            self.assertEqual(inc.convertedCnt, 1, comp.__name__)
+
+            ref = HwModuleToLNode(self._synthesised(comp), optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS)
+            self.assertDictEqual(g.toElkJson(ElkIdStore()), ref.toElkJson(ElkIdStore()), comp.__name__)
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(IncrementalConvertor_TC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwtGraph.elk.containers.constants import PortType, PortSide
+from hwtGraph.elk.containers.lNode import LNode
+from hwtGraph.elk.containers.orderedSetList import OrderedSetList
+
+
+class OrderedSetList_TC(unittest.TestCase):
+
+    def test_listLike(self):
+        l = OrderedSetList([3, 1, 2])
+        self.assertTrue(l.append(4))
+        self.assertFalse(l.append(1))
+        self.assertEqual(list(l), [3, 1, 2, 4])
+        self.assertEqual(l[0], 3)
+        self.assertEqual(l[-1], 4)
+        self.assertEqual(l[2], 2)
+        self.assertEqual(l[1:3], [1, 2])
+        self.assertEqual(l.index(2), 2)
+        l.remove(1)
+        self.assertEqual(l, [3, 2, 4])
+        with self.assertRaises(ValueError):
+            l.remove(1)
+        with self.assertRaises(IndexError):
+            l[3]
+        self.assertEqual(l.pop(0), 3)
+        self.assertEqual(l.pop(), 4)
+        self.assertEqual(l, [2])
+
+    def test_itemAssignment_and_copy(self):
+        l = OrderedSetList([3, 1, 2])
+        with self.assertRaises(TypeError):
+            l[0] = 5
+        with self.assertRaises(TypeError):
+            l[0] = None
+        self.assertEqual(list(l), [3, 1, 2])
+        c = l.copy()
+        self.assertIsInstance(c, OrderedSetList)
+        c.append(4)
+        self.assertEqual(list(c), [3, 1, 2, 4])
+        self.assertEqual(list(l), [3, 1, 2])
+
+    def test_edgeRemove_keepsOrder(self):
+        root = LNode(name="top")
+        src = root.addPort("clk", PortType.INPUT, PortSide.WEST)
+        dsts = [root.addNode(name=f"n{i:d}").addPort("clk", PortType.INPUT, PortSide.WEST)
+                for i in range(5)]
+        edges = [root.addEdge(src, dst) for dst in dsts]
+        edges[2].remove()
+        self.assertEqual(list(src.outgoingEdges), [edges[0], edges[1], edges[3], edges[4]])
+        self.assertEqual(len(dsts[2].incomingEdges), 0)
+
+        e = root.addHyperEdge([src], dsts)
+        e.removeTarget(dsts[1])
+        self.assertEqual(list(e.dsts), [dsts[0], dsts[2], dsts[3], dsts[4]])
+        self.assertNotIn(e, dsts[1].incomingEdges)
+
+    def test_childRemove_keepsOrder(self):
+        root = LNode(name="top")
+        nodes = [root.addNode(name=f"n{i:d}") for i in range(5)]
+        root.children.remove(nodes[3])
+        root.children.remove(nodes[0])
+        self.assertEqual(root.children, [nodes[1], nodes[2], nodes[4]])
+        self.assertEqual(root.children[1:], [nodes[2], nodes[4]])
+        root.children = [nodes[4], nodes[1]]
+        self.assertIsInstance(root.children, OrderedSetList)
+        self.assertEqual(list(root.children), [nodes[4], nodes[1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
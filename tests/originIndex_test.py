@@ -0,0 +1,60 @@
+import unittest
+
+from hwt.synth import synthesised
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_PLATFORM, \
+    DEFAULT_LAYOUT_OPTIMIZATIONS
+from hwtGraph.elk.fromHwt.originIndex import LNode_releaseNetlist, originObjKey
+from hwtGraph.elk.fromHwt.utils import originObjOfPort
+from hwtLib.examples.hierarchy.hwModuleWrapper_test import HwIOArrayExample
+from hwtLib.examples.showcase0 import Showcase0
+from tests.conversibility_test import Axi4StreamFullDuplex_wire_nested
+
+
+class OriginIndex_TC(unittest.TestCase):
+    COMPONENTS = [
+        Showcase0,
+        Axi4StreamFullDuplex_wire_nested,
+        HwIOArrayExample,
+    ]
+
+    def _isKey(self, k):
+        if k is None or isinstance(k, (str, int)):
+            return True
+        return isinstance(k, tuple) and all(self._isKey(i) for i in k)
+
+    def test_releaseNetlist(self):
+        for comp in self.COMPONENTS:
+            m = comp()
+            synthesised(m, DEFAULT_PLATFORM)
+            g = HwModuleToLNode(m, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS)
+            ref = g.toElkJson(ElkIdStore())
+            toL = dict(g._node2lnode)
+
+            index = LNode_releaseNetlist(g)
+            self.assertDictEqual(g.toElkJson(ElkIdStore()), ref, comp.__name__)
+            self.assertIs(index[originObjKey(m)], g)
+            for hwIO in m._hwIOs:
+                o = originObjOfPort(hwIO)
+                self.assertIs(index[originObjKey(o)], toL[o], (comp.__name__, hwIO))
+
+            stack = [g]
+            while stack:
+                n = stack.pop()
+                self.assertIsNone(n._node2lnode)
+                self.assertTrue(self._isKey(n.originObj), n.originObj)
+                for p in n.iterPorts():
+                    self.assertTrue(self._isKey(p.originObj), p.originObj)
+                    for e in p.iterEdges():
+                        self.assertTrue(self._isKey(e.originObj), e.originObj)
+                stack.extend(n.children)
+
+            self.assertEqual(LNode_releaseNetlist(g), {})
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(OriginIndex_TC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
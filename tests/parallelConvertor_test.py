@@ -0,0 +1,80 @@
+import multiprocessing
+import unittest
+
+from hwt.synth import synthesised
+from hwtGraph.elk.containers.idStore import ElkIdStore
+from hwtGraph.elk.containers.lPort import LPort
+from hwtGraph.elk.fromHwt.conversionProfiler import ConversionProfiler
+from hwtGraph.elk.fromHwt.convertor import HwModuleToLNode
+from hwtGraph.elk.fromHwt.defauts import DEFAULT_PLATFORM, \
+    DEFAULT_LAYOUT_OPTIMIZATIONS
+from hwtGraph.elk.fromHwt.netCtx import ValidationLevel
+from hwtGraph.elk.fromHwt.parallelConvertor import ParallelHwModuleToLNode, \
+    _iterNodesAndPorts
+from hwtLib.amba.datapump.interconnect.rStricOrder import RStrictOrderInterconnect
+from hwtLib.mem.cuckooHashTable import CuckooHashTable
+from hwtLib.peripheral.usb.usb2.device_cdc_vcp import Usb2CdcVcp
+from tests.conversibility_test import Axi4StreamFullDuplex_wire_nested
+
+
+@unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "requires fork")
+class ParallelConvertor_TC(unittest.TestCase):
+    COMPONENTS = [
+        Axi4StreamFullDuplex_wire_nested,
+        RStrictOrderInterconnect,
+        CuckooHashTable,
+        Usb2CdcVcp,
+    ]
+
+    def test_same_as_serial(self):
+        for comp in self.COMPONENTS:
+            m = comp()
+            synthesised(m, DEFAULT_PLATFORM)
+            ref = HwModuleToLNode(m, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS).toElkJson(ElkIdStore())
+
+            m = comp()
+            synthesised(m, DEFAULT_PLATFORM)
+            g = ParallelHwModuleToLNode(2).convert(m)
+            self.assertDictEqual(g.toElkJson(ElkIdStore()), ref, comp.__name__)
+
+    def test_originObj_of_HwModule_ports(self):
+        m = RStrictOrderInterconnect()
+        synthesised(m, DEFAULT_PLATFORM)
+        c = ParallelHwModuleToLNode(2)
+        g = c.convert(m)
+        for n in g.children:
+            if n.cls != "HwModule":
+                continue
+            for obj in _iterNodesAndPorts(n):
+                if isinstance(obj, LPort):
+                    if obj.parentNode.cls == "HwModule":
+                        self.assertIsNotNone(obj.originObj, obj)
+                elif obj.cls == "HwModule":
+                    self.assertIsNotNone(obj.originObj, obj)
+
+    def test_profiler_and_validation(self):
+        comp = RStrictOrderInterconnect
+        m = comp()
+        synthesised(m, DEFAULT_PLATFORM)
+        refProfiler = ConversionProfiler(traceAllocations=False)
+        ref = HwModuleToLNode(m, optimizations=DEFAULT_LAYOUT_OPTIMIZATIONS, profiler=refProfiler,
+                              validation=ValidationLevel.ONCE).toElkJson(ElkIdStore())
+
+        m = comp()
+        synthesised(m, DEFAULT_PLATFORM)
+        profiler = ConversionProfiler(traceAllocations=False)
+        c = ParallelHwModuleToLNode(2, profiler=profiler, validation=ValidationLevel.ONCE)
+        g = c.convert(m)
+        self.assertGreater(c.parallelCnt, 0)
+        self.assertDictEqual(g.toElkJson(ElkIdStore()), ref)
+        self.assertEqual([r["module"] for r in profiler.hwModules],
+                         [r["module"] for r in refProfiler.hwModules])
+        self.assertEqual([(r["module"], r["phase"], r.get("before"), r.get("after")) for r in profiler.records],
+                         [(r["module"], r["phase"], r.get("before"), r.get("after")) for r in refProfiler.records])
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(ParallelConvertor_TC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)